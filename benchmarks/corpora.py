@@ -0,0 +1,187 @@
+"""Deterministic generated inputs for the micro-benchmarks."""
+
+import random
+from typing import Any, Dict, List
+
+APP_NAMES = [
+    "Google Chrome",
+    "Safari",
+    "Firefox",
+    "Slack",
+    "Zoom",
+    "iTerm2",
+    "Terminal",
+    "Visual Studio Code",
+    "Xcode",
+    "Finder",
+    "Mail",
+    "Calendar",
+    "Notes",
+    "Spotify",
+    "Figma",
+    "Notion",
+    "Obsidian",
+    "Microsoft Outlook",
+    "Microsoft Teams",
+    "Preview",
+]
+
+TITLE_WORDS = [
+    "inbox",
+    "pull",
+    "request",
+    "review",
+    "design",
+    "sprint",
+    "planning",
+    "notes",
+    "draft",
+    "release",
+    "build",
+    "deploy",
+    "dashboard",
+    "metrics",
+    "meeting",
+    "standup",
+    "README.md",
+    "main.py",
+    "aerospace.toml",
+    "~/src/workflow",
+]
+
+COMMANDS = [
+    "focus left",
+    "focus right",
+    "move left",
+    "move right",
+    "workspace {n}",
+    "move-node-to-workspace {n}",
+    "layout tiles horizontal vertical",
+    "layout accordion horizontal vertical",
+    "fullscreen",
+    "balance-sizes",
+    "join-with left",
+    "resize smart -50",
+    "exec-and-forget open -a Terminal",
+]
+
+MODIFIERS = ["alt", "alt-shift", "ctrl-alt", "cmd-alt", "ctrl-alt-shift"]
+KEYS = list("abcdefghijklmnopqrstuvwxyz0123456789") + [
+    "left",
+    "right",
+    "up",
+    "down",
+    "minus",
+    "equal",
+    "tab",
+    "semicolon",
+]
+
+
+def app_names(count: int, seed: int = 1) -> List[str]:
+    rng = random.Random(seed)
+    return [rng.choice(APP_NAMES) for _ in range(count)]
+
+
+def window_titles(count: int, seed: int = 2) -> List[str]:
+    rng = random.Random(seed)
+    titles = []
+    for _ in range(count):
+        words = rng.sample(TITLE_WORDS, rng.randint(2, 6))
+        titles.append(" ".join(words).capitalize())
+    return titles
+
+
+def windows(count: int, seed: int = 3) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    names = app_names(count, seed)
+    titles = window_titles(count, seed + 1)
+    monitors = ["Built-in Retina Display", "DELL U2720Q", "LG HDR 4K"]
+    return [
+        {
+            "app-name": name,
+            "window-title": title,
+            "window-id": 1000 + idx,
+            "app-pid": 500 + APP_NAMES.index(name),
+            "workspace": str(rng.randint(1, 9)),
+            "app-bundle-id": "com.example." + name.lower().replace(" ", "-"),
+            "monitor-name": rng.choice(monitors),
+        }
+        for idx, (name, title) in enumerate(zip(names, titles))
+    ]
+
+
+def queries(count: int, seed: int = 4) -> List[str]:
+    rng = random.Random(seed)
+    sources = APP_NAMES + TITLE_WORDS
+    result = []
+    for _ in range(count):
+        source = rng.choice(sources).lower()
+        start = rng.randint(0, max(0, len(source) - 3))
+        result.append(source[start : start + rng.randint(1, 5)])
+    return result
+
+
+def commands(count: int, seed: int = 5) -> List[Any]:
+    rng = random.Random(seed)
+    result: List[Any] = []
+    for _ in range(count):
+        command = rng.choice(COMMANDS).format(n=rng.randint(1, 9))
+        if rng.random() < 0.3:
+            result.append([command, "mode main"])
+        else:
+            result.append(command)
+    return result
+
+
+def config_text(modes: int = 20, bindings_per_mode: int = 40, seed: int = 6) -> str:
+    rng = random.Random(seed)
+    lines = ["start-at-login = true", "", "[gaps]", "inner.horizontal = 8", ""]
+    for mode_idx in range(modes):
+        mode = "main" if mode_idx == 0 else f"mode-{mode_idx}"
+        lines.append(f"[mode.{mode}.binding]")
+        used = set()
+        while len(used) < bindings_per_mode:
+            used.add(f"{rng.choice(MODIFIERS)}-{rng.choice(KEYS)}")
+        for key in sorted(used):
+            command = rng.choice(COMMANDS).format(n=rng.randint(1, 9))
+            if rng.random() < 0.3:
+                value = f"['{command}', 'mode main']"
+            else:
+                value = f"'{command}'"
+            roll = rng.random()
+            if roll < 0.15:
+                comment = f" # alfred-name: {command.title()}"
+            elif roll < 0.2:
+                comment = " # alfred-skip"
+            else:
+                comment = ""
+            lines.append(f"{key} = {value}{comment}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def typing_sequences(
+    script: str, count: int, mean_delay_ms: float = 110.0, seed: int = 7
+) -> List[Dict[str, Any]]:
+    """Keystroke bursts: every prefix of a word, with human-like gaps."""
+    rng = random.Random(seed)
+    if script == "workspace_overview.py":
+        words = [
+            f"{rng.randint(1, 9)} {rng.choice(APP_NAMES).lower()}" for _ in range(count)
+        ]
+    elif script == "shortcuts.py":
+        words = [
+            rng.choice(COMMANDS).format(n=rng.randint(1, 9)) for _ in range(count)
+        ]
+    else:
+        words = [rng.choice(APP_NAMES + TITLE_WORDS).lower() for _ in range(count)]
+    sequences = []
+    for word in words:
+        word = word[: rng.randint(4, 9)].rstrip()
+        keys = [{"query": "", "delay_ms": 0.0}]
+        for idx in range(1, len(word) + 1):
+            delay = max(20.0, rng.gauss(mean_delay_ms, mean_delay_ms / 3))
+            keys.append({"query": word[:idx], "delay_ms": round(delay, 1)})
+        sequences.append({"script": script, "keys": keys})
+    return sequences
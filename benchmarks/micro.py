@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""Micro-benchmarks for the pure-Python hot paths with regression thresholds.
+
+Each case times one function over a deterministic corpus from ``corpora``
+and reports nanoseconds per op plus the peak traced allocation per op
+(``tracemalloc``). Timings are also stored relative to a fixed calibration
+loop so that a baseline recorded on one machine stays usable on another.
+Results are compared to ``baseline.json``; the run exits non-zero when a case
+regresses past the tolerance. A baseline is the median of several full runs,
+so one unusually fast or slow run does not end up as the reference.
+
+    python3 benchmarks/micro.py                    # compare to baseline
+    python3 benchmarks/micro.py --update-baseline  # record a new baseline
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import tomllib
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "workflow" / "scripts"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import corpora
+from lib.aerospace import (
+    extract_shortcuts,
+    filter_windows,
+    fuzzy_score,
+    iter_json_list,
+    normalize_description,
+)
+from lib.alfred_metadata import extract_shortcut_metadata
+from lib.config_sections import extract_shortcuts_incremental
+from lib.fuzzy import fuzzy_scores, numpy_available
+from lib.query import build_indexes, parse_query, select_positions
+
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_TIME_TOLERANCE = 0.30
+DEFAULT_ALLOC_TOLERANCE = 0.10
+ALLOC_SLACK_BYTES = 256
+ALLOC_SAMPLES = 50
+MIN_BATCH_SECONDS = 0.05
+REPEATS = 7
+BASELINE_RUNS = 5
+
+Case = Tuple[Callable[[Any], Any], Sequence[Any]]
+CASES: Dict[str, Callable[[], Case]] = {}
+
+
+def case(name: str) -> Callable[[Callable[[], Case]], Callable[[], Case]]:
+    def register(setup: Callable[[], Case]) -> Callable[[], Case]:
+        CASES[name] = setup
+        return setup
+
+    return register
+
+
+@case("fuzzy_score")
+def _fuzzy_score() -> Case:
+    haystacks = corpora.window_titles(500) + corpora.app_names(500)
+    pairs = list(zip(corpora.queries(1000), haystacks))
+    return (lambda pair: fuzzy_score(pair[0], pair[1])), pairs
+
+
+def _batch_corpus() -> List[str]:
+    return corpora.window_titles(5000) + corpora.app_names(5000)
+
+
+@case("fuzzy_score_loop_10k")
+def _fuzzy_score_loop() -> Case:
+    haystacks = _batch_corpus()
+    return (
+        lambda query: [fuzzy_score(query, haystack) for haystack in haystacks]
+    ), corpora.queries(10)
+
+
+@case("fuzzy_scores_python_10k")
+def _fuzzy_scores_python() -> Case:
+    haystacks = _batch_corpus()
+    return (
+        lambda query: fuzzy_scores(query, haystacks, backend="python")
+    ), corpora.queries(10)
+
+
+if numpy_available():
+
+    @case("fuzzy_scores_numpy_10k")
+    def _fuzzy_scores_numpy() -> Case:
+        haystacks = _batch_corpus()
+        return (
+            lambda query: fuzzy_scores(query, haystacks, backend="numpy")
+        ), corpora.queries(10)
+
+
+@case("filter_windows")
+def _filter_windows() -> Case:
+    windows = corpora.windows(500)
+    return (lambda query: filter_windows(windows, query)), corpora.queries(40)
+
+
+@case("filter_windows_ws_filter_5k")
+def _filter_windows_ws_filter() -> Case:
+    windows = corpora.windows(5000)
+    indexes = build_indexes(windows)
+
+    def run(query: str) -> List[Any]:
+        parsed = parse_query(query)
+        positions = select_positions(indexes, parsed["filters"]) or []
+        return filter_windows([windows[idx] for idx in positions], parsed["text"])
+
+    return run, [f"ws:3 {query}" for query in corpora.queries(10)]
+
+
+@case("iter_json_list_5k")
+def _iter_json_list() -> Case:
+    text = json.dumps(corpora.windows(5000))
+    chunks = [text[idx : idx + 64 * 1024] for idx in range(0, len(text), 64 * 1024)]
+    return (lambda parts: sum(1 for _ in iter_json_list(parts))), [chunks]
+
+
+@case("normalize_description")
+def _normalize_description() -> Case:
+    return normalize_description, corpora.commands(1000)
+
+
+@case("extract_shortcuts")
+def _extract_shortcuts() -> Case:
+    text = corpora.config_text()
+    config = tomllib.loads(text)
+    return (lambda config_text: extract_shortcuts(config, config_text)), [text]
+
+
+def _edited_config() -> Tuple[str, str]:
+    text = corpora.config_text()
+    header = "[mode.mode-7.binding]\n"
+    return text, text.replace(header, f"{header}cmd-ctrl-0 = 'reload-config'\n")
+
+
+@case("config_edit_full_rebuild")
+def _config_edit_full_rebuild() -> Case:
+    _, edited = _edited_config()
+    return (lambda text: extract_shortcuts(tomllib.loads(text), text)), [edited]
+
+
+@case("config_edit_incremental")
+def _config_edit_incremental() -> Case:
+    text, edited = _edited_config()
+    _, sections = extract_shortcuts_incremental(tomllib.loads(text), text, {})
+    return (
+        lambda text: extract_shortcuts_incremental(tomllib.loads(text), text, sections)
+    ), [edited]
+
+
+@case("extract_shortcut_metadata")
+def _extract_shortcut_metadata() -> Case:
+    return extract_shortcut_metadata, [corpora.config_text()]
+
+
+def _run_batch(function: Callable[[Any], Any], inputs: Sequence[Any]) -> int:
+    started = time.perf_counter_ns()
+    for value in inputs:
+        function(value)
+    return time.perf_counter_ns() - started
+
+
+def _batches(function: Callable[[Any], Any], inputs: Sequence[Any]) -> int:
+    elapsed = _run_batch(function, inputs)
+    return max(1, int(MIN_BATCH_SECONDS * 1e9 / max(elapsed, 1)))
+
+
+def _sample_ns(function: Callable[[Any], Any], inputs: Sequence[Any], batches: int) -> float:
+    total = sum(_run_batch(function, inputs) for _ in range(batches))
+    return total / (batches * len(inputs))
+
+
+def _alloc_per_op(function: Callable[[Any], Any], inputs: Sequence[Any]) -> float:
+    sample = list(inputs[:ALLOC_SAMPLES])
+    peaks: List[int] = []
+    tracemalloc.start()
+    try:
+        for value in sample:
+            function(value)
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            function(value)
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(max(0, peak - current))
+    finally:
+        tracemalloc.stop()
+    return statistics.mean(peaks)
+
+
+def _reference(count: int) -> int:
+    total = 0
+    for idx in range(count):
+        total += idx * idx % 7
+    return total
+
+
+REFERENCE_INPUTS = [1000] * 10
+
+
+def measure(names: Sequence[str]) -> Dict[str, Any]:
+    """Time each case interleaved with the calibration loop.
+
+    Both are sampled back to back in every repeat, so machine-wide slowdowns
+    affect numerator and denominator alike. The median ratio is kept: the
+    best one pairs a lucky case sample with an unlucky calibration sample
+    and is not reproduced by later runs.
+    """
+    results: Dict[str, Any] = {}
+    reference_batches = _batches(_reference, REFERENCE_INPUTS)
+    for name in names:
+        function, inputs = CASES[name]()
+        batches = _batches(function, inputs)
+        samples = []
+        for _ in range(REPEATS):
+            calibration = _sample_ns(_reference, REFERENCE_INPUTS, reference_batches)
+            samples.append((_sample_ns(function, inputs, batches), calibration))
+        ns_per_op = min(sample for sample, _ in samples)
+        relative = statistics.median(
+            sample / calibration for sample, calibration in samples
+        )
+        results[name] = {
+            "ns_per_op": round(ns_per_op, 1),
+            "relative": round(relative, 6),
+            "alloc_bytes_per_op": round(_alloc_per_op(function, inputs), 1),
+        }
+    return {"cases": results}
+
+
+def merge_runs(runs: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """Median of every measured field over several ``measure`` results."""
+    results: Dict[str, Any] = {}
+    for name in runs[0]["cases"]:
+        fields = runs[0]["cases"][name]
+        results[name] = {
+            field: round(statistics.median(run["cases"][name][field] for run in runs), 6)
+            for field in fields
+        }
+    return {"cases": results}
+
+
+def compare(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    time_tolerance: float,
+    alloc_tolerance: float,
+) -> List[str]:
+    regressions = []
+    for name, result in current["cases"].items():
+        expected = baseline.get("cases", {}).get(name)
+        if not expected:
+            continue
+        time_limit = expected["relative"] * (1 + time_tolerance)
+        if result["relative"] > time_limit:
+            regressions.append(
+                f"{name}: time {result['relative']:.4f} > {time_limit:.4f} "
+                f"(baseline {expected['relative']:.4f} relative units)"
+            )
+        alloc_limit = (
+            expected["alloc_bytes_per_op"] * (1 + alloc_tolerance) + ALLOC_SLACK_BYTES
+        )
+        if result["alloc_bytes_per_op"] > alloc_limit:
+            regressions.append(
+                f"{name}: allocations {result['alloc_bytes_per_op']:.0f} B/op "
+                f"> {alloc_limit:.0f} B/op"
+            )
+    return regressions
+
+
+def _print_table(current: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    print(f"{'case':<28}{'ns/op':>14}{'alloc B/op':>14}{'vs baseline':>14}")
+    for name, result in current["cases"].items():
+        expected = baseline.get("cases", {}).get(name)
+        change = ""
+        if expected:
+            change = f"{result['relative'] / expected['relative'] - 1:+.1%}"
+        print(
+            f"{name:<28}{result['ns_per_op']:>14,.1f}"
+            f"{result['alloc_bytes_per_op']:>14,.0f}{change:>14}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("cases", nargs="*", help="case names (default: all)")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument(
+        "--runs",
+        type=int,
+        help=f"full runs to take the median of (default 1, {BASELINE_RUNS} for a baseline)",
+    )
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TIME_TOLERANCE)
+    parser.add_argument(
+        "--alloc-tolerance", type=float, default=DEFAULT_ALLOC_TOLERANCE
+    )
+    options = parser.parse_args()
+
+    unknown = [name for name in options.cases if name not in CASES]
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(unknown)}")
+    names = options.cases or list(CASES)
+
+    runs = options.runs or (BASELINE_RUNS if options.update_baseline else 1)
+    current = merge_runs([measure(names) for _ in range(max(1, runs))])
+    baseline: Dict[str, Any] = {}
+    if options.baseline.exists():
+        baseline = json.loads(options.baseline.read_text(encoding="utf-8"))
+    _print_table(current, baseline)
+
+    if options.update_baseline:
+        merged = dict(baseline.get("cases", {}))
+        merged.update(current["cases"])
+        options.baseline.write_text(
+            json.dumps({"cases": merged}, indent=2, sort_keys=True) + "\n",
+            encoding="utf-8",
+        )
+        print(f"Updated {options.baseline}")
+        return
+
+    regressions = compare(
+        current, baseline, options.tolerance, options.alloc_tolerance
+    )
+    if regressions:
+        print("\nRegressions:")
+        for regression in regressions:
+            print(f"  {regression}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Compare per-call latency of the native socket client with ``run_command``.
+
+By default both paths talk to a local stand-in server; the CLI path goes
+through a small stand-in ``aerospace`` executable that performs the same
+socket round trip. Pass ``--real`` on a Mac running AeroSpace to measure the
+real server and CLI instead.
+"""
+
+import argparse
+import os
+import statistics
+import stat
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "workflow" / "scripts"))
+sys.path.insert(0, str(ROOT / "tests"))
+
+from lib import aerospace_socket
+from lib.aerospace import run_command
+from socket_server_stub import StubServer
+
+
+STAND_IN_CLI = """#!{python}
+import json, socket, sys
+client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+client.connect({path!r})
+client.sendall(json.dumps({{"command": "", "args": sys.argv[1:], "stdin": ""}}).encode())
+client.shutdown(socket.SHUT_WR)
+data = b""
+while True:
+    chunk = client.recv(65536)
+    if not chunk:
+        break
+    data += chunk
+answer = json.loads(data)
+sys.stdout.write(answer["stdout"])
+sys.exit(answer["exitCode"])
+"""
+
+
+def _time_calls(call, iterations: int) -> list:
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter_ns()
+        call()
+        samples.append((time.perf_counter_ns() - started) / 1_000_000)
+    return samples
+
+
+def _report(label: str, samples: list) -> None:
+    print(
+        f"{label:<12} median {statistics.median(samples):8.3f} ms"
+        f"  min {min(samples):8.3f} ms  n={len(samples)}"
+    )
+
+
+def _run(args: list, iterations: int) -> None:
+    native = _time_calls(
+        lambda: aerospace_socket.send_request(args, timeout=5), iterations
+    )
+    cli = _time_calls(lambda: run_command(["aerospace", *args]), iterations)
+    _report("native", native)
+    _report("cli", cli)
+    saving = statistics.median(cli) - statistics.median(native)
+    print(f"per-call saving {saving:.3f} ms ({' '.join(args)})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--real", action="store_true")
+    options = parser.parse_args()
+    args = ["list-workspaces", "--all", "--json"]
+
+    if options.real:
+        _run(args, options.iterations)
+        return
+
+    with StubServer() as server, tempfile.TemporaryDirectory() as bin_dir:
+        cli_path = Path(bin_dir) / "aerospace"
+        cli_path.write_text(STAND_IN_CLI.format(python=sys.executable, path=server.path))
+        cli_path.chmod(cli_path.stat().st_mode | stat.S_IXUSR)
+        os.environ["AEROSPACE_SOCKET"] = server.path
+        os.environ["PATH"] = f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}"
+        _run(args, options.iterations)
+
+
+if __name__ == "__main__":
+    main()
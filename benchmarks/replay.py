@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""Replay typing bursts against the script filters the way Alfred runs them.
+
+Every keystroke starts a new script process with the query so far; a run
+that is still going when the next keystroke arrives is killed, as Alfred
+does. Variables from the last completed response are passed to later runs
+of the same burst. The scripts talk to the AeroSpace simulator from
+``tests/aerospace_sim.py``, serving generated or recorded state with
+configurable latency.
+
+Reported per script: time from the last keystroke to its result, CPU spent
+in killed runs, runs that had to call AeroSpace (cache misses), and snapshot
+files that were unreadable or left half-written afterwards.
+
+    python3 benchmarks/replay.py
+    python3 benchmarks/replay.py windows.py --bursts 20 --latency-ms 40
+    python3 benchmarks/replay.py --record bursts.json
+    python3 benchmarks/replay.py --sequences bursts.json
+"""
+
+import argparse
+import json
+import os
+import signal
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPTS_DIR = ROOT / "workflow" / "scripts"
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(ROOT / "tests"))
+
+import corpora
+from aerospace_sim import Simulator, generate_state
+
+
+SCRIPTS = ["windows.py", "workspace_overview.py", "shortcuts.py"]
+POLL_SECONDS = 0.002
+
+
+class Run:
+    def __init__(self, query: str, env: Dict[str, str], script: str, work: Path) -> None:
+        self.query = query
+        self.output_path = work / f"run-{time.perf_counter_ns()}.out"
+        self.started = time.perf_counter()
+        with open(self.output_path, "wb") as output:
+            self.pid = os.posix_spawn(
+                sys.executable,
+                [sys.executable, str(SCRIPTS_DIR / script), query],
+                {**env},
+                file_actions=[
+                    (os.POSIX_SPAWN_OPEN, 0, os.devnull, os.O_RDONLY, 0),
+                    (os.POSIX_SPAWN_DUP2, output.fileno(), 1),
+                    (os.POSIX_SPAWN_OPEN, 2, os.devnull, os.O_WRONLY, 0),
+                ],
+            )
+        self.finished: Optional[float] = None
+        self.cpu_seconds = 0.0
+        self.killed = False
+        self.status = 0
+
+    def poll(self) -> bool:
+        if self.finished is not None:
+            return True
+        pid, status, usage = os.wait4(self.pid, os.WNOHANG)
+        if pid == 0:
+            return False
+        self._finish(status, usage)
+        return True
+
+    def kill(self) -> None:
+        if self.poll():
+            return
+        os.kill(self.pid, signal.SIGKILL)
+        _, status, usage = os.wait4(self.pid, 0)
+        self.killed = True
+        self._finish(status, usage)
+
+    def _finish(self, status: int, usage: Any) -> None:
+        self.finished = time.perf_counter()
+        self.status = status
+        self.cpu_seconds = usage.ru_utime + usage.ru_stime
+
+    def response(self) -> Optional[Dict[str, Any]]:
+        try:
+            return json.loads(self.output_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+
+def _check_cache(cache_dir: Path) -> Dict[str, int]:
+    corrupt = 0
+    for path in cache_dir.glob("snapshot_*.json"):
+        try:
+            json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            corrupt += 1
+    return {"corrupt": corrupt, "stray_tmp": len(list(cache_dir.glob("*.tmp")))}
+
+
+def replay_burst(
+    burst: Dict[str, Any], base_env: Dict[str, str], work: Path
+) -> Dict[str, Any]:
+    runs: List[Run] = []
+    variables: Dict[str, str] = {}
+    last_keystroke = time.perf_counter()
+    for key in burst["keys"]:
+        deadline = time.perf_counter() + key["delay_ms"] / 1000
+        while time.perf_counter() < deadline:
+            for run in runs:
+                if run.poll() and not run.killed and run is runs[-1]:
+                    variables = (run.response() or {}).get("variables") or variables
+            time.sleep(POLL_SECONDS)
+        for run in runs:
+            run.kill()
+        last_keystroke = time.perf_counter()
+        env = {**base_env, **burst.get("env", {}), **variables}
+        runs.append(Run(key["query"], env, burst["script"], work))
+
+    final = runs[-1]
+    while not final.poll():
+        time.sleep(POLL_SECONDS)
+    response = final.response()
+    return {
+        "runs": runs,
+        "time_to_final_ms": (final.finished - last_keystroke) * 1000,
+        "valid": bool(response and response.get("items")) and final.status == 0,
+    }
+
+
+def replay(
+    bursts: List[Dict[str, Any]], state: Dict[str, Any], cold: bool
+) -> Dict[str, Dict[str, Any]]:
+    results: Dict[str, Dict[str, Any]] = {}
+    with Simulator(state) as sim:
+        work = sim.root
+        cache_dir = work / "cache"
+        cache_dir.mkdir()
+        config_path = work / "aerospace.toml"
+        config_path.write_text(corpora.config_text(), encoding="utf-8")
+        with sim.edit() as current:
+            current["config-path"] = str(config_path)
+        base_env = {
+            **sim.env,
+            "HOME": os.environ.get("HOME", str(work)),
+            "alfred_workflow_cache": str(cache_dir),
+        }
+
+        for burst in bursts:
+            if cold:
+                for path in cache_dir.iterdir():
+                    path.unlink()
+            sim.reset_calls()
+            outcome = replay_burst(burst, base_env, work)
+            callers = {entry["ppid"] for entry in sim.call_log()}
+            cache = _check_cache(cache_dir)
+
+            summary = results.setdefault(
+                burst["script"],
+                {
+                    "bursts": 0,
+                    "runs": 0,
+                    "killed": 0,
+                    "invalid_final": 0,
+                    "time_to_final_ms": [],
+                    "wasted_cpu_ms": 0.0,
+                    "misses": 0,
+                    "corrupt": 0,
+                    "stray_tmp": 0,
+                },
+            )
+            runs = outcome["runs"]
+            summary["bursts"] += 1
+            summary["runs"] += len(runs)
+            summary["killed"] += sum(run.killed for run in runs)
+            summary["invalid_final"] += not outcome["valid"]
+            summary["time_to_final_ms"].append(outcome["time_to_final_ms"])
+            summary["wasted_cpu_ms"] += 1000 * sum(
+                run.cpu_seconds for run in runs if run.killed
+            )
+            summary["misses"] += sum(run.pid in callers for run in runs)
+            summary["corrupt"] += cache["corrupt"]
+            summary["stray_tmp"] += cache["stray_tmp"]
+    return results
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _print_report(results: Dict[str, Dict[str, Any]]) -> None:
+    print(
+        f"{'script':<24}{'runs':>6}{'killed':>8}{'final p50':>11}{'final p95':>11}"
+        f"{'wasted cpu':>12}{'misses':>8}{'corrupt':>9}{'tmp':>5}{'bad':>5}"
+    )
+    for script, summary in results.items():
+        times = summary["time_to_final_ms"]
+        print(
+            f"{script:<24}{summary['runs']:>6}{summary['killed']:>8}"
+            f"{statistics.median(times):>9.1f}ms{_percentile(times, 0.95):>9.1f}ms"
+            f"{summary['wasted_cpu_ms']:>10.1f}ms{summary['misses']:>8}"
+            f"{summary['corrupt']:>9}{summary['stray_tmp']:>5}"
+            f"{summary['invalid_final']:>5}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("scripts", nargs="*", help="scripts (default: all)")
+    parser.add_argument("--bursts", type=int, default=10, help="bursts per script")
+    parser.add_argument("--delay-ms", type=float, default=110.0)
+    parser.add_argument("--latency-ms", type=float, default=15.0)
+    parser.add_argument("--windows", type=int, default=120)
+    parser.add_argument("--state", type=Path, help="simulator state (e.g. recorded)")
+    parser.add_argument("--cold", action="store_true", help="clear the cache per burst")
+    parser.add_argument("--sequences", type=Path, help="replay bursts from a file")
+    parser.add_argument("--record", type=Path, help="write the bursts to a file")
+    parser.add_argument("--json", action="store_true")
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="exit non-zero on corrupt snapshots or invalid final results",
+    )
+    options = parser.parse_args()
+
+    unknown = [script for script in options.scripts if script not in SCRIPTS]
+    if unknown:
+        parser.error(f"unknown scripts: {', '.join(unknown)}")
+    if options.sequences:
+        bursts = json.loads(options.sequences.read_text(encoding="utf-8"))
+    else:
+        bursts = [
+            burst
+            for script in options.scripts or SCRIPTS
+            for burst in corpora.typing_sequences(
+                script, options.bursts, options.delay_ms
+            )
+        ]
+    if options.record:
+        options.record.write_text(json.dumps(bursts, indent=2), encoding="utf-8")
+
+    if options.state:
+        state = json.loads(options.state.read_text(encoding="utf-8"))
+    else:
+        state = generate_state(windows=options.windows)
+    state["latency_ms"] = options.latency_ms
+    results = replay(bursts, state, options.cold)
+    if options.json:
+        print(json.dumps(results, indent=2))
+    else:
+        _print_report(results)
+    if options.check and any(
+        summary["corrupt"] or summary["stray_tmp"] or summary["invalid_final"]
+        for summary in results.values()
+    ):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
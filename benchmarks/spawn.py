@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Compare per-call spawn overhead of ``lib.spawn`` with the previous helper.
+
+Before, ``run_command`` copied the environment, extended its ``PATH``
+on every call and ran the bare command name with ``text=True``, which let
+``subprocess`` fork and search ``PATH`` in the child. Both paths run the same
+stand-in ``aerospace`` executable, a shell script that prints a short JSON
+answer, so the difference is the cost of starting and reaping the process.
+Wall time and the CPU time spent in this process are reported per call.
+Pass ``--command`` to time another executable instead, e.g. ``mdfind``.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "workflow" / "scripts"))
+
+from lib.aerospace import run_command
+from lib.spawn import DEFAULT_PATHS
+
+
+STAND_IN_CLI = """#!/bin/sh
+echo '[{"workspace": "1"}]'
+"""
+
+
+def _previous_run_command(args: list, timeout: int = 15) -> str:
+    env = os.environ.copy()
+    parts = [part for part in env.get("PATH", "").split(os.pathsep) if part]
+    for path in DEFAULT_PATHS:
+        if path not in parts:
+            parts.append(path)
+    env["PATH"] = os.pathsep.join(parts)
+    result = subprocess.run(args, capture_output=True, text=True, env=env, timeout=timeout)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or "Command failed.")
+    return result.stdout
+
+
+def _time_calls(calls: list, iterations: int) -> list:
+    """Time ``calls`` in turn on every iteration so drift hits them alike."""
+    samples = [([], []) for _ in calls]
+    for _ in range(iterations):
+        for call, (wall, cpu) in zip(calls, samples):
+            started = time.perf_counter_ns()
+            started_cpu = time.process_time_ns()
+            call()
+            cpu.append((time.process_time_ns() - started_cpu) / 1_000_000)
+            wall.append((time.perf_counter_ns() - started) / 1_000_000)
+    return samples
+
+
+def _report(label: str, samples: tuple) -> None:
+    wall, cpu = samples
+    print(
+        f"{label:<10} wall median {statistics.median(wall):7.3f} ms"
+        f"  min {min(wall):7.3f} ms  cpu median {statistics.median(cpu):7.3f} ms"
+        f"  n={len(wall)}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--command", nargs="+")
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as bin_dir:
+        args = options.command
+        if args is None:
+            cli_path = Path(bin_dir) / "aerospace"
+            cli_path.write_text(STAND_IN_CLI)
+            cli_path.chmod(0o755)
+            os.environ["PATH"] = f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}"
+            args = ["aerospace", "list-workspaces", "--all", "--json"]
+        # Warm both paths, including the executable lookup of the new one.
+        _previous_run_command(args)
+        run_command(args)
+        previous, current = _time_calls(
+            [lambda: _previous_run_command(args), lambda: run_command(args)],
+            options.iterations,
+        )
+
+    _report("previous", previous)
+    _report("spawn", current)
+    saving = statistics.median(previous[0]) - statistics.median(current[0])
+    print(f"per-call saving {saving:.3f} ms ({' '.join(args)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Compare interpreter startup with the library imported from source or bundle.
+
+Each run starts a fresh interpreter that imports the modules a script filter
+needs, the way an entry point does. It reports the wall time of the whole
+process, the time spent importing, and how many files (in total and within
+the workflow and its cache) and directory listings the imports touched,
+counted with an audit hook so it works without strace.
+The source runs use a fresh ``__pycache__``-free copy of the scripts when
+``--cold`` is given, which is what a workflow folder that cannot keep its
+bytecode cache sees on every run.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPTS_DIR = ROOT / "workflow" / "scripts"
+
+CHILD = """
+import sys, time
+counts = {{"open": 0, "workflow_open": 0, "listdir": 0}}
+def hook(event, args):
+    if event == "open":
+        counts["open"] += 1
+        if str(args[0]).startswith({root!r}):
+            counts["workflow_open"] += 1
+    elif event in ("os.listdir", "os.scandir"):
+        counts["listdir"] += 1
+sys.addaudithook(hook)
+sys.path.insert(0, {scripts!r})
+started = time.perf_counter()
+import lib.aerospace, lib.aerospace_async, lib.query, lib.session, lib.snapshot
+counts["import_ms"] = (time.perf_counter() - started) * 1000
+counts["bundled"] = lib.aerospace.__file__.endswith(".pyc")
+print(__import__("json").dumps(counts))
+"""
+
+
+def _run_once(scripts_dir: Path, env: dict) -> dict:
+    started = time.perf_counter()
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            CHILD.format(scripts=str(scripts_dir), root=str(scripts_dir.parent)),
+        ],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    sample = json.loads(result.stdout)
+    sample["wall_ms"] = (time.perf_counter() - started) * 1000
+    return sample
+
+
+def _measure(label: str, scripts_dir: Path, env: dict, runs: int, cold: bool) -> None:
+    samples = []
+    for _ in range(runs):
+        if cold:
+            for cache in scripts_dir.rglob("__pycache__"):
+                shutil.rmtree(cache)
+        samples.append(_run_once(scripts_dir, env))
+    print(
+        f"{label:<10} wall {statistics.median(s['wall_ms'] for s in samples):7.1f} ms"
+        f"  imports {statistics.median(s['import_ms'] for s in samples):6.1f} ms"
+        f"  file opens {statistics.median(s['open'] for s in samples):5.0f}"
+        f" ({statistics.median(s['workflow_open'] for s in samples):.0f} workflow)"
+        f"  dir listings {statistics.median(s['listdir'] for s in samples):3.0f}"
+        f"  bundled={samples[-1]['bundled']}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--cold", action="store_true")
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        scripts_dir = Path(root) / "scripts"
+        shutil.copytree(SCRIPTS_DIR, scripts_dir, ignore=shutil.ignore_patterns("__pycache__"))
+        cache_dir = Path(root) / "cache"
+        cache_dir.mkdir()
+        env = dict(os.environ, alfred_workflow_cache=str(cache_dir))
+        subprocess.run(
+            [sys.executable, str(scripts_dir / "build_bundle.py")], env=env, check=True
+        )
+        _measure(
+            "source", scripts_dir, dict(env, AEROSPACE_BUNDLE="0"), options.runs, options.cold
+        )
+        _measure("bundle", scripts_dir, env, options.runs, cold=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,690 @@
+#!/usr/bin/env python3
+"""Deterministic, stateful stand-in for the AeroSpace CLI.
+
+The simulator keeps generated (or recorded) windows, workspaces and monitors
+in a JSON state file and answers ``list-windows``, ``list-workspaces``,
+``focus``, ``layout``, ``trigger-binding`` and ``config --config-path`` with
+the same ``--json --format`` output shape as AeroSpace. ``focus`` and
+``layout`` change the state, and per-command faults inject latency, failures
+or hangs. ``Simulator`` installs ``aerospace`` and ``mdfind`` executables
+into a temporary ``PATH`` and can also answer on a server socket.
+
+    python3 tests/aerospace_sim.py generate --windows 300 > state.json
+    python3 tests/aerospace_sim.py record --anonymize > state.json   # on a Mac
+    python3 tests/aerospace_sim.py scale state.json 10 > large.json
+"""
+
+import argparse
+import fcntl
+import json
+import os
+import random
+import re
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+STATE_VERSION = 1
+SERVER_VERSION = "0.0.0-sim sim"
+HANG_SECONDS = 3600
+
+WINDOW_VARIABLES = [
+    "window-id",
+    "window-title",
+    "window-layout",
+    "window-parent-container-layout",
+    "window-is-fullscreen",
+    "app-name",
+    "app-pid",
+    "app-bundle-id",
+    "workspace",
+    "workspace-is-focused",
+    "workspace-is-visible",
+    "workspace-root-container-layout",
+    "monitor-id",
+    "monitor-name",
+    "monitor-is-main",
+]
+WORKSPACE_VARIABLES = [
+    "workspace",
+    "workspace-is-focused",
+    "workspace-is-visible",
+    "workspace-root-container-layout",
+    "monitor-id",
+    "monitor-name",
+    "monitor-is-main",
+]
+DEFAULT_WINDOW_FORMAT = "%{window-id} | %{app-name} | %{window-title}"
+DEFAULT_WORKSPACE_FORMAT = "%{workspace}"
+FORMAT_VARIABLE = re.compile(r"%\{([\w-]+)\}")
+TILING_LAYOUTS = {"h_tiles", "v_tiles", "h_accordion", "v_accordion"}
+
+APPS = [
+    ("Google Chrome", "com.google.Chrome"),
+    ("Safari", "com.apple.Safari"),
+    ("Slack", "com.tinyspeck.slackmacgap"),
+    ("iTerm2", "com.googlecode.iterm2"),
+    ("Visual Studio Code", "com.microsoft.VSCode"),
+    ("Finder", "com.apple.finder"),
+    ("Mail", "com.apple.mail"),
+    ("Notes", "com.apple.Notes"),
+    ("Spotify", "com.spotify.client"),
+    ("Figma", "com.figma.Desktop"),
+]
+TITLE_WORDS = [
+    "inbox",
+    "review",
+    "design",
+    "sprint",
+    "notes",
+    "release",
+    "dashboard",
+    "meeting",
+    "README.md",
+    "main.py",
+]
+MONITORS = ["Built-in Retina Display", "DELL U2720Q", "LG HDR 4K"]
+
+
+class SimulatorError(Exception):
+    """An AeroSpace-style usage error: printed to stderr with exit code 1."""
+
+
+def generate_state(
+    windows: int = 40, workspaces: int = 9, monitors: int = 2, seed: int = 1
+) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    monitor_names = MONITORS[: max(1, min(monitors, len(MONITORS)))]
+    workspace_list = [
+        {
+            "workspace": str(idx + 1),
+            "monitor-name": monitor_names[idx % len(monitor_names)],
+            "workspace-root-container-layout": "h_tiles",
+        }
+        for idx in range(workspaces)
+    ]
+    window_list = []
+    for idx in range(windows):
+        app_name, bundle_id = rng.choice(APPS)
+        layout = rng.choice(["h_tiles", "h_tiles", "v_accordion", "floating"])
+        window_list.append(
+            {
+                "window-id": 1000 + idx,
+                "window-title": " ".join(rng.sample(TITLE_WORDS, rng.randint(1, 4))),
+                "window-layout": layout,
+                "window-parent-container-layout": (
+                    "h_tiles" if layout == "floating" else layout
+                ),
+                "window-is-fullscreen": False,
+                "app-name": app_name,
+                "app-pid": 400 + APPS.index((app_name, bundle_id)),
+                "app-bundle-id": bundle_id,
+                "workspace": rng.choice(workspace_list)["workspace"],
+            }
+        )
+    focused_workspace = window_list[0]["workspace"] if window_list else "1"
+    visible = {name: None for name in monitor_names}
+    for entry in workspace_list:
+        if visible[entry["monitor-name"]] is None:
+            visible[entry["monitor-name"]] = entry["workspace"]
+    focused_entry = _workspace_entry(workspace_list, focused_workspace)
+    visible[focused_entry["monitor-name"]] = focused_workspace
+    return {
+        "version": STATE_VERSION,
+        "monitors": monitor_names,
+        "workspaces": workspace_list,
+        "windows": window_list,
+        "focus": {
+            "workspace": focused_workspace,
+            "window-id": window_list[0]["window-id"] if window_list else None,
+        },
+        "visible": visible,
+        "app-paths": {bundle: f"/Applications/{name}.app" for name, bundle in APPS},
+        "config-path": "",
+        "latency_ms": 0,
+        "faults": {},
+        "triggered": [],
+    }
+
+
+def scale_state(state: Dict[str, Any], factor: int) -> Dict[str, Any]:
+    """Repeat the windows ``factor`` times with fresh ids, keeping their shape."""
+    scaled = json.loads(json.dumps(state))
+    originals = list(scaled["windows"])
+    next_id = max((window["window-id"] for window in originals), default=0) + 1
+    for _ in range(max(0, factor - 1)):
+        for window in originals:
+            scaled["windows"].append(dict(window, **{"window-id": next_id}))
+            next_id += 1
+    return scaled
+
+
+def _workspace_entry(workspaces: List[Dict[str, Any]], name: str) -> Dict[str, Any]:
+    for entry in workspaces:
+        if entry["workspace"] == name:
+            return entry
+    raise SimulatorError(f"Workspace '{name}' doesn't exist")
+
+
+def _workspace_values(state: Dict[str, Any], entry: Dict[str, Any]) -> Dict[str, Any]:
+    monitor = entry["monitor-name"]
+    monitors = state["monitors"]
+    return {
+        "workspace": entry["workspace"],
+        "workspace-is-focused": entry["workspace"] == state["focus"]["workspace"],
+        "workspace-is-visible": state["visible"].get(monitor) == entry["workspace"],
+        "workspace-root-container-layout": entry.get(
+            "workspace-root-container-layout", "h_tiles"
+        ),
+        "monitor-id": monitors.index(monitor) + 1 if monitor in monitors else 1,
+        "monitor-name": monitor,
+        "monitor-is-main": bool(monitors) and monitor == monitors[0],
+    }
+
+
+def _window_values(state: Dict[str, Any], window: Dict[str, Any]) -> Dict[str, Any]:
+    values = _workspace_values(
+        state, _workspace_entry(state["workspaces"], window["workspace"])
+    )
+    values.update(window)
+    return values
+
+
+def _render(rows: List[Dict[str, Any]], template: str, as_json: bool) -> str:
+    variables = FORMAT_VARIABLE.findall(template)
+    if as_json:
+        return json.dumps(
+            [{name: row.get(name, "") for name in variables} for row in rows], indent=2
+        ) + "\n"
+
+    def text(row: Dict[str, Any]) -> str:
+        def value(match: "re.Match[str]") -> str:
+            item = row.get(match.group(1), "")
+            return str(item).lower() if isinstance(item, bool) else str(item)
+
+        return FORMAT_VARIABLE.sub(value, template)
+
+    return "".join(text(row) + "\n" for row in rows)
+
+
+def _option(args: List[str], name: str) -> Optional[str]:
+    if name not in args:
+        return None
+    idx = args.index(name)
+    if idx + 1 >= len(args):
+        raise SimulatorError(f"Option '{name}' requires an argument")
+    return args[idx + 1]
+
+
+def _list_windows(state: Dict[str, Any], args: List[str]) -> str:
+    windows = state["windows"]
+    workspace = _option(args, "--workspace")
+    if "--focused" in args:
+        focused = state["focus"]["window-id"]
+        windows = [window for window in windows if window["window-id"] == focused]
+    elif workspace is not None:
+        if workspace == "focused":
+            workspace = state["focus"]["workspace"]
+        _workspace_entry(state["workspaces"], workspace)
+        windows = [window for window in windows if window["workspace"] == workspace]
+    elif "--all" not in args:
+        raise SimulatorError(
+            "Mandatory option is not specified (--all|--focused|--workspace)"
+        )
+    rows = [_window_values(state, window) for window in windows]
+    return _render(
+        rows, _option(args, "--format") or DEFAULT_WINDOW_FORMAT, "--json" in args
+    )
+
+
+def _list_workspaces(state: Dict[str, Any], args: List[str]) -> str:
+    entries = state["workspaces"]
+    if "--focused" in args:
+        entries = [_workspace_entry(entries, state["focus"]["workspace"])]
+    elif "--all" not in args:
+        raise SimulatorError(
+            "Mandatory option is not specified (--all|--focused|--monitor)"
+        )
+    rows = [_workspace_values(state, entry) for entry in entries]
+    return _render(
+        rows, _option(args, "--format") or DEFAULT_WORKSPACE_FORMAT, "--json" in args
+    )
+
+
+def _focus(state: Dict[str, Any], args: List[str]) -> str:
+    window_id = _option(args, "--window-id")
+    if window_id is None:
+        raise SimulatorError("Only 'focus --window-id' is simulated")
+    window = next(
+        (item for item in state["windows"] if str(item["window-id"]) == window_id), None
+    )
+    if window is None:
+        raise SimulatorError(f"Can't find window with ID {window_id}")
+    entry = _workspace_entry(state["workspaces"], window["workspace"])
+    state["focus"] = {"workspace": window["workspace"], "window-id": window["window-id"]}
+    state["visible"][entry["monitor-name"]] = window["workspace"]
+    return ""
+
+
+def _next_layout(window: Dict[str, Any], requested: str) -> Tuple[str, str]:
+    current = window.get("window-layout", "h_tiles")
+    parent = window.get("window-parent-container-layout", "h_tiles")
+    orientation, kind = parent.split("_", 1) if "_" in parent else ("h", "tiles")
+    if requested == "floating":
+        return "floating", parent
+    if requested == "tiling":
+        return parent, parent
+    if requested in TILING_LAYOUTS:
+        return requested, requested
+    if requested in {"tiles", "accordion"}:
+        layout = f"{orientation}_{requested}"
+    elif requested in {"horizontal", "vertical"}:
+        layout = f"{requested[0]}_{kind}"
+    else:
+        raise SimulatorError(f"Unknown layout '{requested}'")
+    return (current if current == "floating" else layout), layout
+
+
+def _target_window(state: Dict[str, Any], args: List[str]) -> Dict[str, Any]:
+    window_id = _option(args, "--window-id")
+    if window_id is None:
+        focused = state["focus"]["window-id"]
+        window = next(
+            (item for item in state["windows"] if item["window-id"] == focused), None
+        )
+        if window is None:
+            raise SimulatorError("No window is focused")
+        return window
+    window = next(
+        (item for item in state["windows"] if str(item["window-id"]) == window_id), None
+    )
+    if window is None:
+        raise SimulatorError(f"Can't find window with ID {window_id}")
+    return window
+
+
+def _positional(args: List[str]) -> List[str]:
+    values = []
+    skip = False
+    for arg in args:
+        if skip:
+            skip = False
+        elif arg == "--window-id":
+            skip = True
+        elif not arg.startswith("--"):
+            values.append(arg)
+    return values
+
+
+def _layout(state: Dict[str, Any], args: List[str]) -> str:
+    layouts = _positional(args)
+    if not layouts:
+        raise SimulatorError("Argument '<layout>' is mandatory")
+    window = _target_window(state, args)
+    current = window.get("window-layout")
+    # Like AeroSpace, the first layout that differs from the current one wins.
+    requested = next((layout for layout in layouts if layout != current), layouts[0])
+    window["window-layout"], window["window-parent-container-layout"] = _next_layout(
+        window, requested
+    )
+    return ""
+
+
+def _move_node_to_workspace(state: Dict[str, Any], args: List[str]) -> str:
+    names = _positional(args)
+    if not names:
+        raise SimulatorError("Argument '<workspace-name>' is mandatory")
+    window = _target_window(state, args)
+    # Simulated workspaces are all persistent, so the target must exist.
+    _workspace_entry(state["workspaces"], names[0])
+    window["workspace"] = names[0]
+    if window["window-id"] == state["focus"]["window-id"]:
+        # Without --focus-follows-window the focus stays on the workspace.
+        state["focus"]["window-id"] = None
+    return ""
+
+
+def _close(state: Dict[str, Any], args: List[str]) -> str:
+    window = _target_window(state, args)
+    state["windows"].remove(window)
+    if window["window-id"] == state["focus"]["window-id"]:
+        state["focus"]["window-id"] = None
+    return ""
+
+
+def _trigger_binding(state: Dict[str, Any], args: List[str]) -> str:
+    mode = _option(args, "--mode")
+    if not args or mode is None:
+        raise SimulatorError("Usage: trigger-binding <binding> --mode <mode-id>")
+    state["triggered"].append({"binding": args[0], "mode": mode})
+    return ""
+
+
+COMMANDS = {
+    "list-windows": (_list_windows, False),
+    "list-workspaces": (_list_workspaces, False),
+    "focus": (_focus, True),
+    "layout": (_layout, True),
+    "move-node-to-workspace": (_move_node_to_workspace, True),
+    "close": (_close, True),
+    "trigger-binding": (_trigger_binding, True),
+}
+
+
+@contextmanager
+def _locked_state(path: Path) -> Iterator[Dict[str, Any]]:
+    with open(path, "r+", encoding="utf-8") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        state = json.load(handle)
+        yield state
+        handle.seek(0)
+        handle.truncate()
+        json.dump(state, handle)
+
+
+def _read_state(path: Path) -> Dict[str, Any]:
+    # Shared lock: a mutating command truncates the file before rewriting it.
+    with open(path, "r", encoding="utf-8") as handle:
+        fcntl.flock(handle, fcntl.LOCK_SH)
+        return json.load(handle)
+
+
+def _apply_fault(state: Dict[str, Any], command: str) -> Tuple[Optional[str], float]:
+    """Consume the fault configured for ``command``: ``(failure, latency_ms)``."""
+    latency = state.get("latency_ms", 0)
+    fault = state.get("faults", {}).get(command)
+    failure = None
+    hang = False
+    if fault:
+        latency += fault.get("latency_ms", 0)
+        failure = fault.get("fail")
+        hang = bool(fault.get("hang"))
+        if "times" in fault:
+            fault["times"] -= 1
+            if fault["times"] <= 0:
+                del state["faults"][command]
+    if hang:
+        latency = HANG_SECONDS * 1000
+    return failure, latency
+
+
+def dispatch(state_path: Path, args: List[str]) -> Tuple[int, str, str]:
+    """Run one CLI invocation against the state file: ``(code, stdout, stderr)``."""
+    log_path = state_path.with_suffix(".calls.jsonl")
+    with open(log_path, "a", encoding="utf-8") as log:
+        log.write(json.dumps({"ppid": os.getppid(), "args": args}) + "\n")
+    if not args:
+        return 1, "", "Usage: aerospace <command>\n"
+    command = args[0]
+    with _locked_state(state_path) as state:
+        failure, latency = _apply_fault(state, command)
+    if latency:
+        time.sleep(latency / 1000)
+    if failure:
+        return 1, "", failure + "\n"
+    if args[:2] == ["config", "--config-path"]:
+        with _locked_state(state_path) as state:
+            return 0, state.get("config-path", "") + "\n", ""
+    if command not in COMMANDS:
+        return 1, "", f"Unknown command '{command}'\n"
+    handler, mutates = COMMANDS[command]
+    try:
+        if mutates:
+            with _locked_state(state_path) as state:
+                return 0, handler(state, args[1:]), ""
+        state = _read_state(state_path)
+        return 0, handler(state, args[1:]), ""
+    except SimulatorError as exc:
+        return 1, "", f"{exc}\n"
+
+
+def _mdfind(state_path: Path, args: List[str]) -> int:
+    match = re.search(r'kMDItemCFBundleIdentifier="([^"]*)"', " ".join(args))
+    state = _read_state(state_path)
+    path = state.get("app-paths", {}).get(match.group(1)) if match else None
+    if path:
+        print(path)
+    return 0
+
+
+WRAPPER = """#!{python}
+import sys
+sys.path.insert(0, {directory!r})
+import aerospace_sim
+sys.exit(aerospace_sim.{entry}({state!r}, sys.argv[1:]))
+"""
+
+
+def run_cli(state_path: str, args: List[str]) -> int:
+    code, stdout, stderr = dispatch(Path(state_path), args)
+    sys.stdout.write(stdout)
+    sys.stderr.write(stderr)
+    return code
+
+
+def run_mdfind(state_path: str, args: List[str]) -> int:
+    return _mdfind(Path(state_path), args)
+
+
+class Simulator:
+    """Temporary ``aerospace``/``mdfind`` executables backed by a state file.
+
+    ``env`` holds the variables that route the workflow helpers to the
+    simulator; with ``socket=True`` it also answers on a server socket so
+    the native client path is exercised instead of the CLI.
+    """
+
+    def __init__(
+        self, state: Optional[Dict[str, Any]] = None, socket: bool = False
+    ) -> None:
+        self._initial = state if state is not None else generate_state()
+        self._socket = socket
+        self._dir = tempfile.TemporaryDirectory()
+        self.root = Path(self._dir.name)
+        self.state_path = self.root / "state.json"
+        self.bin_dir = self.root / "bin"
+        self.env: Dict[str, str] = {}
+        self._server: Any = None
+
+    def __enter__(self) -> "Simulator":
+        self.bin_dir.mkdir()
+        self.state_path.write_text(json.dumps(self._initial), encoding="utf-8")
+        for name, entry in (("aerospace", "run_cli"), ("mdfind", "run_mdfind")):
+            path = self.bin_dir / name
+            path.write_text(
+                WRAPPER.format(
+                    python=sys.executable,
+                    directory=str(Path(__file__).resolve().parent),
+                    entry=entry,
+                    state=str(self.state_path),
+                ),
+                encoding="utf-8",
+            )
+            path.chmod(path.stat().st_mode | stat.S_IXUSR)
+        self.env = {
+            "PATH": f"{self.bin_dir}{os.pathsep}{os.environ.get('PATH', '')}",
+            "AEROSPACE_NATIVE_CLIENT": "0",
+            # A bundle build, icon lookup or prefetch started in the background
+            # would outlive the temporary cache directories the scripts use.
+            "AEROSPACE_BUNDLE": "0",
+            "PROGRESSIVE_ICONS": "0",
+            "PREFETCH_WORKSPACES": "0",
+        }
+        if self._socket:
+            # pylint: disable-next=import-outside-toplevel
+            from socket_server_stub import StubServer
+
+            self._server = StubServer(self._answer).__enter__()
+            self.env["AEROSPACE_NATIVE_CLIENT"] = "1"
+            self.env["AEROSPACE_SOCKET"] = self._server.path
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        if self._server is not None:
+            self._server.__exit__(*exc_info)
+        self._dir.cleanup()
+
+    def _answer(self, args: List[str]) -> dict:
+        code, stdout, stderr = dispatch(self.state_path, args)
+        return {
+            "exitCode": code,
+            "stdout": stdout,
+            "stderr": stderr,
+            "serverVersionAndHash": SERVER_VERSION,
+        }
+
+    def state(self) -> Dict[str, Any]:
+        return json.loads(self.state_path.read_text(encoding="utf-8"))
+
+    @contextmanager
+    def edit(self) -> Iterator[Dict[str, Any]]:
+        with _locked_state(self.state_path) as state:
+            yield state
+
+    def set_fault(self, command: str, **fault: Any) -> None:
+        """``latency_ms``, ``fail`` (stderr message), ``hang`` and ``times``."""
+        with self.edit() as state:
+            state.setdefault("faults", {})[command] = fault
+
+    def reset_calls(self) -> None:
+        self.state_path.with_suffix(".calls.jsonl").write_text("", encoding="utf-8")
+
+    def calls(self) -> List[List[str]]:
+        return [entry["args"] for entry in self.call_log()]
+
+    def call_log(self) -> List[Dict[str, Any]]:
+        log_path = self.state_path.with_suffix(".calls.jsonl")
+        if not log_path.exists():
+            return []
+        return [
+            json.loads(line)
+            for line in log_path.read_text(encoding="utf-8").splitlines()
+            if line
+        ]
+
+
+def _anonymize(state: Dict[str, Any]) -> None:
+    for window in state["windows"]:
+        title = window.get("window-title", "")
+        window["window-title"] = " ".join(
+            f"w{len(word)}" for word in str(title).split()
+        )
+
+
+def record_state(
+    aerospace: str = "aerospace", anonymize: bool = False
+) -> Dict[str, Any]:
+    """Capture the live AeroSpace state in the simulator's format."""
+
+    def run(*args: str) -> str:
+        return subprocess.run(
+            [aerospace, *args], capture_output=True, text=True, check=True, timeout=15
+        ).stdout
+
+    window_format = " ".join(f"%{{{name}}}" for name in WINDOW_VARIABLES)
+    workspace_format = " ".join(f"%{{{name}}}" for name in WORKSPACE_VARIABLES)
+    rows = json.loads(run("list-windows", "--all", "--json", "--format", window_format))
+    workspaces = json.loads(
+        run("list-workspaces", "--all", "--json", "--format", workspace_format)
+    )
+    focused = json.loads(
+        run("list-windows", "--focused", "--json", "--format", "%{window-id}")
+    )
+
+    def truthy(value: Any) -> bool:
+        return str(value).lower() == "true"
+
+    monitors = sorted(
+        {entry["monitor-name"] for entry in workspaces},
+        key=lambda name: not any(
+            truthy(entry.get("monitor-is-main"))
+            for entry in workspaces
+            if entry["monitor-name"] == name
+        ),
+    )
+    focused_workspace = next(
+        (
+            entry["workspace"]
+            for entry in workspaces
+            if truthy(entry["workspace-is-focused"])
+        ),
+        workspaces[0]["workspace"] if workspaces else "1",
+    )
+    window_keys = [
+        name
+        for name in WINDOW_VARIABLES
+        if not name.startswith(("workspace-", "monitor-"))
+    ]
+    state = {
+        "version": STATE_VERSION,
+        "monitors": monitors,
+        "workspaces": [
+            {
+                "workspace": entry["workspace"],
+                "monitor-name": entry["monitor-name"],
+                "workspace-root-container-layout": entry.get(
+                    "workspace-root-container-layout", "h_tiles"
+                ),
+            }
+            for entry in workspaces
+        ],
+        "windows": [{key: row.get(key, "") for key in window_keys} for row in rows],
+        "focus": {
+            "workspace": focused_workspace,
+            "window-id": focused[0]["window-id"] if focused else None,
+        },
+        "visible": {
+            entry["monitor-name"]: entry["workspace"]
+            for entry in workspaces
+            if truthy(entry["workspace-is-visible"])
+        },
+        "app-paths": {},
+        "config-path": run("config", "--config-path").strip(),
+        "latency_ms": 0,
+        "faults": {},
+        "triggered": [],
+    }
+    if anonymize:
+        _anonymize(state)
+    return state
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    generate = commands.add_parser("generate", help="write a generated state")
+    generate.add_argument("--windows", type=int, default=40)
+    generate.add_argument("--workspaces", type=int, default=9)
+    generate.add_argument("--monitors", type=int, default=2)
+    generate.add_argument("--seed", type=int, default=1)
+    record = commands.add_parser("record", help="capture the live AeroSpace state")
+    record.add_argument("--aerospace", default="aerospace")
+    record.add_argument("--anonymize", action="store_true")
+    scale = commands.add_parser("scale", help="repeat the windows of a state file")
+    scale.add_argument("state", type=Path)
+    scale.add_argument("factor", type=int)
+    options = parser.parse_args()
+
+    if options.command == "generate":
+        state = generate_state(
+            options.windows, options.workspaces, options.monitors, options.seed
+        )
+    elif options.command == "record":
+        state = record_state(options.aerospace, options.anonymize)
+    else:
+        state = scale_state(
+            json.loads(options.state.read_text(encoding="utf-8")), options.factor
+        )
+    print(json.dumps(state, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Local stand-in for the AeroSpace server socket used by tests and benchmarks."""
+
+import json
+import os
+import socket
+import tempfile
+import threading
+from pathlib import Path
+from typing import Callable, List, Optional, Union
+
+
+Handler = Callable[[List[str]], Union[dict, bytes]]
+
+
+def default_handler(args: List[str]) -> dict:
+    return {
+        "exitCode": 0,
+        "stdout": json.dumps({"args": args}),
+        "stderr": "",
+        "serverVersionAndHash": "0.0.0-stub stub",
+    }
+
+
+class StubServer:
+    """Answers one JSON request per connection, like the AeroSpace server."""
+
+    def __init__(self, handler: Optional[Handler] = None) -> None:
+        self.handler = handler or default_handler
+        self.requests: List[dict] = []
+        self._dir = tempfile.TemporaryDirectory()
+        self.path = str(Path(self._dir.name) / "aerospace.sock")
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+
+    def __enter__(self) -> "StubServer":
+        self._socket.bind(self.path)
+        self._socket.listen(16)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._socket.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self._dir.cleanup()
+
+    def _serve(self) -> None:
+        while True:
+            try:
+                connection, _ = self._socket.accept()
+            except OSError:
+                return
+            with connection:
+                data = b""
+                while True:
+                    chunk = connection.recv(65536)
+                    if not chunk:
+                        break
+                    data += chunk
+                request = json.loads(data.decode("utf-8"))
+                self.requests.append(request)
+                answer = self.handler(request["args"])
+                if isinstance(answer, dict):
+                    answer = json.dumps(answer).encode("utf-8")
+                connection.sendall(answer)
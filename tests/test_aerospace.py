@@ -1,13 +1,29 @@
+import json
+import os
+import shutil
+import subprocess
 import sys
+import tempfile
 import textwrap
+import time
 import tomllib
 import unittest
 from pathlib import Path
+from unittest import mock
 
 
-sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "workflow" / "scripts"))
+SCRIPTS_DIR = Path(__file__).resolve().parents[1] / "workflow" / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
 
-from lib.aerospace import extract_shortcuts
+from aerospace_sim import Simulator, generate_state
+from lib.aerospace import (
+    extract_shortcuts,
+    filter_windows,
+    iter_json_list,
+    list_windows_without_app_paths,
+)
+from lib.snapshot import load_app_paths
 
 
 CONFIG_TEXT = textwrap.dedent(
@@ -85,5 +101,257 @@ class ExtractShortcutsTest(unittest.TestCase):
         self.assertNotIn(("main", "alt-q"), entries)
 
 
+def _log_mdfind(sim: Simulator) -> Path:
+    """Wrap the simulator's ``mdfind`` so each lookup is logged; returns the log."""
+    log = sim.root / "mdfind.log"
+    mdfind = sim.bin_dir / "mdfind"
+    mdfind.rename(sim.bin_dir / "mdfind-sim")
+    mdfind.write_text(
+        f'#!/bin/sh\necho "$@" >> "{log}"\nexec "{sim.bin_dir}/mdfind-sim" "$@"\n',
+        encoding="utf-8",
+    )
+    mdfind.chmod(0o755)
+    return log
+
+
+class StreamingWindowsTest(unittest.TestCase):
+    def test_list_entries_are_decoded_across_chunk_boundaries(self) -> None:
+        entries = [{"window-id": idx, "window-title": f"a, [b] {{c}} {idx}"} for idx in range(5)]
+        text = json.dumps(entries, indent=2)
+        for size in (1, 7, len(text)):
+            chunks = [text[idx : idx + size] for idx in range(0, len(text), size)]
+            self.assertEqual(list(iter_json_list(chunks)), entries)
+
+    def test_truncated_or_invalid_output_raises(self) -> None:
+        with self.assertRaises(ValueError):
+            list(iter_json_list(['[{"window-id": 1}, {"window-']))
+        with self.assertRaises(ValueError):
+            list(iter_json_list(["not json"]))
+        self.assertEqual(list(iter_json_list(["[", "]"])), [])
+
+    def test_limit_keeps_the_best_ranked_windows(self) -> None:
+        windows = [
+            {"app-name": f"App {idx}", "window-title": f"Note {idx % 7}"}
+            for idx in range(300)
+        ]
+
+        ranked = filter_windows(windows, "note", limit=None)
+
+        self.assertEqual(filter_windows(windows, "note", limit=10), ranked[:10])
+        self.assertEqual(filter_windows(windows, "", limit=10), windows[:10])
+
+    def test_windows_are_listed_without_app_paths(self) -> None:
+        with Simulator(generate_state(windows=12, workspaces=4)) as sim:
+            with mock.patch.dict(os.environ, sim.env):
+                windows = list_windows_without_app_paths("all")
+
+        self.assertEqual(len(windows), 12)
+        self.assertTrue(all("app-path" not in window for window in windows))
+
+    def test_a_silent_command_times_out_while_reading(self) -> None:
+        with tempfile.TemporaryDirectory() as bin_dir:
+            aerospace = Path(bin_dir) / "aerospace"
+            aerospace.write_text("#!/bin/sh\nsleep 40\n", encoding="utf-8")
+            aerospace.chmod(0o755)
+            env = {
+                "PATH": f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}",
+                "AEROSPACE_NATIVE_CLIENT": "0",
+            }
+            started = time.monotonic()
+            with mock.patch.dict(os.environ, env):
+                with self.assertRaises(subprocess.TimeoutExpired):
+                    list_windows_without_app_paths("all", timeout=1)
+
+        self.assertLess(time.monotonic() - started, 5)
+
+    def test_asw_resolves_icons_only_for_shown_windows(self) -> None:
+        with Simulator(generate_state(windows=12, workspaces=4)) as sim:
+            log = _log_mdfind(sim)
+            bundle_id = sim.state()["windows"][0]["app-bundle-id"]
+            with tempfile.TemporaryDirectory() as cache_dir:
+                result = subprocess.run(
+                    [sys.executable, str(SCRIPTS_DIR / "windows_all.py"), f"app:{bundle_id}"],
+                    env=dict(os.environ, **sim.env, alfred_workflow_cache=cache_dir),
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                )
+            lookups = log.read_text(encoding="utf-8").splitlines()
+
+        items = json.loads(result.stdout)["items"]
+        self.assertTrue(items and all("arg" in item for item in items))
+        self.assertEqual(len(lookups), 1)
+        self.assertIn(bundle_id, lookups[0])
+
+
+class WorkspaceDrillDownTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.sim = Simulator(generate_state(windows=12, workspaces=4))
+        self.sim.__enter__()
+        self.addCleanup(self.sim.__exit__, None, None, None)
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        self.env = {**os.environ, **self.sim.env, "alfred_workflow_cache": cache_dir.name}
+
+    def run_asws(self, query: str) -> dict:
+        result = subprocess.run(
+            [sys.executable, str(SCRIPTS_DIR / "workspace_overview.py"), query],
+            env=self.env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return json.loads(result.stdout)
+
+    def workspace_window_calls(self) -> list:
+        return [args for args in self.sim.calls() if "--workspace" in args]
+
+    def test_queries_that_are_no_workspace_fetch_no_windows(self) -> None:
+        self.run_asws("")
+        self.sim.reset_calls()
+
+        for query in ("s", "sa", "safari"):
+            self.run_asws(query)
+
+        self.assertEqual(self.workspace_window_calls(), [])
+
+    def lookups(self, log: Path) -> list:
+        if not log.exists():
+            return []
+        return log.read_text(encoding="utf-8").splitlines()
+
+    def test_drill_down_reuses_app_paths_resolved_by_asw(self) -> None:
+        log = _log_mdfind(self.sim)
+        subprocess.run(
+            [sys.executable, str(SCRIPTS_DIR / "windows_all.py")],
+            env=self.env,
+            capture_output=True,
+            check=True,
+        )
+        resolved = len(self.lookups(log))
+        self.assertGreater(resolved, 0)
+
+        self.run_asws(f"{self.sim.state()['windows'][0]['workspace']} ")
+
+        self.assertEqual(len(self.lookups(log)), resolved)
+
+    def test_each_app_is_looked_up_once_across_drill_downs(self) -> None:
+        log = _log_mdfind(self.sim)
+        windows = self.sim.state()["windows"]
+        workspaces = list(dict.fromkeys(window["workspace"] for window in windows))
+
+        for workspace in workspaces:
+            self.run_asws(f"{workspace} ")
+
+        lookups = self.lookups(log)
+        self.assertEqual(len(lookups), len(set(lookups)))
+        self.assertEqual(
+            len(lookups), len({window["app-bundle-id"] for window in windows})
+        )
+
+    def test_a_workspace_id_without_a_known_list_is_fetched_once(self) -> None:
+        workspace = self.sim.state()["windows"][0]["workspace"]
+
+        response = self.run_asws(f"{workspace} ")
+
+        self.assertTrue(response["items"][0]["title"].startswith(f"Workspace {workspace}"))
+        self.assertEqual(len(self.workspace_window_calls()), 1)
+
+
+class ProgressiveIconsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.sim = Simulator(generate_state(windows=12, workspaces=4))
+        self.sim.__enter__()
+        self.addCleanup(self.sim.__exit__, None, None, None)
+        self.log = _log_mdfind(self.sim)
+        self.cache_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.cache_dir, True)
+        self.marker = self.cache_dir / "app_paths.pending"
+        # Runs first, so the background lookup is not left writing to a
+        # removed directory.
+        self.addCleanup(self.wait_for_resolution)
+
+    def wait_for_resolution(self) -> bool:
+        deadline = time.monotonic() + 10
+        while self.marker.exists() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        return not self.marker.exists()
+
+    def lookups(self) -> list:
+        if not self.log.exists():
+            return []
+        return self.log.read_text(encoding="utf-8").splitlines()
+
+    def run_asw(self) -> dict:
+        result = subprocess.run(
+            [sys.executable, str(SCRIPTS_DIR / "windows_all.py")],
+            env={
+                **os.environ,
+                **self.sim.env,
+                "PROGRESSIVE_ICONS": "1",
+                "alfred_workflow_cache": str(self.cache_dir),
+            },
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return json.loads(result.stdout)
+
+    def test_first_run_shows_text_and_reruns_once_icons_are_found(self) -> None:
+        first = self.run_asw()
+
+        self.assertEqual(len(first["items"]), 12)
+        self.assertIn("rerun", first)
+        self.assertTrue(all("icon" not in item for item in first["items"]))
+        self.assertTrue(self.wait_for_resolution())
+        resolved = len(self.lookups())
+        self.assertGreater(resolved, 0)
+
+        second = self.run_asw()
+
+        self.assertNotIn("rerun", second)
+        self.assertEqual(
+            [item["arg"] for item in second["items"]],
+            [item["arg"] for item in first["items"]],
+        )
+        self.assertEqual(len(self.lookups()), resolved)
+
+    def test_apps_another_resolution_does_not_cover_are_resolved_now(self) -> None:
+        self.marker.write_text("com.example.other", encoding="utf-8")
+
+        response = self.run_asw()
+
+        self.assertNotIn("rerun", response)
+        self.assertGreater(len(self.lookups()), 0)
+        # That resolution still owns its marker.
+        self.assertTrue(self.marker.exists())
+        self.marker.unlink()
+
+    def test_a_failed_resolution_records_its_apps_as_not_found(self) -> None:
+        import resolve_app_paths  # pylint: disable=import-outside-toplevel
+
+        env = {"alfred_workflow_cache": str(self.cache_dir)}
+        self.marker.write_text("com.example.app", encoding="utf-8")
+        with mock.patch.dict(os.environ, env), mock.patch.object(
+            resolve_app_paths, "run_sync", side_effect=RuntimeError("crashed")
+        ), mock.patch.object(sys, "argv", ["resolve_app_paths.py", "com.example.app"]):
+            with self.assertRaises(RuntimeError):
+                resolve_app_paths.main()
+            self.assertEqual(load_app_paths(), {"com.example.app": None})
+
+        self.assertFalse(self.marker.exists())
+
+    def test_stalled_resolution_falls_back_to_the_foreground(self) -> None:
+        self.marker.touch()
+        stale = time.time() - 60
+        os.utime(self.marker, (stale, stale))
+
+        response = self.run_asw()
+
+        self.assertNotIn("rerun", response)
+        self.assertGreater(len(self.lookups()), 0)
+        self.assertFalse(self.marker.exists())
+
+
 if __name__ == "__main__":
     unittest.main()
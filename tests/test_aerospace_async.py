@@ -0,0 +1,145 @@
+import json
+import os
+import stat
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "workflow" / "scripts"))
+
+from lib import aerospace
+from lib.aerospace_async import run_concurrently, run_sync
+
+
+def _sleep_command(seconds: float) -> list:
+    return [sys.executable, "-c", f"import time; time.sleep({seconds}); print('done')"]
+
+
+class AsyncClientTest(unittest.TestCase):
+    def test_independent_calls_run_concurrently(self) -> None:
+        started = time.monotonic()
+        results = run_concurrently(
+            lambda client: client.run_command(_sleep_command(0.4)),
+            lambda client: client.run_command(_sleep_command(0.4)),
+        )
+        elapsed = time.monotonic() - started
+
+        self.assertEqual(results, ["done\n", "done\n"])
+        self.assertLess(elapsed, 0.75)
+
+    def test_concurrency_limit_serializes_calls(self) -> None:
+        started = time.monotonic()
+        run_concurrently(
+            lambda client: client.run_command(_sleep_command(0.2)),
+            lambda client: client.run_command(_sleep_command(0.2)),
+            max_concurrency=1,
+        )
+
+        self.assertGreaterEqual(time.monotonic() - started, 0.4)
+
+    def test_per_call_timeout_and_failures_are_reported(self) -> None:
+        results = run_concurrently(
+            lambda client: client.run_command(_sleep_command(5), timeout=0.2),
+            lambda client: client.run_command(
+                [sys.executable, "-c", "import sys; sys.exit('boom')"]
+            ),
+            return_exceptions=True,
+        )
+
+        self.assertIsInstance(results[0], subprocess.TimeoutExpired)
+        self.assertIsInstance(results[1], RuntimeError)
+        self.assertEqual(str(results[1]), "boom")
+
+    def test_list_windows_resolves_each_bundle_once(self) -> None:
+        with tempfile.TemporaryDirectory() as bin_dir:
+            log_path = Path(bin_dir) / "mdfind.log"
+            self._write_script(
+                Path(bin_dir) / "aerospace",
+                """
+                import json
+                print(json.dumps([
+                    {"window-id": 1, "app-bundle-id": "com.example.a"},
+                    {"window-id": 2, "app-bundle-id": "com.example.a"},
+                    {"window-id": 3, "app-bundle-id": "com.example.b"},
+                ]))
+                """,
+            )
+            self._write_script(
+                Path(bin_dir) / "mdfind",
+                f"""
+                import sys
+                with open({str(log_path)!r}, "a") as log:
+                    log.write(sys.argv[1] + "\\n")
+                print("/Applications/" + sys.argv[1].split('"')[1] + ".app")
+                """,
+            )
+            env = {"PATH": f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}"}
+            with mock.patch.dict(os.environ, env), mock.patch.dict(
+                aerospace.app_path_cache, clear=True
+            ):
+                windows = run_sync(lambda client: client.list_windows("all"))
+            lookups = log_path.read_text().splitlines()
+
+        self.assertEqual(
+            [window["app-path"] for window in windows],
+            [
+                "/Applications/com.example.a.app",
+                "/Applications/com.example.a.app",
+                "/Applications/com.example.b.app",
+            ],
+        )
+        self.assertEqual(len(lookups), 2)
+
+    def test_summaries_skip_icons_and_drill_down_targets_one_workspace(self) -> None:
+        with tempfile.TemporaryDirectory() as bin_dir:
+            calls_path = Path(bin_dir) / "aerospace.log"
+            lookups_path = Path(bin_dir) / "mdfind.log"
+            self._write_script(
+                Path(bin_dir) / "aerospace",
+                f"""
+                import json, sys
+                with open({str(calls_path)!r}, "a") as log:
+                    log.write(json.dumps(sys.argv[1:]) + "\\n")
+                print(json.dumps([{{"window-id": 1, "app-bundle-id": "com.example.a"}}]))
+                """,
+            )
+            self._write_script(
+                Path(bin_dir) / "mdfind",
+                f"""
+                with open({str(lookups_path)!r}, "a") as log:
+                    log.write("lookup\\n")
+                print("/Applications/A.app")
+                """,
+            )
+            env = {
+                "PATH": f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}",
+                "AEROSPACE_NATIVE_CLIENT": "0",
+            }
+            with mock.patch.dict(os.environ, env), mock.patch.dict(
+                aerospace.app_path_cache, clear=True
+            ):
+                summaries = run_sync(lambda client: client.list_window_summaries())
+                self.assertFalse(lookups_path.exists())
+                windows = run_sync(lambda client: client.list_workspace_windows("3"))
+            calls = [json.loads(line) for line in calls_path.read_text().splitlines()]
+
+        self.assertNotIn("app-path", summaries[0])
+        self.assertEqual(calls[0][-1], aerospace.WINDOW_SUMMARY_FORMAT)
+        self.assertIn("--all", calls[0])
+        self.assertEqual(calls[1][-2:], ["--workspace", "3"])
+        self.assertEqual(windows[0]["app-path"], "/Applications/A.app")
+
+    @staticmethod
+    def _write_script(path: Path, body: str) -> None:
+        path.write_text(f"#!{sys.executable}\n" + textwrap.dedent(body))
+        path.chmod(path.stat().st_mode | stat.S_IXUSR)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "workflow" / "scripts"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from aerospace_sim import Simulator, generate_state, record_state, scale_state
+from lib import aerospace, aerospace_socket
+
+
+class SimulatorTestCase(unittest.TestCase):
+    socket = False
+
+    def setUp(self) -> None:
+        self.sim = Simulator(generate_state(windows=12, workspaces=4), socket=self.socket)
+        self.sim.__enter__()
+        self.addCleanup(self.sim.__exit__, None, None, None)
+        patcher = mock.patch.dict(os.environ, self.sim.env)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        cache = mock.patch.dict(aerospace.app_path_cache, clear=True)
+        cache.start()
+        self.addCleanup(cache.stop)
+        aerospace_socket._verdict = None
+        self.addCleanup(setattr, aerospace_socket, "_verdict", None)
+
+
+class AerospaceHelpersTest(SimulatorTestCase):
+    def test_list_windows_uses_requested_format_and_resolves_icons(self) -> None:
+        windows = aerospace.list_windows("all")
+        focused_scope = aerospace.list_windows("focused")
+
+        self.assertEqual(len(windows), 12)
+        self.assertEqual(
+            set(windows[0]),
+            {
+                "app-name",
+                "window-title",
+                "window-id",
+                "app-pid",
+                "workspace",
+                "app-bundle-id",
+                "monitor-name",
+                "app-path",
+            },
+        )
+        self.assertTrue(windows[0]["app-path"].startswith("/Applications/"))
+        focused_workspace = self.sim.state()["focus"]["workspace"]
+        self.assertTrue(focused_scope)
+        self.assertTrue(all(w["workspace"] == focused_workspace for w in focused_scope))
+
+    def test_focus_and_layout_change_state(self) -> None:
+        target = next(
+            window
+            for window in self.sim.state()["windows"]
+            if window["workspace"] != self.sim.state()["focus"]["workspace"]
+        )
+
+        aerospace.focus_window(str(target["window-id"]))
+        focused = aerospace.get_focused_window()
+        workspaces = {
+            entry["workspace"]: entry for entry in aerospace.list_workspaces()
+        }
+
+        self.assertEqual(focused["window-id"], target["window-id"])
+        self.assertTrue(workspaces[target["workspace"]]["workspace-is-focused"])
+        self.assertEqual(
+            sum(entry["workspace-is-focused"] for entry in workspaces.values()), 1
+        )
+
+        aerospace.set_layout("v_accordion")
+        self.assertEqual(aerospace.get_focused_window()["window-layout"], "v_accordion")
+        aerospace.set_layout("floating")
+        aerospace.set_layout("tiling")
+        self.assertEqual(aerospace.get_focused_window()["window-layout"], "v_accordion")
+
+    def test_trigger_binding_is_recorded(self) -> None:
+        aerospace.trigger_binding("alt-h", "main")
+
+        self.assertEqual(self.sim.state()["triggered"], [{"binding": "alt-h", "mode": "main"}])
+
+    def test_injected_failures_and_hangs(self) -> None:
+        self.sim.set_fault("list-workspaces", fail="server is busy", times=1)
+        with self.assertRaisesRegex(RuntimeError, "server is busy"):
+            aerospace.list_workspaces()
+        self.assertTrue(aerospace.list_workspaces())
+
+        self.sim.set_fault("focus", hang=True)
+        with self.assertRaises(subprocess.TimeoutExpired):
+            aerospace._run_aerospace(["aerospace", "focus", "--window-id", "1000"], 1)
+
+        with self.assertRaisesRegex(RuntimeError, "Can't find window"):
+            self.sim.set_fault("focus")
+            aerospace.focus_window("1")
+
+
+class NativeSocketTest(SimulatorTestCase):
+    socket = True
+
+    def test_native_client_matches_the_cli(self) -> None:
+        windows = aerospace.list_windows("all")
+
+        served_in_process = [
+            entry["args"][0]
+            for entry in self.sim.call_log()
+            if entry["ppid"] == os.getppid()
+        ]
+        self.assertEqual(len(windows), 12)
+        self.assertIn("list-windows", served_in_process)
+        self.assertTrue(aerospace_socket._verdict["compatible"])
+
+
+class RecordReplayTest(SimulatorTestCase):
+    def test_recorded_state_replays_the_same_answers(self) -> None:
+        recorded = record_state()
+
+        with Simulator(scale_state(recorded, 3)) as replay:
+            with mock.patch.dict(os.environ, replay.env):
+                windows = aerospace.list_windows("all")
+                workspaces = aerospace.list_workspaces()
+        with mock.patch.dict(os.environ, self.sim.env):
+            original = aerospace.list_workspaces()
+
+        self.assertEqual(len(windows), 36)
+        self.assertEqual(len({window["window-id"] for window in windows}), 36)
+        self.assertEqual(workspaces, original)
+        self.assertEqual(json.loads(json.dumps(recorded)), recorded)
+
+
+if __name__ == "__main__":
+    unittest.main()
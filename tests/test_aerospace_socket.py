@@ -0,0 +1,126 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "workflow" / "scripts"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from lib import aerospace, aerospace_socket
+from socket_server_stub import StubServer, default_handler
+
+
+class NativeClientTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._cache_dir.cleanup)
+        aerospace_socket._verdict = None
+        self.addCleanup(setattr, aerospace_socket, "_verdict", None)
+
+    def _env(self, server: StubServer) -> mock._patch:
+        return mock.patch.dict(
+            os.environ,
+            {
+                "AEROSPACE_SOCKET": server.path,
+                "alfred_workflow_cache": self._cache_dir.name,
+            },
+        )
+
+    def test_commands_go_over_the_socket_once_the_server_is_verified(self) -> None:
+        cli_calls = []
+
+        def cli(args: list) -> str:
+            cli_calls.append(args)
+            return default_handler(args[1:])["stdout"] + "\n"
+
+        with StubServer() as server, self._env(server):
+            first = aerospace_socket.run_native(["focus", "--window-id", "7"], cli)
+            second = aerospace_socket.run_native(["layout", "floating"], cli)
+
+        self.assertEqual(cli_calls, [["aerospace", "list-workspaces", "--focused"]])
+        self.assertEqual(first[0], 0)
+        self.assertIn("--window-id", first[1])
+        self.assertEqual(second[0], 0)
+        self.assertIn("floating", second[1])
+        self.assertEqual(
+            [request["args"] for request in server.requests],
+            [
+                ["list-workspaces", "--focused"],
+                ["focus", "--window-id", "7"],
+                ["list-workspaces", "--focused"],
+                ["layout", "floating"],
+            ],
+        )
+
+    def _versioned(self, version: str):
+        def handler(args: list) -> dict:
+            return dict(default_handler(args), serverVersionAndHash=version)
+
+        return handler
+
+    def test_another_server_version_falls_back_to_the_cli(self) -> None:
+        def cli(args: list) -> str:
+            return default_handler(args[1:])["stdout"] + "\n"
+
+        with StubServer() as server, self._env(server):
+            self.assertIsNotNone(aerospace_socket.run_native(["list-windows"], cli))
+        with StubServer(self._versioned("0.0.1-stub other")) as server, self._env(server):
+            listed = aerospace_socket.run_native(["list-windows"], cli)
+        self.assertIsNone(listed)
+        self.assertIsNone(aerospace_socket._is_trusted())
+
+    def test_commands_with_effects_are_not_sent_to_an_unverified_version(self) -> None:
+        def cli(args: list) -> str:
+            return default_handler(args[1:])["stdout"] + "\n"
+
+        with StubServer() as server, self._env(server):
+            aerospace_socket.run_native(["list-windows"], cli)
+        with StubServer(self._versioned("0.0.1-stub other")) as server, self._env(server):
+            result = aerospace_socket.run_native(["close", "--window-id", "7"], cli)
+
+        self.assertIsNone(result)
+        self.assertEqual(
+            [request["args"] for request in server.requests],
+            [["list-workspaces", "--focused"]],
+        )
+
+    def test_falls_back_to_cli_when_the_protocol_does_not_match(self) -> None:
+        with StubServer(lambda args: b"not json") as server, self._env(server):
+            with mock.patch.object(
+                aerospace, "run_command", return_value='[{"workspace": "1"}]'
+            ) as run_command:
+                workspaces = aerospace.list_workspaces()
+                aerospace.focus_window("3")
+
+        self.assertEqual(workspaces, [{"workspace": "1"}])
+        self.assertEqual(run_command.call_count, 2)
+        self.assertEqual(len(server.requests), 1)
+
+    def test_falls_back_when_probe_output_differs_from_cli(self) -> None:
+        with StubServer() as server, self._env(server):
+            result = aerospace_socket.run_native(
+                ["list-windows", "--all"], lambda args: "different"
+            )
+
+        self.assertIsNone(result)
+        self.assertEqual(len(server.requests), 1)
+
+    def test_unsupported_commands_and_missing_socket_use_cli(self) -> None:
+        with mock.patch.dict(
+            os.environ, {"AEROSPACE_SOCKET": "/nonexistent/aerospace.sock"}
+        ):
+            self.assertIsNone(
+                aerospace_socket.run_native(["list-windows"], lambda args: "")
+            )
+        with StubServer() as server, self._env(server):
+            self.assertIsNone(
+                aerospace_socket.run_native(["reload-config"], lambda args: "")
+            )
+        self.assertEqual(server.requests, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
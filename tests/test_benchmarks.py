@@ -0,0 +1,55 @@
+import sys
+import unittest
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+
+import corpora
+from micro import compare
+
+
+class CorporaTest(unittest.TestCase):
+    def test_generated_corpora_are_deterministic(self) -> None:
+        self.assertEqual(corpora.windows(50), corpora.windows(50))
+        self.assertEqual(corpora.config_text(3, 5), corpora.config_text(3, 5))
+        self.assertNotEqual(corpora.queries(20, seed=1), corpora.queries(20, seed=2))
+
+    def test_typing_sequences_type_every_prefix(self) -> None:
+        bursts = corpora.typing_sequences("windows.py", 5)
+
+        self.assertEqual(bursts, corpora.typing_sequences("windows.py", 5))
+        for burst in bursts:
+            queries = [key["query"] for key in burst["keys"]]
+            self.assertEqual(queries[0], "")
+            for shorter, longer in zip(queries, queries[1:]):
+                self.assertEqual(longer[:-1], shorter)
+
+
+class CompareTest(unittest.TestCase):
+    BASELINE = {
+        "cases": {"fuzzy_score": {"relative": 1.0, "alloc_bytes_per_op": 1000.0}}
+    }
+
+    def _current(self, relative: float, alloc: float) -> dict:
+        return {
+            "cases": {
+                "fuzzy_score": {"relative": relative, "alloc_bytes_per_op": alloc}
+            }
+        }
+
+    def test_within_tolerance_passes(self) -> None:
+        self.assertEqual(
+            compare(self._current(1.2, 1100.0), self.BASELINE, 0.3, 0.1), []
+        )
+
+    def test_time_and_allocation_regressions_are_reported(self) -> None:
+        regressions = compare(self._current(1.5, 2000.0), self.BASELINE, 0.3, 0.1)
+
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith("fuzzy_score: time"))
+        self.assertTrue(regressions[1].startswith("fuzzy_score: allocations"))
+
+
+if __name__ == "__main__":
+    unittest.main()
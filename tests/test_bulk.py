@@ -0,0 +1,95 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "workflow" / "scripts"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from aerospace_sim import Simulator, generate_state
+from lib import aerospace, aerospace_socket, snapshot
+from lib.bulk import bulk_action, bulk_summary, run_bulk, split_bulk_query
+
+
+class BulkQueryTest(unittest.TestCase):
+    def test_split_and_target_parsing(self) -> None:
+        self.assertEqual(split_bulk_query("slack"), ("slack", None))
+        self.assertEqual(split_bulk_query("slack zoom > 9 "), ("slack zoom", "9"))
+        self.assertEqual(split_bulk_query("slack >"), ("slack", ""))
+        self.assertEqual(split_bulk_query("slack\t>\t9"), ("slack", "9"))
+
+    def test_titles_containing_a_gt_sign_stay_searches(self) -> None:
+        for query in ("a -> b", "foo>bar", "x >y", "> 9", " > close"):
+            self.assertEqual(split_bulk_query(query), (query, None))
+        self.assertEqual(bulk_action("Close"), ("close", ""))
+        self.assertEqual(bulk_action("h_tiles"), ("layout", "h_tiles"))
+        self.assertEqual(bulk_action("Chat"), ("move", "Chat"))
+
+
+class BulkDispatchTest(unittest.TestCase):
+    def setUp(self) -> None:
+        sim = Simulator(generate_state(windows=12, workspaces=4))
+        self.sim = sim.__enter__()
+        self.addCleanup(sim.__exit__, None, None, None)
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        env = dict(self.sim.env, alfred_workflow_cache=cache_dir.name)
+        patcher = mock.patch.dict(os.environ, env)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        aerospace_socket._verdict = None
+        self.addCleanup(setattr, aerospace_socket, "_verdict", None)
+
+    def _window_ids(self, workspace: str) -> list:
+        return [
+            str(window["window-id"])
+            for window in self.sim.state()["windows"]
+            if window["workspace"] == workspace
+        ]
+
+    def test_move_updates_server_and_snapshots_once(self) -> None:
+        windows = aerospace.list_windows("all")
+        all_path = snapshot.snapshot_path("windows_all")
+        snapshot.save_snapshot(all_path, snapshot.refresh_snapshot(None, windows))
+        snapshot.save_snapshot(
+            snapshot.snapshot_path("windows_focused"),
+            snapshot.refresh_snapshot(None, windows[:1]),
+        )
+        moving = self._window_ids("1") + self._window_ids("2")
+
+        result = run_bulk("move", "4", moving)
+        snapshot.apply_bulk("move", "4", result["done"])
+
+        self.assertEqual(result, {"done": moving, "failed": []})
+        self.assertEqual(set(self._window_ids("4")) & set(moving), set(moving))
+        cached = snapshot.load_snapshot(all_path)
+        cached_ids = {
+            snapshot.window_key(window)
+            for window in cached["windows"]
+            if window["workspace"] == "4"
+        }
+        self.assertEqual(cached_ids, set(self._window_ids("4")))
+        self.assertIsNone(
+            snapshot.load_snapshot(snapshot.snapshot_path("windows_focused"))
+        )
+        self.assertEqual(
+            bulk_summary("move", "4", result),
+            f"Moved {len(moving)} windows to workspace 4",
+        )
+
+    def test_failures_are_aggregated_and_do_not_stop_the_rest(self) -> None:
+        closing = self._window_ids("3")
+        result = run_bulk("close", "", closing + ["424242"], max_concurrency=2)
+        snapshot.apply_bulk("close", "", result["done"])
+
+        self.assertEqual(result["done"], closing)
+        self.assertEqual([window_id for window_id, _ in result["failed"]], ["424242"])
+        self.assertEqual(self._window_ids("3"), [])
+        self.assertIn("1 failed: Can't find window", bulk_summary("close", "", result))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+import zipfile
+from pathlib import Path
+
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1] / "workflow" / "scripts"
+
+PROBE = f"""
+import json, sys
+sys.path.insert(0, {str(SCRIPTS_DIR)!r})
+import lib.aerospace, lib.snapshot
+print(json.dumps({{
+    "file": lib.aerospace.__file__,
+    "scripts_dir": str(lib.SCRIPTS_DIR),
+    "matches": [w["app-name"] for w in lib.aerospace.filter_windows(
+        [{{"app-name": "Safari"}}, {{"app-name": "Mail"}}], "saf")],
+}}))
+"""
+
+
+class BundleTest(unittest.TestCase):
+    def setUp(self) -> None:
+        cache = tempfile.TemporaryDirectory()
+        self.addCleanup(cache.cleanup)
+        self.cache = Path(cache.name)
+        self.env = dict(os.environ, alfred_workflow_cache=cache.name)
+        self.env.pop("AEROSPACE_BUNDLE", None)
+        self.bundle = self.cache / f"lib-{sys.implementation.cache_tag}.zip"
+
+    def probe(self) -> dict:
+        result = subprocess.run(
+            [sys.executable, "-c", PROBE],
+            env=self.env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return json.loads(result.stdout)
+
+    def build(self) -> None:
+        subprocess.run(
+            [sys.executable, str(SCRIPTS_DIR / "build_bundle.py")], env=self.env, check=True
+        )
+
+    def test_current_bundle_is_imported_from(self) -> None:
+        self.build()
+
+        probe = self.probe()
+
+        self.assertTrue(probe["file"].startswith(str(self.bundle)))
+        self.assertEqual(probe["scripts_dir"], str(SCRIPTS_DIR))
+        self.assertEqual(probe["matches"], ["Safari"])
+
+    def test_stale_bundle_falls_back_to_source(self) -> None:
+        self.build()
+        # A bundle built from other sources than the ones on disk, as after
+        # unpacking an older release whose files keep their original dates.
+        with zipfile.ZipFile(self.bundle) as archive:
+            entries = {name: archive.read(name) for name in archive.namelist()}
+        manifest = entries["lib/SOURCES"].decode("utf-8").splitlines()
+        name, size, mtime_ns = manifest[0].split()
+        manifest[0] = f"{name} {size} {int(mtime_ns) + 1}"
+        entries["lib/SOURCES"] = "".join(f"{line}\n" for line in manifest).encode("utf-8")
+        with zipfile.ZipFile(self.bundle, "w") as archive:
+            for entry, data in entries.items():
+                archive.writestr(entry, data)
+        # Pretend a rebuild is under way so none is started in the background.
+        (self.cache / f"{self.bundle.name}.building").touch()
+
+        probe = self.probe()
+
+        self.assertEqual(Path(probe["file"]), SCRIPTS_DIR / "lib" / "aerospace.py")
+        self.assertEqual(probe["matches"], ["Safari"])
+
+    def test_missing_bundle_is_built_in_the_background(self) -> None:
+        probe = self.probe()
+        self.assertEqual(Path(probe["file"]), SCRIPTS_DIR / "lib" / "aerospace.py")
+
+        deadline = time.monotonic() + 10
+        while not self.bundle.exists() and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+        self.assertTrue(self.probe()["file"].startswith(str(self.bundle)))
+
+    def test_disabled_bundle_imports_from_source(self) -> None:
+        self.build()
+        self.env["AEROSPACE_BUNDLE"] = "0"
+
+        self.assertEqual(Path(self.probe()["file"]), SCRIPTS_DIR / "lib" / "aerospace.py")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "workflow" / "scripts"))
+
+from lib.catalogue import (
+    config_identity,
+    for_filtering_mode,
+    load_catalogue,
+    save_catalogue,
+)
+
+
+class CatalogueTest(unittest.TestCase):
+    def setUp(self) -> None:
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        self.root = Path(root.name)
+        (self.root / "cache").mkdir()
+        patcher = mock.patch.dict(
+            os.environ,
+            {
+                "alfred_workflow_cache": str(self.root / "cache"),
+                "HOME": str(self.root),
+                "XDG_CONFIG_HOME": str(self.root / "xdg"),
+            },
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.config = self.root / "xdg" / "aerospace" / "aerospace.toml"
+        self.config.parent.mkdir(parents=True)
+        self.config.write_text("[mode.main.binding]\n", encoding="utf-8")
+        self.response = {"cache": {"seconds": 60}, "items": [{"title": "focus left"}]}
+
+    def test_catalogue_is_reused_until_the_config_is_edited(self) -> None:
+        save_catalogue(str(self.config), self.response)
+        self.assertEqual(load_catalogue(), self.response)
+
+        self.config.write_text("[mode.main.binding]\nalt-h = 'focus left'\n")
+
+        self.assertIsNone(load_catalogue())
+
+    def test_a_config_in_an_earlier_location_invalidates_the_catalogue(self) -> None:
+        save_catalogue(str(self.config), self.response)
+        identity = config_identity(str(self.config))
+
+        (self.root / ".aerospace.toml").write_text("", encoding="utf-8")
+
+        self.assertNotEqual(config_identity(str(self.config)), identity)
+        self.assertIsNone(load_catalogue())
+
+    def test_only_alfred_filtering_keeps_the_cache_settings(self) -> None:
+        self.assertEqual(for_filtering_mode(self.response), {"items": self.response["items"]})
+
+        with mock.patch.dict(os.environ, {"SHORTCUTS_FILTERING": "alfred"}):
+            self.assertEqual(for_filtering_mode(self.response), self.response)
+
+
+if __name__ == "__main__":
+    unittest.main()
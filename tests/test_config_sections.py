@@ -0,0 +1,81 @@
+import sys
+import textwrap
+import tomllib
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "workflow" / "scripts"))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+
+import corpora
+from lib import config_sections
+from lib.aerospace import extract_shortcuts
+from lib.config_sections import extract_shortcuts_incremental, split_sections
+
+
+CONFIG_TEXT = textwrap.dedent(
+    """
+    start-at-login = true
+
+    [mode.main.binding]
+    alt-c = 'exec-and-forget open -a ChatGPT'
+    alt-f = 'flatten-workspace-tree' # alfred-name: Flatten Tree
+    alt-q = '''
+    [not-a-table]
+    ''' # alfred-skip
+
+    [mode."service-mode".binding]
+    "alt-shift-h" = ['join-with left', 'mode main'] # alfred-name: Join Left
+    """
+)
+
+
+class ConfigSectionsTest(unittest.TestCase):
+    def extract(self, text: str, cached: dict) -> tuple:
+        return extract_shortcuts_incremental(tomllib.loads(text), text, cached)
+
+    def test_sections_split_at_headers_outside_strings(self) -> None:
+        sections = split_sections(CONFIG_TEXT)
+
+        self.assertEqual("".join(sections), CONFIG_TEXT)
+        self.assertEqual(len(sections), 3)
+        self.assertIn("[not-a-table]", sections[1])
+
+    def test_result_matches_a_full_extraction(self) -> None:
+        text = corpora.config_text(modes=6, bindings_per_mode=10)
+        for config_text in (CONFIG_TEXT, text):
+            expected = extract_shortcuts(tomllib.loads(config_text), config_text)
+            shortcuts, sections = self.extract(config_text, {})
+            self.assertEqual(shortcuts, expected)
+            self.assertEqual(self.extract(config_text, sections)[0], expected)
+
+    def test_only_edited_sections_are_extracted_again(self) -> None:
+        text = corpora.config_text(modes=6, bindings_per_mode=10)
+        _, sections = self.extract(text, {})
+        header = "[mode.mode-3.binding]\n"
+        edited = text.replace(header, f"{header}cmd-shift-0 = 'reload-config' # alfred-name: Reload\n")
+
+        with mock.patch.object(
+            config_sections, "extract_section", wraps=config_sections.extract_section
+        ) as extract_section:
+            shortcuts, _ = self.extract(edited, sections)
+
+        self.assertEqual(extract_section.call_count, 1)
+        self.assertEqual(shortcuts, extract_shortcuts(tomllib.loads(edited), edited))
+        self.assertIn("Reload", [shortcut["description"] for shortcut in shortcuts])
+
+    def test_sections_that_do_not_parse_alone_fall_back_to_a_full_extraction(self) -> None:
+        text = CONFIG_TEXT.replace(
+            "start-at-login = true\n", "start-at-login = true\nsizes = [\n[1, 2],\n]\n"
+        )
+
+        shortcuts, sections = self.extract(text, {})
+
+        self.assertEqual(shortcuts, extract_shortcuts(tomllib.loads(text), text))
+        self.assertEqual(sections, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "workflow" / "scripts"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from aerospace_sim import Simulator, generate_state
+from lib import diagnostics
+
+
+CONFIG = """
+[mode.main.binding]
+alt-h = 'focus left'  # alfred-name: Focus left
+"""
+
+
+class DiagnosticsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        sim = Simulator(generate_state(windows=8, workspaces=3))
+        self.sim = sim.__enter__()
+        self.addCleanup(sim.__exit__, None, None, None)
+        config_path = self.sim.root / "aerospace.toml"
+        config_path.write_text(CONFIG, encoding="utf-8")
+        with self.sim.edit() as state:
+            state["config-path"] = str(config_path)
+        self.cache = tempfile.TemporaryDirectory()
+        self.addCleanup(self.cache.cleanup)
+        env = dict(self.sim.env, alfred_workflow_cache=self.cache.name)
+        patcher = mock.patch.dict(os.environ, env)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_every_dependency_is_timed_and_graded(self) -> None:
+        with mock.patch.object(diagnostics, "_run_python"):
+            results = diagnostics.run_checks(runs=2)
+
+        names = [result["name"] for result in results]
+        self.assertEqual(names[:3], ["startup", "imports", "aerospace_cli"])
+        self.assertTrue(any(name.startswith("mdfind:") for name in names))
+        self.assertEqual(names[-3:], ["config_path", "config_parse", "cache"])
+        for result in results:
+            self.assertIn(result["status"], {"pass", "warn"})
+            self.assertEqual(len(result["samples"]), 2)
+        self.assertEqual(os.listdir(self.cache.name), [])
+
+        report = diagnostics.format_report(results)
+        self.assertIn("2 runs per check", report)
+        self.assertIn("Config TOML and metadata parsing: median", report)
+
+    def test_failures_are_reported_with_the_error(self) -> None:
+        self.sim.set_fault("list-workspaces", fail="server is busy")
+
+        result = diagnostics.measure(
+            "aerospace_cli",
+            "aerospace CLI round trip",
+            lambda: diagnostics.run_command(["aerospace", *diagnostics.PING_ARGS]),
+        )
+
+        self.assertEqual(result["status"], "fail")
+        self.assertIn("server is busy", diagnostics.format_result(result))
+
+
+if __name__ == "__main__":
+    unittest.main()
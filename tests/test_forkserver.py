@@ -0,0 +1,129 @@
+import json
+import os
+import socket
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1] / "workflow" / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from aerospace_sim import Simulator, generate_state
+from lib import forkserver
+from lib.forkserver import server_socket_path, stop_server
+
+
+class ForkServerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        sim = Simulator(generate_state(windows=8, workspaces=3))
+        self.sim = sim.__enter__()
+        self.addCleanup(sim.__exit__, None, None, None)
+        cache = tempfile.TemporaryDirectory()
+        self.addCleanup(cache.cleanup)
+        self.env = dict(
+            os.environ, **self.sim.env, alfred_workflow_cache=cache.name, FORK_SERVER="1"
+        )
+        patcher = mock.patch.dict(os.environ, self.env)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(stop_server)
+
+    def run_script(self, script: str, *args: str, **env: str) -> subprocess.CompletedProcess:
+        return subprocess.run(
+            [sys.executable, "-X", "importtime", str(SCRIPTS_DIR / script), *args],
+            env=dict(self.env, **env),
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+
+    def wait_for_server(self) -> None:
+        deadline = time.monotonic() + 10
+        while not os.path.exists(server_socket_path()):
+            if time.monotonic() > deadline:
+                self.fail("fork server did not start")
+            time.sleep(0.05)
+
+    def start_server(self) -> None:
+        subprocess.Popen(  # pylint: disable=consider-using-with
+            [sys.executable, str(SCRIPTS_DIR / "fork_server.py")],
+            env=self.env,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        self.wait_for_server()
+
+    def test_entry_point_runs_in_a_forked_child_once_the_server_is_up(self) -> None:
+        direct = self.run_script("windows_all.py", "app", FORK_SERVER="")
+        # The first enabled run has no server, so it runs in-process and
+        # starts one.
+        first = self.run_script("windows_all.py", "app")
+        self.assertIn("lib.aerospace_async", first.stderr)
+        self.wait_for_server()
+
+        forked = self.run_script("windows_all.py", "app")
+
+        self.assertEqual(forked.returncode, 0, forked.stderr)
+        self.assertNotIn("lib.aerospace_async", forked.stderr)
+        self.assertEqual(json.loads(forked.stdout)["items"], json.loads(direct.stdout)["items"])
+
+    def test_exit_status_and_stderr_are_relayed(self) -> None:
+        self.start_server()
+
+        result = self.run_script("set_layout.py", "no-such-layout")
+
+        self.assertEqual(result.returncode, 1)
+        self.assertIn("no-such-layout", result.stdout + result.stderr)
+        self.assertNotIn("lib.aerospace_async", result.stderr)
+
+    def test_stopped_server_removes_its_socket(self) -> None:
+        self.start_server()
+
+        self.assertTrue(stop_server())
+
+        deadline = time.monotonic() + 5
+        while os.path.exists(server_socket_path()) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertFalse(os.path.exists(server_socket_path()))
+        self.assertFalse(stop_server())
+
+    def test_socket_is_private_to_the_user(self) -> None:
+        self.start_server()
+        path = server_socket_path()
+
+        self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o600)
+        self.assertEqual(stat.S_IMODE(os.stat(os.path.dirname(path)).st_mode), 0o700)
+
+    def test_scripts_outside_the_workflow_are_not_run(self) -> None:
+        self.start_server()
+        with tempfile.TemporaryDirectory() as other_dir:
+            marker = Path(other_dir) / "ran"
+            script = Path(other_dir) / "other.py"
+            script.write_text(f"open({str(marker)!r}, 'w').close()\n")
+            request = {"script": str(script), "argv": [], "env": self.env, "cwd": other_dir}
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+                conn.settimeout(5)
+                conn.connect(server_socket_path())
+                conn.sendall(json.dumps(request).encode("utf-8") + b"\n")
+                answer = conn.recv(1)
+            time.sleep(0.2)
+
+            self.assertEqual(answer, b"")
+            self.assertFalse(marker.exists())
+
+    def test_peer_uid_is_read_from_the_connection(self) -> None:
+        left, right = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+        with left, right:
+            self.assertEqual(forkserver._peer_uid(left), os.getuid())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import random
+import sys
+import unittest
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "workflow" / "scripts"))
+
+from lib.aerospace import filter_windows
+from lib.fuzzy import fuzzy_score, fuzzy_scores, numpy_available
+
+ALPHABET = "abcdeABCDE -_.1İß"
+
+
+def _random_strings(rng: random.Random, count: int, max_length: int) -> list:
+    return [
+        "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, max_length)))
+        for _ in range(count)
+    ]
+
+
+class FuzzyScoresTest(unittest.TestCase):
+    def _assert_matches_fuzzy_score(self, backend: str) -> None:
+        for seed in range(40):
+            rng = random.Random(seed)
+            haystacks = _random_strings(rng, 300, 12)
+            needles = _random_strings(rng, 8, 4) + rng.sample(haystacks, 4)
+            for needle in needles:
+                with self.subTest(seed=seed, needle=needle):
+                    self.assertEqual(
+                        fuzzy_scores(needle, haystacks, backend=backend),
+                        [fuzzy_score(needle, haystack) for haystack in haystacks],
+                    )
+
+    def test_python_backend_matches_fuzzy_score(self) -> None:
+        self._assert_matches_fuzzy_score("python")
+
+    @unittest.skipUnless(numpy_available(), "NumPy is not installed")
+    def test_numpy_backend_matches_fuzzy_score(self) -> None:
+        self._assert_matches_fuzzy_score("numpy")
+
+    def test_empty_needle_scores_nothing(self) -> None:
+        self.assertEqual(fuzzy_scores("", ["a", ""]), [None, None])
+
+    def test_filter_windows_ranks_app_matches_before_title_matches(self) -> None:
+        windows = [
+            {"app-name": "Mail", "window-title": "Chrome release notes"},
+            {"app-name": "Google Chrome", "window-title": "Inbox"},
+            {"app-name": "Chrome", "window-title": "Docs"},
+            {"app-name": "Slack", "window-title": "general"},
+        ]
+
+        ranked = filter_windows(windows, "chrome")
+
+        self.assertEqual(
+            [window["app-name"] for window in ranked],
+            ["Chrome", "Google Chrome", "Mail"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
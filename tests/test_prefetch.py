@@ -0,0 +1,155 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1] / "workflow" / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from aerospace_sim import Simulator, generate_state
+from lib import background
+from lib.background import running_prefetch, schedule_workspace_prefetch
+from lib.snapshot import load_snapshot, snapshot_path, workspace_snapshot_name
+
+
+class ScheduleWorkspacePrefetchTest(unittest.TestCase):
+    def setUp(self) -> None:
+        cache = tempfile.TemporaryDirectory()
+        self.addCleanup(cache.cleanup)
+        patcher = mock.patch.dict(os.environ, {"alfred_workflow_cache": cache.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        spawn = mock.patch.object(background, "spawn_detached", side_effect=[101, 102])
+        self.spawn = spawn.start()
+        self.addCleanup(spawn.stop)
+        killpg = mock.patch.object(background.os, "killpg")
+        self.killpg = killpg.start()
+        self.addCleanup(killpg.stop)
+
+    def test_prefetch_is_bounded(self) -> None:
+        self.assertTrue(schedule_workspace_prefetch(["3", "1", "3", "2", "4"]))
+
+        self.assertEqual(self.spawn.call_args.args[0][3:], ["3", "1"])
+        self.assertEqual(running_prefetch()["workspaces"], ["3", "1"])
+
+    def test_same_workspaces_reuse_the_running_prefetch(self) -> None:
+        schedule_workspace_prefetch(["3", "1"])
+        schedule_workspace_prefetch(["3", "1"])
+
+        self.assertEqual(self.spawn.call_count, 1)
+        self.killpg.assert_not_called()
+
+    def test_other_workspaces_cancel_the_running_prefetch(self) -> None:
+        schedule_workspace_prefetch(["3", "1"])
+        schedule_workspace_prefetch(["2", "1"])
+
+        self.killpg.assert_called_once_with(101, mock.ANY)
+        self.assertEqual(running_prefetch()["pid"], 102)
+
+    def test_marker_is_claimed_before_the_process_starts(self) -> None:
+        claimed = []
+        self.spawn.side_effect = lambda args: claimed.append(running_prefetch()) or 101
+
+        schedule_workspace_prefetch(["3", "1"])
+
+        self.assertEqual(claimed[0]["workspaces"], ["3", "1"])
+        self.assertEqual(claimed[0]["token"], self.spawn.call_args.args[0][2])
+        self.assertEqual(running_prefetch()["pid"], 101)
+
+    def test_failed_spawn_releases_the_marker(self) -> None:
+        self.spawn.side_effect = [None, 102]
+
+        self.assertFalse(schedule_workspace_prefetch(["3", "1"]))
+        self.assertIsNone(running_prefetch())
+        self.assertTrue(schedule_workspace_prefetch(["3", "1"]))
+
+    def test_stale_prefetch_is_replaced_without_signalling(self) -> None:
+        schedule_workspace_prefetch(["3", "1"])
+        with mock.patch.object(background.time, "time", return_value=time.time() + 60):
+            self.assertIsNone(running_prefetch())
+            schedule_workspace_prefetch(["3", "1"])
+
+        self.assertEqual(self.spawn.call_count, 2)
+        self.killpg.assert_not_called()
+
+
+class WorkspacePrefetchTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.sim = Simulator(generate_state(windows=12, workspaces=4))
+        self.sim.__enter__()
+        self.addCleanup(self.sim.__exit__, None, None, None)
+        self.cache_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.cache_dir, True)
+        self.marker = self.cache_dir / "workspace_prefetch.json"
+        self.addCleanup(self.wait_for_prefetch)
+        self.env = {
+            **os.environ,
+            **self.sim.env,
+            "PREFETCH_WORKSPACES": "1",
+            "alfred_workflow_cache": str(self.cache_dir),
+        }
+
+    def wait_for_prefetch(self) -> bool:
+        deadline = time.monotonic() + 10
+        while self.marker.exists() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        return not self.marker.exists()
+
+    def run_script(self, name: str, *args: str) -> dict:
+        result = subprocess.run(
+            [sys.executable, str(SCRIPTS_DIR / name), *args],
+            env=self.env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return json.loads(result.stdout)
+
+    def workspace_snapshot(self, workspace: str):
+        with mock.patch.dict(os.environ, {"alfred_workflow_cache": str(self.cache_dir)}):
+            return load_snapshot(snapshot_path(workspace_snapshot_name(workspace)))
+
+    def test_drill_down_into_the_focused_workspace_uses_the_prefetch(self) -> None:
+        focused = self.sim.state()["focus"]["workspace"]
+
+        self.run_script("workspace_overview.py", "")
+        self.assertTrue(self.wait_for_prefetch())
+        self.assertTrue(self.workspace_snapshot(focused)["prefetched"])
+        self.sim.reset_calls()
+
+        response = self.run_script("workspace_overview.py", f"{focused} ")
+
+        self.assertEqual(response["items"][0]["title"], f"Workspace {focused} [focused]")
+        self.assertFalse(
+            [args for args in self.sim.calls() if args[:1] == ["list-windows"]]
+        )
+
+    def test_superseded_prefetch_saves_nothing(self) -> None:
+        self.marker.write_text(
+            json.dumps(
+                {"token": "later", "pid": 1, "workspaces": ["1"], "started": time.time()}
+            ),
+            encoding="utf-8",
+        )
+
+        subprocess.run(
+            [sys.executable, str(SCRIPTS_DIR / "prefetch_workspaces.py"), "earlier", "1"],
+            env=self.env,
+            check=True,
+        )
+
+        self.assertIsNone(self.workspace_snapshot("1"))
+        self.assertTrue(self.marker.exists())
+        self.marker.unlink()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,185 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1] / "workflow" / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from aerospace_sim import Simulator, generate_state
+from lib import prerender
+from lib.prerender import prerender_path, save_prerendered, serve_prerendered
+from lib.snapshot import load_snapshot, refresh_snapshot, save_snapshot, snapshot_path
+
+
+class PrerenderTest(unittest.TestCase):
+    def setUp(self) -> None:
+        cache = tempfile.TemporaryDirectory()
+        self.addCleanup(cache.cleanup)
+        patcher = mock.patch.dict(
+            os.environ, {"alfred_workflow_cache": cache.name, "GROUP_BY_APP": ""}
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        argv = mock.patch.object(sys, "argv", ["windows.py", ""])
+        argv.start()
+        self.addCleanup(argv.stop)
+        save_snapshot(
+            snapshot_path("windows_all"),
+            refresh_snapshot(None, [{"window-id": 1, "app-name": "Safari"}]),
+        )
+        self.snapshot = load_snapshot(snapshot_path("windows_all"))
+        self.response = {"items": [{"title": "Safari", "arg": "1"}]}
+
+    def serve(self) -> str:
+        with mock.patch.object(sys, "stdout") as stdout:
+            if not serve_prerendered("windows_all"):
+                return ""
+        return "".join(call.args[0] for call in stdout.write.call_args_list)
+
+    def test_response_is_served_while_the_snapshot_file_is_unchanged(self) -> None:
+        save_prerendered("windows_all", self.snapshot, self.response)
+
+        self.assertEqual(json.loads(self.serve()), self.response)
+
+    def test_a_query_skips_the_prerendered_response(self) -> None:
+        save_prerendered("windows_all", self.snapshot, self.response)
+
+        with mock.patch.object(sys, "argv", ["windows.py", "saf"]):
+            self.assertEqual(self.serve(), "")
+
+    def test_rewritten_snapshot_invalidates_the_response(self) -> None:
+        save_prerendered("windows_all", self.snapshot, self.response)
+        time.sleep(0.01)
+        save_snapshot(
+            snapshot_path("windows_all"),
+            refresh_snapshot(None, [{"window-id": 2, "app-name": "Mail"}]),
+        )
+
+        self.assertEqual(self.serve(), "")
+
+    def test_changed_variant_invalidates_the_response(self) -> None:
+        save_prerendered("windows_all", self.snapshot, self.response)
+
+        with mock.patch.dict(os.environ, {"GROUP_BY_APP": "1"}):
+            self.assertEqual(self.serve(), "")
+
+    def test_fresh_response_is_served_without_a_refresh(self) -> None:
+        save_prerendered("windows_all", self.snapshot, self.response)
+
+        with mock.patch.object(prerender, "schedule_snapshot_refresh") as refresh:
+            self.assertEqual(json.loads(self.serve()), self.response)
+
+        refresh.assert_not_called()
+
+    def test_old_response_is_served_with_a_rerun_and_refreshed_once(self) -> None:
+        old = dict(self.snapshot, created=time.time() - 60)
+        save_prerendered("windows_all", old, self.response)
+
+        with mock.patch.object(prerender, "schedule_snapshot_refresh") as refresh:
+            served = json.loads(self.serve())
+            rerun = json.loads(self.serve())
+
+        self.assertEqual(served, dict(self.response, rerun=prerender.STALE_RERUN_SECONDS))
+        self.assertEqual(rerun, served)
+        refresh.assert_called_once_with()
+
+    def test_regeneration_starts_the_scripts_without_waiting(self) -> None:
+        save_prerendered("windows_all", self.snapshot, self.response)
+
+        with mock.patch.object(prerender, "spawn_detached") as spawn:
+            prerender.regenerate_prerendered()
+
+        spawn.assert_called_once()
+        args, kwargs = spawn.call_args
+        self.assertEqual(Path(args[0][1]).name, "windows.py")
+        self.assertEqual(kwargs["env"]["scope"], "all")
+
+    def test_embedded_snapshots_are_not_prerendered(self) -> None:
+        save_prerendered("windows_all", dict(self.snapshot, _embedded=True), self.response)
+
+        self.assertFalse(prerender_path("windows_all").exists())
+
+
+class PrerenderedScriptTest(unittest.TestCase):
+    def test_second_bare_run_is_served_without_aerospace_calls(self) -> None:
+        with Simulator(generate_state(windows=8, workspaces=3)) as sim:
+            with tempfile.TemporaryDirectory() as cache_dir:
+                env = dict(os.environ, **sim.env, alfred_workflow_cache=cache_dir)
+
+                def run(script: str) -> subprocess.CompletedProcess:
+                    return subprocess.run(
+                        [sys.executable, "-X", "importtime", str(SCRIPTS_DIR / script), ""],
+                        env=env,
+                        capture_output=True,
+                        text=True,
+                        check=True,
+                    )
+
+                for script in ("windows_all.py", "workspace_overview.py"):
+                    sim.reset_calls()
+                    first = run(script)
+                    self.assertTrue(sim.calls())
+                    sim.reset_calls()
+
+                    second = run(script)
+
+                    self.assertEqual(sim.calls(), [])
+                    self.assertEqual(json.loads(second.stdout), json.loads(first.stdout))
+                    self.assertIn("lib.aerospace_async", first.stderr)
+                    self.assertNotIn("lib.aerospace_async", second.stderr)
+
+    def test_stale_bare_run_is_rerun_from_the_refreshed_snapshot(self) -> None:
+        with Simulator(generate_state(windows=5, workspaces=2)) as sim:
+            with tempfile.TemporaryDirectory() as cache_dir:
+                env = dict(os.environ, **sim.env, alfred_workflow_cache=cache_dir)
+                path = Path(cache_dir) / "prerendered_windows_all.json"
+
+                def run() -> dict:
+                    result = subprocess.run(
+                        [sys.executable, str(SCRIPTS_DIR / "windows_all.py"), ""],
+                        env=env,
+                        capture_output=True,
+                        text=True,
+                        check=True,
+                    )
+                    return json.loads(result.stdout)
+
+                def served_current() -> bool:
+                    header = json.loads(path.read_text(encoding="utf-8").splitlines()[0])
+                    with mock.patch.dict(os.environ, {"alfred_workflow_cache": cache_dir}):
+                        return header["identity"] == prerender._file_identity(
+                            snapshot_path("windows_all")
+                        )
+
+                run()
+                header, body = path.read_text(encoding="utf-8").split("\n", 1)
+                header = dict(json.loads(header), created=time.time() - 60)
+                path.write_text(json.dumps(header) + "\n" + body, encoding="utf-8")
+                with sim.edit() as state:
+                    state["windows"].append(dict(state["windows"][0], **{"window-id": 9999}))
+
+                stale = run()
+                deadline = time.monotonic() + 10
+                rerun = run()
+                while "rerun" in rerun and time.monotonic() < deadline:
+                    time.sleep(0.1)
+                    rerun = run()
+                while not served_current() and time.monotonic() < deadline:
+                    time.sleep(0.05)
+
+        self.assertEqual(len(stale["items"]), 5)
+        self.assertIn("rerun", stale)
+        self.assertNotIn("rerun", rerun)
+        self.assertEqual(len(rerun["items"]), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
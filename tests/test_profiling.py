@@ -0,0 +1,79 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "workflow" / "scripts"))
+
+from lib import profiling
+from lib.profiling import load_runs, profiles_dir, run_entry_point
+
+
+def _busy() -> None:
+    sum(idx * idx for idx in range(2000))
+
+
+class ProfilingTest(unittest.TestCase):
+    def setUp(self) -> None:
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        patcher = mock.patch.dict(
+            os.environ,
+            {
+                "alfred_workflow_cache": cache_dir.name,
+                "session_windows_all": "z:" + "a" * 100,
+                "HOME": "/Users/someone",
+            },
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_disabled_by_default(self) -> None:
+        calls = []
+        with mock.patch.dict(os.environ, {"AEROSPACE_PROFILE": ""}):
+            run_entry_point(lambda: calls.append(1), name="windows")
+
+        self.assertEqual(calls, [1])
+        self.assertFalse(profiles_dir().exists())
+
+    def test_slow_runs_are_saved_with_metadata(self) -> None:
+        env = {"AEROSPACE_PROFILE": "1", "AEROSPACE_PROFILE_THRESHOLD_MS": "0"}
+        with mock.patch.dict(os.environ, env), mock.patch.object(
+            sys, "argv", ["windows.py", "chrome"]
+        ):
+            run_entry_point(_busy, name="windows")
+            with self.assertRaises(SystemExit):
+                run_entry_point(lambda: sys.exit(1), name="focus_window")
+
+        runs = load_runs(profiles_dir())
+        self.assertEqual([run["script"] for run in runs], ["windows", "focus_window"])
+        windows_run = next(run for run in runs if run["script"] == "windows")
+        self.assertEqual(windows_run["argv"], ["chrome"])
+        self.assertEqual(windows_run["environment"]["session_windows_all"], {"bytes": 102})
+        self.assertNotIn("HOME", windows_run["environment"])
+        self.assertTrue(Path(windows_run["path"]).exists())
+
+    def test_fast_runs_are_skipped_and_old_runs_pruned(self) -> None:
+        with mock.patch.dict(
+            os.environ,
+            {"AEROSPACE_PROFILE": "1", "AEROSPACE_PROFILE_THRESHOLD_MS": "60000"},
+        ):
+            run_entry_point(_busy, name="windows")
+        self.assertEqual(load_runs(profiles_dir()), [])
+
+        with mock.patch.dict(
+            os.environ,
+            {"AEROSPACE_PROFILE": "1", "AEROSPACE_PROFILE_THRESHOLD_MS": "0"},
+        ), mock.patch.object(profiling, "MAX_PROFILES", 2):
+            for _ in range(4):
+                run_entry_point(_busy, name="windows")
+
+        self.assertEqual(len(list(profiles_dir().glob("*.pstats"))), 2)
+        self.assertEqual(len(list(profiles_dir().glob("*.json"))), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import sys
+import unittest
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "workflow" / "scripts"))
+
+from lib.query import (
+    app_filter_value,
+    build_indexes,
+    group_by_app,
+    parse_query,
+    select_positions,
+)
+from lib.snapshot import is_dirty, refresh_snapshot, window_indexes
+
+
+WINDOWS = [
+    {
+        "window-id": 1,
+        "app-name": "Google Chrome",
+        "app-bundle-id": "com.google.Chrome",
+        "window-title": "Docs",
+        "workspace": "3",
+        "monitor-name": "Dell U2720Q",
+    },
+    {
+        "window-id": 2,
+        "app-name": "Slack",
+        "app-bundle-id": "com.tinyspeck.slackmacgap",
+        "window-title": "general",
+        "workspace": "3",
+        "monitor-name": "Built-in Retina Display",
+    },
+    {
+        "window-id": 3,
+        "app-name": "Google Chrome",
+        "app-bundle-id": "com.google.Chrome",
+        "window-title": "Mail",
+        "workspace": "13",
+        "monitor-name": "Dell U2720Q",
+    },
+]
+
+
+class ParseQueryTest(unittest.TestCase):
+    def test_filters_are_split_from_free_text(self) -> None:
+        self.assertEqual(
+            parse_query("ws:3 mail @Dell APP:chrome ws:13"),
+            {
+                "text": "mail",
+                "filters": {
+                    "workspace": ["3", "13"],
+                    "monitor": ["dell"],
+                    "app": ["chrome"],
+                },
+            },
+        )
+
+    def test_half_typed_filters_are_ignored(self) -> None:
+        self.assertEqual(parse_query("slack ws: @"), {"text": "slack", "filters": {}})
+
+
+class SelectPositionsTest(unittest.TestCase):
+    def test_fields_narrow_and_repeated_values_widen(self) -> None:
+        indexes = build_indexes(WINDOWS)
+
+        self.assertIsNone(select_positions(indexes, {}))
+        # Workspaces match exactly, so ws:3 does not pick up workspace 13.
+        self.assertEqual(select_positions(indexes, {"workspace": ["3"]}), [0, 1])
+        self.assertEqual(
+            select_positions(indexes, {"workspace": ["3", "13"], "monitor": ["dell"]}),
+            [0, 2],
+        )
+        self.assertEqual(select_positions(indexes, {"app": ["tinyspeck"]}), [1])
+        self.assertEqual(
+            select_positions(indexes, {"app": ["chrome"], "monitor": ["built-in"]}), []
+        )
+
+    def test_snapshot_indexes_are_built_once_per_refresh(self) -> None:
+        snapshot = refresh_snapshot(None, WINDOWS)
+        snapshot.pop("_dirty")
+
+        indexes = window_indexes(snapshot)
+
+        self.assertTrue(is_dirty(snapshot))
+        self.assertIs(window_indexes(snapshot), indexes)
+        self.assertNotIn("indexes", refresh_snapshot(snapshot, WINDOWS[:1]))
+
+
+class GroupByAppTest(unittest.TestCase):
+    def test_groups_follow_the_best_ranked_window(self) -> None:
+        ranked = [WINDOWS[2], WINDOWS[1], WINDOWS[0]]
+
+        groups = group_by_app(ranked)
+
+        self.assertEqual(
+            [[window["window-id"] for window in group] for group in groups],
+            [[3, 1], [2]],
+        )
+        value = app_filter_value(groups[0][0])
+        self.assertEqual(value, "com.google.chrome")
+        positions = select_positions(build_indexes(WINDOWS), {"app": [value]})
+        self.assertEqual(positions, [0, 2])
+        self.assertEqual(app_filter_value({"app-name": "Google Chrome"}), "google")
+
+
+if __name__ == "__main__":
+    unittest.main()
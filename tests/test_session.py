@@ -0,0 +1,110 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1] / "workflow" / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from aerospace_sim import Simulator, generate_state
+from lib import session
+from lib.session import load_session, session_variable, session_variables
+from lib.snapshot import load_snapshot, refresh_snapshot, save_snapshot, snapshot_path
+
+
+def _windows(count: int) -> list:
+    return [
+        {
+            "app-name": f"App {idx}",
+            "window-title": f"Window title number {idx} " * 3,
+            "window-id": idx,
+            "workspace": str(idx % 9),
+        }
+        for idx in range(count)
+    ]
+
+
+class SessionTest(unittest.TestCase):
+    def setUp(self) -> None:
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        patcher = mock.patch.dict(os.environ, {"alfred_workflow_cache": cache_dir.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_small_snapshot_is_embedded_and_never_written_back(self) -> None:
+        snapshot = refresh_snapshot(None, _windows(3))
+        variables = session_variables("windows_all", snapshot)
+        value = variables[session_variable("windows_all")]
+        self.assertTrue(value.startswith(session.EMBEDDED_PREFIX))
+
+        with mock.patch.dict(os.environ, variables):
+            carried = load_session("windows_all")
+            self.assertEqual(carried["windows"], snapshot["windows"])
+            self.assertEqual(session_variables("windows_all", carried), variables)
+            carried["_dirty"] = True
+            save_snapshot(snapshot_path("windows_all"), carried)
+
+        self.assertIsNone(load_snapshot(snapshot_path("windows_all")))
+
+    def test_large_snapshot_is_passed_by_reference(self) -> None:
+        snapshot = refresh_snapshot(None, _windows(50))
+        save_snapshot(snapshot_path("windows_all"), snapshot)
+        with mock.patch.object(session, "MAX_EMBEDDED_BYTES", 256):
+            variables = session_variables("windows_all", snapshot)
+        value = variables[session_variable("windows_all")]
+        self.assertTrue(value.startswith(session.REFERENCE_PREFIX))
+
+        with mock.patch.dict(os.environ, variables):
+            self.assertEqual(load_session("windows_all")["windows"], snapshot["windows"])
+            save_snapshot(
+                snapshot_path("windows_all"), refresh_snapshot(snapshot, _windows(2))
+            )
+            self.assertIsNone(load_session("windows_all"))
+
+    def test_expired_session_is_ignored(self) -> None:
+        snapshot = refresh_snapshot(None, _windows(1))
+        snapshot["created"] -= session.SESSION_MAX_AGE_SECONDS + 1
+        with mock.patch.dict(os.environ, session_variables("windows_all", snapshot)):
+            self.assertIsNone(load_session("windows_all"))
+
+
+class FocusedWindowSessionTest(unittest.TestCase):
+    def test_filtering_layout_options_reuses_the_session_window(self) -> None:
+        with Simulator(generate_state(windows=6, workspaces=2)) as sim:
+            with tempfile.TemporaryDirectory() as cache_dir:
+                env = dict(os.environ, **sim.env, alfred_workflow_cache=cache_dir)
+
+                def run(query: str, variables: dict) -> dict:
+                    result = subprocess.run(
+                        [sys.executable, str(SCRIPTS_DIR / "focused_window.py"), query],
+                        env=dict(env, **variables),
+                        capture_output=True,
+                        text=True,
+                        check=True,
+                    )
+                    return json.loads(result.stdout)
+
+                first = run("", {})
+                self.assertTrue(sim.calls())
+                sim.reset_calls()
+                # Without the file snapshot only the session can answer.
+                for name in os.listdir(cache_dir):
+                    os.remove(os.path.join(cache_dir, name))
+                second = run("accordion", first["variables"])
+
+                self.assertEqual(sim.calls(), [])
+                self.assertEqual(second["items"][0], first["items"][0])
+                self.assertTrue(
+                    all("accordion" in item["arg"] for item in second["items"][1:])
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
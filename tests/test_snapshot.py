@@ -0,0 +1,262 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1] / "workflow" / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from aerospace_sim import Simulator, generate_state
+from lib.aerospace import FOCUSED_WINDOW_ARGS
+from lib.snapshot import (
+    OVERVIEW_SNAPSHOT,
+    apply_focus,
+    apply_layout,
+    attach_workspaces,
+    diff_windows,
+    is_dirty,
+    is_fresh,
+    load_focused_window,
+    load_snapshot,
+    refresh_snapshot,
+    rendered_item,
+    save_focused_window,
+    save_snapshot,
+    search_keys,
+    snapshot_path,
+)
+
+
+def _window(
+    window_id: int, title: str, app: str = "Safari", workspace: str = "1"
+) -> dict:
+    return {
+        "app-name": app,
+        "window-title": title,
+        "window-id": window_id,
+        "workspace": workspace,
+        "monitor-name": "Built-in",
+    }
+
+
+class SnapshotDiffTest(unittest.TestCase):
+    def test_diff_classifies_windows_by_window_id(self) -> None:
+        diff = diff_windows(
+            {"1": "a", "2": "b", "3": "c"},
+            {"1": "a", "2": "changed", "4": "d"},
+        )
+
+        self.assertEqual(diff["unchanged"], ["1"])
+        self.assertEqual(diff["changed"], ["2"])
+        self.assertEqual(diff["added"], ["4"])
+        self.assertEqual(diff["removed"], ["3"])
+
+    def test_refresh_reuses_rendered_items_only_for_unchanged_windows(self) -> None:
+        previous = refresh_snapshot(None, [_window(1, "Docs"), _window(2, "Mail")])
+        calls = []
+
+        def render(window: dict) -> dict:
+            calls.append(window["window-id"])
+            return {"title": window["window-title"]}
+
+        for window in previous["windows"]:
+            rendered_item(previous, "test", window, render)
+        search_keys(previous)
+        self.assertEqual(calls, [1, 2])
+
+        current = refresh_snapshot(
+            previous, [_window(1, "Docs"), _window(2, "Inbox"), _window(3, "New")]
+        )
+        items = [
+            rendered_item(current, "test", window, render)
+            for window in current["windows"]
+        ]
+
+        self.assertEqual(calls, [1, 2, 2, 3])
+        self.assertEqual([item["title"] for item in items], ["Docs", "Inbox", "New"])
+        self.assertEqual(current["generation"], previous["generation"] + 1)
+        self.assertEqual(list(current["search"]), ["1"])
+        self.assertEqual(search_keys(current)[1], ("safari", "inbox"))
+
+    def test_generation_is_stable_when_nothing_changed(self) -> None:
+        previous = refresh_snapshot(None, [_window(1, "Docs")])
+        current = refresh_snapshot(previous, [_window(1, "Docs")])
+
+        self.assertEqual(current["generation"], previous["generation"])
+        self.assertEqual(current["diff"]["unchanged"], ["1"])
+
+    def test_save_and_load_round_trip_clears_dirty_flag(self) -> None:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            with mock.patch.dict(os.environ, {"alfred_workflow_cache": cache_dir}):
+                path = snapshot_path("windows_all")
+            snapshot = refresh_snapshot(None, [_window(1, "Docs")])
+            self.assertTrue(is_dirty(snapshot))
+
+            save_snapshot(path, snapshot)
+            loaded = load_snapshot(path)
+
+        self.assertFalse(is_dirty(snapshot))
+        self.assertIsNotNone(loaded)
+        self.assertNotIn("_dirty", loaded)
+        self.assertEqual(loaded["windows"], snapshot["windows"])
+
+
+class WriteThroughTest(unittest.TestCase):
+    def setUp(self) -> None:
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        patcher = mock.patch.dict(os.environ, {"alfred_workflow_cache": cache_dir.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_focus_marks_workspace_and_rebuilds_focused_scope(self) -> None:
+        all_snapshot = refresh_snapshot(
+            None,
+            [_window(1, "Docs"), _window(2, "Mail", workspace="2")],
+        )
+        overview = refresh_snapshot(
+            None,
+            [
+                {"window-id": 1, "workspace": "1", "app-name": "Safari"},
+                {"window-id": 2, "workspace": "2", "app-name": "Safari"},
+            ],
+        )
+        attach_workspaces(
+            overview,
+            [
+                {
+                    "workspace": "1",
+                    "monitor-name": "Built-in",
+                    "workspace-is-focused": "true",
+                    "workspace-is-visible": "true",
+                },
+                {
+                    "workspace": "2",
+                    "monitor-name": "Built-in",
+                    "workspace-is-focused": "false",
+                    "workspace-is-visible": "false",
+                },
+            ],
+        )
+        save_snapshot(snapshot_path("windows_all"), all_snapshot)
+        save_snapshot(snapshot_path(OVERVIEW_SNAPSHOT), overview)
+        save_snapshot(
+            snapshot_path("windows_focused"), refresh_snapshot(None, [_window(1, "Docs")])
+        )
+
+        apply_focus("2")
+
+        stored_all = load_snapshot(snapshot_path("windows_all"))
+        stored_overview = load_snapshot(snapshot_path(OVERVIEW_SNAPSHOT))
+        focused = load_snapshot(snapshot_path("windows_focused"))
+        states = {
+            entry["workspace"]: (
+                entry["workspace-is-focused"],
+                entry["workspace-is-visible"],
+            )
+            for entry in stored_overview["workspaces"]["items"]
+        }
+        self.assertEqual(states, {"1": ("false", "false"), "2": ("true", "true")})
+        self.assertNotIn("focus", stored_all)
+        self.assertEqual([window["window-id"] for window in focused["windows"]], [2])
+        self.assertTrue(is_fresh(stored_all) and is_fresh(focused))
+        self.assertTrue(is_fresh(stored_overview["workspaces"]))
+        stored_window = load_focused_window()
+        self.assertFalse(stored_window["complete"])
+        self.assertEqual(stored_window["window"]["window-id"], 2)
+
+    def test_focus_keeps_known_layouts_of_the_same_window(self) -> None:
+        save_snapshot(
+            snapshot_path("windows_all"), refresh_snapshot(None, [_window(1, "Docs")])
+        )
+        save_focused_window(
+            dict(_window(1, "Docs"), **{"window-layout": "floating"})
+        )
+
+        apply_focus("1")
+
+        stored = load_focused_window()
+        self.assertTrue(stored["complete"])
+        self.assertEqual(stored["window"]["window-layout"], "floating")
+
+    def test_reopening_after_a_focus_only_reads_the_new_layouts(self) -> None:
+        with Simulator(generate_state(windows=12, workspaces=4)) as sim:
+            env = {**os.environ, **sim.env}
+            with mock.patch.dict(os.environ, env):
+                env = dict(os.environ)
+
+                def run(script: str) -> dict:
+                    result = subprocess.run(
+                        [sys.executable, str(SCRIPTS_DIR / script)],
+                        env=env,
+                        capture_output=True,
+                        text=True,
+                        check=True,
+                    )
+                    return json.loads(result.stdout)
+
+                run("windows_all.py")
+                run("focused_window.py")
+                target = sim.state()["windows"][-1]
+                path = snapshot_path("windows_all")
+                # Long enough ago that only the write-through makes it fresh.
+                stale = dict(load_snapshot(path), created=time.time() - 60)
+                save_snapshot(path, stale)
+                subprocess.run(
+                    ["aerospace", "focus", "--window-id", str(target["window-id"])],
+                    env=env,
+                    check=True,
+                )
+                sim.reset_calls()
+
+                apply_focus(str(target["window-id"]))
+                items = run("windows_all.py")["items"]
+                asw_calls = sim.calls()
+                sim.reset_calls()
+                # Another window's layouts are unknown, so they are read.
+                focused = run("focused_window.py")["items"]
+                asfocused_calls = sim.calls()
+
+        self.assertEqual(asw_calls, [])
+        self.assertEqual(len(items), 12)
+        self.assertEqual(asfocused_calls, [FOCUSED_WINDOW_ARGS[1:]])
+        self.assertEqual(focused[0]["title"], target["app-name"])
+
+    def test_focus_on_unknown_window_drops_dependent_snapshots(self) -> None:
+        save_snapshot(
+            snapshot_path("windows_focused"), refresh_snapshot(None, [_window(1, "Docs")])
+        )
+        save_focused_window(_window(1, "Docs"))
+
+        apply_focus("99")
+
+        self.assertIsNone(load_snapshot(snapshot_path("windows_focused")))
+        self.assertIsNone(load_focused_window())
+
+    def test_layout_updates_focused_window(self) -> None:
+        window = dict(_window(1, "Docs"), **{"window-layout": "h_tiles"})
+        save_focused_window(window)
+
+        apply_layout("v_accordion")
+        stored = load_focused_window()
+        self.assertTrue(stored["complete"])
+        self.assertEqual(stored["window"]["window-layout"], "v_accordion")
+        self.assertEqual(
+            stored["window"]["window-parent-container-layout"], "v_accordion"
+        )
+
+        apply_layout("tiling")
+        stored = load_focused_window()
+        self.assertFalse(stored["complete"])
+        self.assertNotIn("window-layout", stored["window"])
+
+
+if __name__ == "__main__":
+    unittest.main()
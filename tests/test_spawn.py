@@ -0,0 +1,96 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "workflow" / "scripts"))
+
+from lib import aerospace, spawn
+from lib.spawn import command_env, resolve_executable, run
+
+
+class SpawnTest(unittest.TestCase):
+    def setUp(self) -> None:
+        bin_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(bin_dir.cleanup)
+        self.bin_dir = Path(bin_dir.name)
+        self._write_script(
+            "aerospace",
+            """
+            import json, os, sys
+            print(json.dumps({"args": sys.argv[1:], "env": sorted(os.environ)}))
+            """,
+        )
+        patcher = mock.patch.dict(
+            os.environ,
+            {"PATH": f"{self.bin_dir}{os.pathsep}{os.environ.get('PATH', '')}", "SECRET": "1"},
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        executables = mock.patch.dict(spawn._executables, clear=True)
+        executables.start()
+        self.addCleanup(executables.stop)
+
+    def _write_script(self, name: str, body: str) -> Path:
+        path = self.bin_dir / name
+        path.write_text(f"#!{sys.executable}\n" + textwrap.dedent(body))
+        path.chmod(0o755)
+        return path
+
+    def test_executables_are_resolved_once_per_path(self) -> None:
+        with mock.patch.object(spawn.shutil, "which", wraps=spawn.shutil.which) as which:
+            self.assertEqual(resolve_executable("aerospace"), str(self.bin_dir / "aerospace"))
+            run(["aerospace", "list-workspaces"])
+            run(["aerospace", "list-workspaces"])
+
+        self.assertEqual(which.call_count, 1)
+
+    def test_children_get_the_minimal_environment(self) -> None:
+        returncode, stdout, _ = run(["aerospace", "list-workspaces"])
+        answer = json.loads(stdout)
+
+        self.assertEqual(returncode, 0)
+        self.assertEqual(answer["args"], ["list-workspaces"])
+        self.assertNotIn("SECRET", answer["env"])
+        self.assertLessEqual(set(answer["env"]) - {"PATH"}, set(spawn.PASSED_ENV))
+        self.assertIn("/opt/homebrew/bin", command_env()["PATH"].split(os.pathsep))
+
+    @unittest.skipUnless(subprocess._USE_POSIX_SPAWN, "posix_spawn is not used here")
+    def test_children_are_started_with_posix_spawn(self) -> None:
+        with mock.patch.object(os, "posix_spawn", wraps=os.posix_spawn) as posix_spawn:
+            aerospace.run_command(["aerospace", "list-workspaces"])
+
+        self.assertEqual(posix_spawn.call_count, 1)
+
+    def test_a_removed_executable_is_searched_for_again(self) -> None:
+        key = ("aerospace", command_env()["PATH"])
+        spawn._executables[key] = str(self.bin_dir / "uninstalled" / "aerospace")
+
+        output = aerospace.run_command(["aerospace", "list-workspaces"])
+
+        self.assertEqual(json.loads(output)["args"], ["list-workspaces"])
+        self.assertEqual(spawn._executables[key], str(self.bin_dir / "aerospace"))
+
+    def test_streamed_output_is_decoded_across_chunk_boundaries(self) -> None:
+        self._write_script("aerospace", "print('[{\"window-title\": \"caf\\u00e9 \\u2014 notes\"}]')")
+
+        with mock.patch.object(aerospace, "STREAM_CHUNK_SIZE", 1):
+            chunks = list(aerospace.stream_command(["aerospace", "list-windows"]))
+
+        self.assertEqual(json.loads("".join(chunks)), [{"window-title": "café — notes"}])
+
+    def test_failures_report_stderr(self) -> None:
+        self._write_script("aerospace", "import sys; sys.exit('Unknown command')")
+
+        with self.assertRaisesRegex(RuntimeError, "Unknown command"):
+            aerospace.run_command(["aerospace", "nope"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+"""Compile the helper library into the bytecode bundle; see lib/bundle.py."""
+
+import os
+import sys
+from pathlib import Path
+
+# Build from the sources even when a current bundle exists.
+os.environ["AEROSPACE_BUNDLE"] = "0"
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from lib.bundle import build_bundle
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if build_bundle() else 1)
@@ -7,7 +7,14 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
+from lib.forkserver import delegate
+
+if __name__ == "__main__":
+    delegate(__file__)
+
+# pylint: disable=wrong-import-position
 from lib.aerospace import INSTALL_GUIDE_URL, load_config
+from lib.profiling import run_entry_point
 
 
 def _write_preview(path: str) -> str:
@@ -51,4 +58,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    run_entry_point(main)
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from lib.diagnostics import format_report, format_result, run_checks
+from lib.profiling import run_entry_point
+
+
+STATUS_LABELS = {"pass": "OK", "warn": "Slow", "fail": "Failed"}
+
+
+def _result_item(result: dict[str, Any]) -> dict[str, Any]:
+    status = STATUS_LABELS[result["status"]]
+    if "error" in result:
+        title = f"{result['label']}: failed"
+        subtitle = result["error"]
+    else:
+        title = f"{result['label']}: {result['median_ms']:.1f} ms"
+        subtitle = (
+            f"{status} - median of {len(result['samples'])} runs, "
+            f"max {result['max_ms']:.1f} ms, warn above {result['warn_ms']} ms"
+        )
+    line = format_result(result)
+    return {
+        "title": title,
+        "subtitle": subtitle,
+        "valid": False,
+        "uid": f"doctor:{result['name']}",
+        "text": {"copy": line, "largetype": line},
+    }
+
+
+def main() -> None:
+    results = run_checks()
+    report = format_report(results)
+    counts = {
+        status: sum(result["status"] == status for result in results)
+        for status in STATUS_LABELS
+    }
+    summary = ", ".join(
+        f"{count} {STATUS_LABELS[status].lower()}" for status, count in counts.items()
+    )
+    items = [
+        {
+            "title": "Copy diagnostics report",
+            "subtitle": f"{summary} - press Enter to copy",
+            "arg": report,
+            "text": {"copy": report, "largetype": report},
+        }
+    ]
+    items.extend(_result_item(result) for result in results)
+    print(json.dumps({"items": items}))
+
+
+if __name__ == "__main__":
+    run_entry_point(main)
@@ -7,12 +7,20 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
+from lib.forkserver import delegate
+
+if __name__ == "__main__":
+    delegate(__file__)
+
+# pylint: disable=wrong-import-position
 from lib.aerospace import (
     display_notification,
     notify_error,
     run_aerospace_command,
     trigger_binding,
 )
+from lib.background import schedule_snapshot_refresh
+from lib.profiling import run_entry_point
 
 
 def _execute_action(action: str) -> str:
@@ -47,6 +55,9 @@ def main() -> None:
         notify_error(str(exc))
         print(str(exc))
         raise SystemExit(1) from exc
+    # Bindings move windows around and `reload-config` changes the catalogue;
+    # the refresh worker re-renders whatever is cached.
+    schedule_snapshot_refresh()
     if output:
         print(output)
         if notifications_enabled:
@@ -54,4 +65,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    run_entry_point(main)
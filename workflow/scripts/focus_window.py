@@ -1,11 +1,44 @@
 #!/usr/bin/env python3
 
+import json
+import os
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
-from lib.aerospace import focus_window, notify_error
+from lib.forkserver import delegate
+
+if __name__ == "__main__":
+    delegate(__file__)
+
+# pylint: disable=wrong-import-position
+from lib.aerospace import display_notification, focus_window, notify_error
+from lib.background import schedule_snapshot_refresh
+from lib.bulk import bulk_summary, run_bulk
+from lib.profiling import run_entry_point
+from lib.snapshot import apply_bulk, apply_focus
+
+
+def _run_bulk(action: str) -> None:
+    payload = json.loads(action)
+    if not isinstance(payload, dict) or payload.get("type") != "bulk":
+        raise RuntimeError("Expected Alfred bulk payload object.")
+    bulk = str(payload.get("action", "")).strip()
+    target = str(payload.get("target", "")).strip()
+    window_ids = [str(window_id) for window_id in payload.get("window-ids", [])]
+    result = run_bulk(bulk, target, window_ids)
+    apply_bulk(bulk, target, result["done"])
+    schedule_snapshot_refresh()
+
+    summary = bulk_summary(bulk, target, result)
+    print(summary)
+    if result["failed"]:
+        notify_error(summary)
+        raise SystemExit(1)
+    notifications = os.environ.get("ENABLE_NOTIFICATIONS", "true").strip().lower()
+    if notifications in {"1", "true", "yes", "on"}:
+        display_notification(summary)
 
 
 def main() -> None:
@@ -14,13 +47,23 @@ def main() -> None:
         window_id = sys.stdin.read().strip()
     if not window_id:
         return
+    if window_id.startswith("{"):
+        try:
+            _run_bulk(window_id)
+        except (RuntimeError, ValueError) as exc:
+            notify_error(str(exc))
+            print(str(exc))
+            raise SystemExit(1) from exc
+        return
     try:
         focus_window(window_id)
     except Exception as exc:  # pylint: disable=broad-except
         notify_error(str(exc))
         print(str(exc))
         raise SystemExit(1) from exc
+    apply_focus(window_id)
+    schedule_snapshot_refresh()
 
 
 if __name__ == "__main__":
-    main()
+    run_entry_point(main)
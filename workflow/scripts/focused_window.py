@@ -7,7 +7,24 @@ from typing import Any
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
-from lib.aerospace import get_focused_window
+from lib.forkserver import delegate
+
+if __name__ == "__main__":
+    delegate(__file__)
+
+# pylint: disable=wrong-import-position
+from lib.aerospace import get_focused_window, seed_app_paths
+from lib.profiling import run_entry_point
+from lib.session import load_session, session_variables
+from lib.snapshot import (
+    FOCUSED_WINDOW_SNAPSHOT,
+    WINDOW_SCOPES,
+    is_fresh,
+    load_focused_window,
+    load_snapshot,
+    save_focused_window,
+    snapshot_path,
+)
 
 
 def _file_icon(path_value: str | None) -> dict | None:
@@ -57,14 +74,29 @@ def _ordered_layout_options(current_layout: str) -> list[str]:
     return ["h_tiles", "v_tiles", "h_accordion", "v_accordion"]
 
 
+def _focused_window_snapshot() -> dict[str, Any]:
+    # Within a panel session the window read by the first keystroke is
+    # reused; filtering the layout options needs nothing else.
+    snapshot = load_session(FOCUSED_WINDOW_SNAPSHOT)
+    if snapshot is not None and snapshot.get("complete"):
+        return snapshot
+    snapshot = load_focused_window()
+    if snapshot is not None and snapshot.get("complete") and is_fresh(snapshot):
+        return snapshot
+    for scope in WINDOW_SCOPES:
+        cached = load_snapshot(snapshot_path(f"windows_{scope}"))
+        if cached is not None:
+            seed_app_paths(cached.get("windows", []))
+    return save_focused_window(get_focused_window())
+
+
 def main() -> None:
     query = sys.argv[1] if len(sys.argv) > 1 else ""
     if not query:
         query = sys.stdin.read().strip()
 
-    window = None
     try:
-        window = get_focused_window()
+        snapshot = _focused_window_snapshot()
     except Exception as exc:  # pylint: disable=broad-except
         items = [
             {
@@ -76,9 +108,11 @@ def main() -> None:
         print(json.dumps({"items": items}))
         return
 
+    window = snapshot.get("window")
+    variables = session_variables(FOCUSED_WINDOW_SNAPSHOT, snapshot)
     if not window:
         items = [{"title": "No focused window", "valid": False}]
-        print(json.dumps({"items": items}))
+        print(json.dumps({"variables": variables, "items": items}))
         return
 
     app_name = str(window.get("app-name", "Unknown"))
@@ -168,8 +202,8 @@ def main() -> None:
             }
         )
 
-    print(json.dumps({"items": items}))
+    print(json.dumps({"variables": variables, "items": items}))
 
 
 if __name__ == "__main__":
-    main()
+    run_entry_point(main)
@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+"""Serve script entry points from pre-forked children; see lib/forkserver.py."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from lib.forkserver import serve
+
+
+if __name__ == "__main__":
+    serve()
@@ -1 +1,83 @@
-"""Shared helpers for the AeroSpace Alfred workflow."""
+"""Shared helpers for the AeroSpace Alfred workflow.
+
+Submodules are imported from a zip of precompiled, optimized bytecode in the
+workflow cache when one exists for this interpreter and was built from
+exactly the sources on disk: the zip carries a manifest of their names,
+sizes and modification times, which must match. Otherwise they load from
+source and ``build_bundle.py`` is started in the background to build the
+zip. Set ``AEROSPACE_BUNDLE=0`` to always import from source.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+import zipimport
+from pathlib import Path
+from typing import Optional
+
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1]
+BUNDLE_ENV = "AEROSPACE_BUNDLE"
+BUILD_BUNDLE_SCRIPT = SCRIPTS_DIR / "build_bundle.py"
+BUNDLE_MANIFEST = "lib/SOURCES"
+# A build that has not finished in this long is assumed to have died.
+BUNDLE_BUILD_SECONDS = 60
+
+
+def bundle_path() -> Optional[str]:
+    cache_root = os.environ.get("alfred_workflow_cache")
+    if not cache_root:
+        return None
+    return os.path.join(cache_root, f"lib-{sys.implementation.cache_tag}.zip")
+
+
+def source_manifest() -> str:
+    """Name, size and modification time of every ``lib`` source, one per line."""
+    lines = []
+    with os.scandir(os.path.dirname(__file__)) as entries:
+        for entry in entries:
+            if entry.name.endswith(".py"):
+                stat = entry.stat()
+                lines.append(f"{entry.name} {stat.st_size} {stat.st_mtime_ns}\n")
+    return "".join(sorted(lines))
+
+
+def bundle_is_current(path: str) -> bool:
+    """Whether ``path`` exists and was built from the sources as they are now.
+
+    Any difference counts, so an older release unpacked over a newer one, or
+    a bundle built before the sources were replaced, is not used.
+    """
+    try:
+        manifest = zipimport.zipimporter(path).get_data(BUNDLE_MANIFEST)
+    except (OSError, zipimport.ZipImportError):
+        return False
+    return manifest.decode("utf-8", errors="replace") == source_manifest()
+
+
+def _building(path: str) -> bool:
+    try:
+        started = os.stat(f"{path}.building").st_mtime
+    except OSError:
+        return False
+    return time.time() - started < BUNDLE_BUILD_SECONDS
+
+
+def _use_bundle() -> None:
+    if os.environ.get(BUNDLE_ENV, "1") == "0":
+        return
+    path = bundle_path()
+    if path is None:
+        return
+    if bundle_is_current(path):
+        __path__[:] = [os.path.join(path, "lib")]
+        return
+    if not _building(path):
+        from .background import spawn_detached  # pylint: disable=import-outside-toplevel
+
+        spawn_detached([sys.executable, str(BUILD_BUNDLE_SCRIPT)])
+
+
+_use_bundle()
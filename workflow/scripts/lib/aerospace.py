@@ -2,16 +2,23 @@
 
 from __future__ import annotations
 
+import codecs
+import heapq
 import json
 import os
 import re
+import selectors
 import shlex
 import subprocess
+import time
 import tomllib
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
+from .aerospace_socket import run_native
 from .alfred_metadata import extract_shortcut_metadata
+from .fuzzy import fuzzy_score, fuzzy_scores  # pylint: disable=unused-import
+from .spawn import run, spawn
 
 
 INSTALL_GUIDE_URL = "https://nikitabobko.github.io/AeroSpace/guide#installation"
@@ -19,20 +26,13 @@ MISSING_CONFIG_MESSAGE = (
     "Config file does not exist. Please check the path in preferences."
 )
 
-DEFAULT_PATHS = [
-    "/opt/homebrew/bin",
-    "/usr/local/bin",
-    "/usr/bin",
-    "/bin",
-    "/usr/sbin",
-    "/sbin",
-]
-
 WINDOWS_FORMAT = (
     "%{app-name} %{window-title} %{window-id} %{app-pid} "
     "%{workspace} %{app-bundle-id} %{monitor-name}"
 )
 
+WINDOW_SUMMARY_FORMAT = "%{window-id} %{workspace} %{app-name}"
+
 FOCUSED_WINDOW_FORMAT = (
     "%{app-name} %{window-title} %{window-id} %{app-pid} %{workspace} "
     "%{app-bundle-id} %{monitor-name} %{window-layout} "
@@ -46,36 +46,110 @@ WORKSPACES_FORMAT = (
     "%{workspace-is-visible} %{workspace-root-container-layout} %{monitor-is-main}"
 )
 
-_app_path_cache: Dict[str, Optional[str]] = {}
+FOCUSED_WINDOW_ARGS = [
+    "aerospace",
+    "list-windows",
+    "--focused",
+    "--json",
+    "--format",
+    FOCUSED_WINDOW_FORMAT,
+]
+
+WINDOW_SUMMARY_ARGS = [
+    "aerospace",
+    "list-windows",
+    "--all",
+    "--json",
+    "--format",
+    WINDOW_SUMMARY_FORMAT,
+]
 
+LIST_WORKSPACES_ARGS = [
+    "aerospace",
+    "list-workspaces",
+    "--all",
+    "--json",
+    "--format",
+    WORKSPACES_FORMAT,
+]
+STREAM_CHUNK_SIZE = 64 * 1024
 
-def _ensure_path(env: Dict[str, str]) -> Dict[str, str]:
-    current = env.get("PATH", "")
-    parts = [p for p in current.split(os.pathsep) if p]
-    for path in DEFAULT_PATHS:
-        if path not in parts:
-            parts.append(path)
-    env["PATH"] = os.pathsep.join(parts)
-    return env
+# Bundle id -> app path (None when mdfind found nothing), shared with the
+# asyncio client so each app is looked up once per process.
+app_path_cache: Dict[str, Optional[str]] = {}
 
 
-def _run_command(args: List[str], timeout: int = 15) -> str:
-    env = _ensure_path(os.environ.copy())
-    result = subprocess.run(
-        args,
-        capture_output=True,
-        text=True,
-        env=env,
-        timeout=timeout,
-    )
-    if result.returncode != 0:
-        message = result.stderr.strip() or result.stdout.strip()
+def check_result(returncode: int, stdout: str, stderr: str) -> str:
+    if returncode != 0:
+        message = stderr.strip() or stdout.strip()
         raise RuntimeError(message or "Command failed.")
-    return result.stdout
+    return stdout
+
+
+def decode_output(output: bytes) -> str:
+    return output.decode("utf-8", errors="replace")
+
+
+def run_command(args: List[str], timeout: int = 15) -> str:
+    returncode, stdout, stderr = run(args, timeout=timeout)
+    if returncode != 0:
+        return check_result(returncode, decode_output(stdout), decode_output(stderr))
+    return decode_output(stdout)
+
+
+def stream_command(args: List[str], timeout: int = 15) -> Iterator[str]:
+    """Yield the stdout of ``args`` in chunks as the process writes it.
+
+    The whole run, reading included, is bounded by ``timeout``; a process
+    that overruns it is killed and ``subprocess.TimeoutExpired`` raised.
+    """
+    deadline = time.monotonic() + timeout
+    process = spawn(args)
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    stderr: List[bytes] = []
+    selector = selectors.DefaultSelector()
+    try:
+        selector.register(process.stdout, selectors.EVENT_READ)
+        selector.register(process.stderr, selectors.EVENT_READ)
+        while selector.get_map():
+            remaining = deadline - time.monotonic()
+            events = selector.select(remaining) if remaining > 0 else []
+            if not events:
+                raise subprocess.TimeoutExpired(args, timeout)
+            for key, _ in events:
+                chunk = os.read(key.fd, STREAM_CHUNK_SIZE)
+                if not chunk:
+                    selector.unregister(key.fileobj)
+                elif key.fileobj is process.stderr:
+                    stderr.append(chunk)
+                else:
+                    text = decoder.decode(chunk)
+                    if text:
+                        yield text
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+        returncode = process.wait(timeout=max(deadline - time.monotonic(), 0))
+    finally:
+        selector.close()
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+        process.stderr.close()
+    if returncode != 0:
+        check_result(returncode, "", decode_output(b"".join(stderr)))
+
+
+def _run_aerospace(args: List[str], timeout: int = 15) -> str:
+    answer = run_native(args[1:], run_command, timeout=timeout)
+    if answer is None:
+        return run_command(args, timeout=timeout)
+    return check_result(*answer)
 
 
 def get_config_path() -> str:
-    path = _run_command(["aerospace", "config", "--config-path"]).strip()
+    path = run_command(["aerospace", "config", "--config-path"]).strip()
     if not path:
         raise RuntimeError("Unable to resolve AeroSpace config path.")
     return os.path.expanduser(path)
@@ -116,87 +190,79 @@ def shortcut_description(value: Any) -> str:
     return normalize_description(value)
 
 
-def fuzzy_score(needle: str, haystack: str) -> Optional[int]:
-    if not needle or not haystack:
-        return None
-    needle = needle.lower()
-    haystack = haystack.lower()
-
-    if needle == haystack:
-        return 1000
-    if haystack.startswith(needle):
-        return 700 - len(haystack)
-    if needle in haystack:
-        return 500 - haystack.index(needle)
-
-    score = 0
-    h_idx = 0
-    consecutive = 0
-    for ch in needle:
-        found = haystack.find(ch, h_idx)
-        if found == -1:
-            return None
-        if found == h_idx:
-            consecutive += 1
-            score += 3 + consecutive
-        else:
-            consecutive = 0
-            score += 1
-        h_idx = found + 1
-
-    score -= max(0, h_idx - len(needle))
-    return score
-
-
-def filter_windows(windows: List[Dict[str, Any]], query: str) -> List[Dict[str, Any]]:
+def filter_windows(
+    windows: List[Dict[str, Any]],
+    query: str,
+    search_keys: Optional[List[tuple[str, str]]] = None,
+    limit: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Rank ``windows`` matching ``query``, keeping only the best ``limit``."""
     if not query:
-        return windows
+        return windows if limit is None else windows[:limit]
     query = query.lower()
+    if search_keys is None:
+        app_names = [str(window.get("app-name", "")) for window in windows]
+    else:
+        app_names = [keys[0] for keys in search_keys]
+
     ranked: List[tuple[int, int, int, Dict[str, Any]]] = []
-    for idx, window in enumerate(windows):
-        app_name = str(window.get("app-name", ""))
-        window_title = str(window.get("window-title", ""))
-        app_score = fuzzy_score(query, app_name)
+    unmatched: List[int] = []
+    for idx, app_score in enumerate(fuzzy_scores(query, app_names)):
         if app_score is not None:
-            ranked.append((0, -app_score, idx, window))
-            continue
-        title_score = fuzzy_score(query, window_title)
+            ranked.append((0, -app_score, idx, windows[idx]))
+        else:
+            unmatched.append(idx)
+
+    if search_keys is None:
+        titles = [str(windows[idx].get("window-title", "")) for idx in unmatched]
+    else:
+        titles = [search_keys[idx][1] for idx in unmatched]
+    for idx, title_score in zip(unmatched, fuzzy_scores(query, titles)):
         if title_score is not None:
-            ranked.append((1, -title_score, idx, window))
+            ranked.append((1, -title_score, idx, windows[idx]))
 
-    ranked.sort()
+    if limit is not None and limit < len(ranked):
+        ranked = heapq.nsmallest(limit, ranked)
+    else:
+        ranked.sort()
     return [entry[3] for entry in ranked]
 
 
-def extract_shortcuts(config: Dict[str, Any], config_text: str) -> List[Dict[str, str]]:
-    shortcuts: List[Dict[str, str]] = []
+def iter_bindings(config: Dict[str, Any]) -> Iterator[tuple[str, str, Any]]:
+    """Yield ``(mode, binding, command)`` for every binding in config order."""
     modes = config.get("mode", {})
     if not isinstance(modes, dict):
-        return shortcuts
-    shortcut_metadata = extract_shortcut_metadata(config_text)
-
+        return
     for mode_name, mode_config in modes.items():
         if not isinstance(mode_config, dict):
             continue
         bindings = mode_config.get("binding", {})
         if not isinstance(bindings, dict):
             continue
-
-        mode = str(mode_name)
         for shortcut, command in bindings.items():
-            binding = str(shortcut)
-            metadata = shortcut_metadata.get((mode, binding), {})
-            if metadata.get("skip"):
-                continue
-            normalized_command = normalize_description(command)
-            shortcuts.append(
-                {
-                    "mode": mode,
-                    "shortcut": binding,
-                    "description": metadata.get("name", shortcut_description(command)),
-                    "command": normalized_command,
-                }
-            )
+            yield str(mode_name), str(shortcut), command
+
+
+def extract_shortcuts(config: Dict[str, Any], config_text: str) -> List[Dict[str, str]]:
+    shortcuts: List[Dict[str, str]] = []
+    modes = config.get("mode", {})
+    if not isinstance(modes, dict):
+        return shortcuts
+    shortcut_metadata = extract_shortcut_metadata(config_text)
+
+    for mode, binding, command in iter_bindings(config):
+        metadata = shortcut_metadata.get((mode, binding), {})
+        if metadata.get("skip"):
+            continue
+        normalized_command = normalize_description(command)
+        shortcuts.append(
+            {
+                "mode": mode,
+                "shortcut": binding,
+                "description": metadata.get("name", shortcut_description(command)),
+                "command": normalized_command,
+            }
+        )
     return shortcuts
 
 
@@ -215,7 +281,7 @@ def display_notification(message: str, title: str = "AeroSpace") -> None:
         + '"'
     )
     try:
-        subprocess.run(["osascript", "-e", script], check=False)
+        run(["osascript", "-e", script])
     except Exception:  # pylint: disable=broad-except
         return
 
@@ -228,7 +294,7 @@ def notify_error(message: str) -> None:
 
 
 def trigger_binding(binding: str, mode: str) -> str:
-    output = _run_command(["aerospace", "trigger-binding", binding, "--mode", mode])
+    output = _run_aerospace(["aerospace", "trigger-binding", binding, "--mode", mode])
     return output.strip()
 
 
@@ -237,98 +303,165 @@ def run_aerospace_command(command: str) -> str:
     if not args:
         raise RuntimeError("Command is empty.")
 
-    output = _run_command(["aerospace", *args])
+    output = run_command(["aerospace", *args])
     return output.strip()
 
 
+def app_path_args(bundle_id: str) -> List[str]:
+    return ["mdfind", f'kMDItemCFBundleIdentifier="{bundle_id}"']
+
+
+def parse_app_path(output: str) -> Optional[str]:
+    output = output.strip()
+    return output.splitlines()[0] if output else None
+
+
 def get_app_path(bundle_id: str) -> Optional[str]:
     if not bundle_id:
         return None
-    if bundle_id in _app_path_cache:
-        return _app_path_cache[bundle_id]
+    if bundle_id in app_path_cache:
+        return app_path_cache[bundle_id]
 
     try:
-        output = _run_command(
-            [
-                "mdfind",
-                f'kMDItemCFBundleIdentifier="{bundle_id}"',
-            ]
-        ).strip()
+        output = run_command(app_path_args(bundle_id))
     except Exception:  # pylint: disable=broad-except
         output = ""
 
-    app_path = output.splitlines()[0] if output else None
-    _app_path_cache[bundle_id] = app_path
+    app_path = parse_app_path(output)
+    app_path_cache[bundle_id] = app_path
     return app_path
 
 
-def list_windows(scope: str) -> List[Dict[str, Any]]:
-    args = [
+def seed_app_paths(windows: List[Dict[str, Any]]) -> None:
+    for window in windows:
+        bundle_id = window.get("app-bundle-id")
+        if isinstance(bundle_id, str) and bundle_id and "app-path" in window:
+            app_path_cache.setdefault(bundle_id, window["app-path"])
+
+
+def seed_known_app_paths(paths: Dict[str, Optional[str]]) -> None:
+    """Reuse app paths resolved by earlier runs, ``None`` for apps not found."""
+    for bundle_id, app_path in paths.items():
+        app_path_cache.setdefault(bundle_id, app_path)
+
+
+def list_windows_args(scope: str) -> List[str]:
+    if scope != "all":
+        return workspace_windows_args("focused")
+    return [
         "aerospace",
         "list-windows",
         "--json",
         "--format",
         WINDOWS_FORMAT,
+        "--all",
     ]
-    if scope == "all":
-        args.append("--all")
-    else:
-        args.extend(["--workspace", "focused"])
 
-    output = _run_command(args)
-    windows = json.loads(output)
-    if not isinstance(windows, list):
+
+def workspace_windows_args(workspace: str) -> List[str]:
+    return [
+        "aerospace",
+        "list-windows",
+        "--json",
+        "--format",
+        WINDOWS_FORMAT,
+        "--workspace",
+        workspace,
+    ]
+
+
+def parse_json_list(output: str) -> List[Dict[str, Any]]:
+    entries = json.loads(output)
+    if not isinstance(entries, list):
         return []
+    return entries
+
+
+def iter_json_list(chunks: Iterable[str]) -> Iterator[Any]:
+    """Decode a JSON list from text chunks, yielding each entry once complete."""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    started = False
+    for chunk in chunks:
+        buffer = buffer[position:] + chunk
+        position = 0
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                position += 1
+            if position >= len(buffer):
+                break
+            if not started:
+                if buffer[position] != "[":
+                    raise ValueError("Expected a JSON list.")
+                started = True
+                position += 1
+                continue
+            if buffer[position] == "]":
+                return
+            try:
+                entry, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # The entry continues in the next chunk.
+                break
+            yield entry
+    raise ValueError("Truncated JSON list.")
+
+
+def window_bundle_ids(windows: List[Dict[str, Any]]) -> List[str]:
+    bundle_ids: List[str] = []
+    for window in windows:
+        bundle_id = window.get("app-bundle-id")
+        if isinstance(bundle_id, str) and bundle_id not in bundle_ids:
+            bundle_ids.append(bundle_id)
+    return bundle_ids
 
+
+def _attach_app_paths(windows: List[Dict[str, Any]]) -> None:
     for window in windows:
         bundle_id = window.get("app-bundle-id")
         if isinstance(bundle_id, str):
             window["app-path"] = get_app_path(bundle_id)
+
+
+def list_windows(scope: str) -> List[Dict[str, Any]]:
+    windows = parse_json_list(_run_aerospace(list_windows_args(scope)))
+    _attach_app_paths(windows)
     return windows
 
 
+def list_windows_without_app_paths(scope: str, timeout: int = 15) -> List[Dict[str, Any]]:
+    """Windows of ``scope`` as AeroSpace lists them, without app paths.
+
+    Callers resolve icons for the windows they end up showing, so large
+    desktops do not wait on ``mdfind`` for every app. CLI output is decoded
+    while the command is still writing it; the whole list is returned since
+    callers keep every window in their snapshot.
+    """
+    args = list_windows_args(scope)
+    answer = run_native(args[1:], run_command, timeout=timeout)
+    if answer is not None:
+        return list(iter_json_list([check_result(*answer)]))
+    return list(iter_json_list(stream_command(args, timeout=timeout)))
+
+
 def get_focused_window() -> Optional[Dict[str, Any]]:
-    output = _run_command(
-        [
-            "aerospace",
-            "list-windows",
-            "--focused",
-            "--json",
-            "--format",
-            FOCUSED_WINDOW_FORMAT,
-        ]
-    )
-    windows = json.loads(output)
-    if not isinstance(windows, list) or not windows:
+    windows = parse_json_list(_run_aerospace(FOCUSED_WINDOW_ARGS))
+    if not windows:
         return None
 
     window = windows[0]
-    bundle_id = window.get("app-bundle-id")
-    if isinstance(bundle_id, str):
-        window["app-path"] = get_app_path(bundle_id)
+    _attach_app_paths([window])
     return window
 
 
 def list_workspaces() -> List[Dict[str, Any]]:
-    output = _run_command(
-        [
-            "aerospace",
-            "list-workspaces",
-            "--all",
-            "--json",
-            "--format",
-            WORKSPACES_FORMAT,
-        ]
-    )
-    workspaces = json.loads(output)
-    if not isinstance(workspaces, list):
-        return []
-    return workspaces
+    return parse_json_list(_run_aerospace(LIST_WORKSPACES_ARGS))
 
 
 def focus_window(window_id: str) -> None:
-    _run_command(["aerospace", "focus", "--window-id", str(window_id)])
+    _run_aerospace(["aerospace", "focus", "--window-id", str(window_id)])
 
 
 def set_layout(layout: str) -> None:
-    _run_command(["aerospace", "layout", layout])
+    _run_aerospace(["aerospace", "layout", layout])
@@ -0,0 +1,161 @@
+"""Asyncio variants of the AeroSpace helpers for fanning out CLI calls."""
+
+from __future__ import annotations
+
+import asyncio
+import subprocess
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from .aerospace import (
+    FOCUSED_WINDOW_ARGS,
+    LIST_WORKSPACES_ARGS,
+    WINDOW_SUMMARY_ARGS,
+    app_path_args,
+    app_path_cache,
+    check_result,
+    decode_output,
+    list_windows_args,
+    parse_app_path,
+    parse_json_list,
+    run_command,
+    window_bundle_ids,
+    workspace_windows_args,
+)
+from .aerospace_socket import can_run_native, run_native
+from .spawn import command_env, resolve_executable
+
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_TIMEOUT = 15
+
+ClientCall = Callable[["AsyncClient"], Awaitable[Any]]
+
+
+class AsyncClient:
+    """Runs AeroSpace and mdfind commands concurrently with a shared limit."""
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_CONCURRENCY,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> None:
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self._env = command_env()
+        self._app_path_tasks: Dict[str, asyncio.Task] = {}
+
+    async def run_command(self, args: List[str], timeout: Optional[float] = None) -> str:
+        limit = self.timeout if timeout is None else timeout
+        if args[0] == "aerospace" and can_run_native(args[1:]):
+            loop = asyncio.get_running_loop()
+            async with self._semaphore:
+                answer = await loop.run_in_executor(
+                    None, run_native, args[1:], run_command, limit
+                )
+            if answer is not None:
+                return check_result(*answer)
+        async with self._semaphore:
+            process = await asyncio.create_subprocess_exec(
+                resolve_executable(args[0]),
+                *args[1:],
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=self._env,
+                close_fds=False,
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(), limit)
+            except asyncio.TimeoutError as exc:
+                process.kill()
+                await process.wait()
+                raise subprocess.TimeoutExpired(args, limit) from exc
+        if process.returncode:
+            return check_result(
+                process.returncode, decode_output(stdout), decode_output(stderr)
+            )
+        return decode_output(stdout)
+
+    async def _resolve_app_path(self, bundle_id: str) -> Optional[str]:
+        try:
+            output = await self.run_command(app_path_args(bundle_id))
+        except Exception:  # pylint: disable=broad-except
+            output = ""
+        app_path = parse_app_path(output)
+        app_path_cache[bundle_id] = app_path
+        return app_path
+
+    async def get_app_path(self, bundle_id: str) -> Optional[str]:
+        if not bundle_id:
+            return None
+        if bundle_id in app_path_cache:
+            return app_path_cache[bundle_id]
+        task = self._app_path_tasks.get(bundle_id)
+        if task is None:
+            task = asyncio.ensure_future(self._resolve_app_path(bundle_id))
+            self._app_path_tasks[bundle_id] = task
+        return await task
+
+    async def get_app_paths(self, bundle_ids: Iterable[str]) -> Dict[str, Optional[str]]:
+        unique = list(dict.fromkeys(bundle_ids))
+        paths = await asyncio.gather(*(self.get_app_path(bundle) for bundle in unique))
+        return dict(zip(unique, paths))
+
+    async def _attach_app_paths(self, windows: List[Dict[str, Any]]) -> None:
+        paths = await self.get_app_paths(window_bundle_ids(windows))
+        for window in windows:
+            bundle_id = window.get("app-bundle-id")
+            if isinstance(bundle_id, str):
+                window["app-path"] = paths.get(bundle_id)
+
+    async def list_windows(self, scope: str) -> List[Dict[str, Any]]:
+        windows = parse_json_list(await self.run_command(list_windows_args(scope)))
+        await self._attach_app_paths(windows)
+        return windows
+
+    async def list_workspace_windows(self, workspace: str) -> List[Dict[str, Any]]:
+        windows = parse_json_list(
+            await self.run_command(workspace_windows_args(workspace))
+        )
+        await self._attach_app_paths(windows)
+        return windows
+
+    async def list_window_summaries(self) -> List[Dict[str, Any]]:
+        """Window id, workspace and app name for every window, without icons."""
+        return parse_json_list(await self.run_command(WINDOW_SUMMARY_ARGS))
+
+    async def get_focused_window(self) -> Optional[Dict[str, Any]]:
+        windows = parse_json_list(await self.run_command(FOCUSED_WINDOW_ARGS))
+        if not windows:
+            return None
+        window = windows[0]
+        await self._attach_app_paths([window])
+        return window
+
+    async def list_workspaces(self) -> List[Dict[str, Any]]:
+        return parse_json_list(await self.run_command(LIST_WORKSPACES_ARGS))
+
+
+def run_concurrently(
+    *calls: ClientCall,
+    max_concurrency: int = DEFAULT_CONCURRENCY,
+    timeout: float = DEFAULT_TIMEOUT,
+    return_exceptions: bool = False,
+) -> List[Any]:
+    """Run client calls on one event loop and return their results in order.
+
+    With ``return_exceptions`` set, a failing call yields its exception in
+    place of a result instead of aborting the others.
+    """
+
+    async def _gather() -> List[Any]:
+        client = AsyncClient(max_concurrency=max_concurrency, timeout=timeout)
+        return await asyncio.gather(
+            *(call(client) for call in calls),
+            return_exceptions=return_exceptions,
+        )
+
+    return asyncio.run(_gather())
+
+
+def run_sync(call: ClientCall, timeout: float = DEFAULT_TIMEOUT) -> Any:
+    return run_concurrently(call, timeout=timeout)[0]
@@ -0,0 +1,242 @@
+"""Direct client for the AeroSpace server socket, bypassing the CLI binary.
+
+The ``aerospace`` executable connects to a Unix socket owned by the running
+AeroSpace server, sends one JSON request and prints the JSON answer. This
+module speaks that exchange itself for the read-only and focus/layout
+commands the workflow uses most. The wire format is not a stable public API,
+so each new server version is checked once against the CLI before it is
+trusted; when the check fails, the socket is missing or an answer cannot be
+decoded, callers fall back to the CLI.
+"""
+
+from __future__ import annotations
+
+import getpass
+import json
+import os
+import socket
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+
+SOCKET_PATH_ENV = "AEROSPACE_SOCKET"
+NATIVE_CLIENT_ENV = "AEROSPACE_NATIVE_CLIENT"
+NATIVE_COMMANDS = {
+    "list-windows",
+    "list-workspaces",
+    "focus",
+    "layout",
+    "move-node-to-workspace",
+    "close",
+    "trigger-binding",
+}
+# Commands without side effects; they can be rerun through the CLI when
+# their answer turns out to come from an unverified server version.
+READ_ONLY_COMMANDS = {"list-windows", "list-workspaces"}
+PROBE_ARGS = ["list-workspaces", "--focused"]
+PROBE_TIMEOUT = 1.0
+RECHECK_SECONDS = 24 * 60 * 60
+READ_CHUNK = 65536
+
+CliRunner = Callable[[List[str]], str]
+
+
+class ProtocolMismatch(RuntimeError):
+    """The server answered in a shape this client does not understand."""
+
+
+_verdict: Optional[Dict[str, object]] = None
+
+
+def socket_path() -> str:
+    override = os.environ.get(SOCKET_PATH_ENV)
+    if override:
+        return override
+    return f"/tmp/bobko.aerospace-{getpass.getuser()}.sock"
+
+
+def native_enabled() -> bool:
+    value = os.environ.get(NATIVE_CLIENT_ENV, "true").strip().lower()
+    return value in {"1", "true", "yes", "on"}
+
+
+def _verdict_path() -> Optional[Path]:
+    cache_root = os.environ.get("alfred_workflow_cache")
+    if not cache_root:
+        return None
+    return Path(cache_root) / "native_client.json"
+
+
+def _load_verdict() -> Dict[str, object]:
+    global _verdict  # pylint: disable=global-statement
+    if _verdict is not None:
+        return _verdict
+    _verdict = {}
+    path = _verdict_path()
+    if path is not None and path.exists():
+        try:
+            loaded = json.loads(path.read_text(encoding="utf-8"))
+        except Exception:  # pylint: disable=broad-except
+            loaded = None
+        if isinstance(loaded, dict):
+            _verdict = loaded
+    return _verdict
+
+
+def _store_verdict(version: str, compatible: bool) -> None:
+    global _verdict  # pylint: disable=global-statement
+    _verdict = {"version": version, "compatible": compatible, "checked": time.time()}
+    path = _verdict_path()
+    if path is None:
+        return
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(_verdict), encoding="utf-8")
+    except Exception:  # pylint: disable=broad-except
+        return
+
+
+def _forget_verdict() -> None:
+    global _verdict  # pylint: disable=global-statement
+    _verdict = {}
+    path = _verdict_path()
+    if path is None:
+        return
+    try:
+        path.unlink()
+    except OSError:
+        return
+
+
+def _request_payload(args: List[str]) -> bytes:
+    request: Dict[str, object] = {
+        "command": " ".join(args),
+        "args": args,
+        "stdin": "",
+    }
+    window_id = os.environ.get("AEROSPACE_WINDOW_ID", "")
+    if window_id.isdigit():
+        request["windowId"] = int(window_id)
+    workspace = os.environ.get("AEROSPACE_WORKSPACE")
+    if workspace:
+        request["workspace"] = workspace
+    return json.dumps(request).encode("utf-8")
+
+
+def _decode_answer(data: bytes) -> Dict[str, object]:
+    try:
+        answer = json.loads(data.decode("utf-8"))
+    except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise ProtocolMismatch("Undecodable answer from AeroSpace server.") from exc
+    if (
+        not isinstance(answer, dict)
+        or not isinstance(answer.get("exitCode"), int)
+        or not isinstance(answer.get("stdout"), str)
+        or not isinstance(answer.get("stderr"), str)
+    ):
+        raise ProtocolMismatch("Unexpected answer shape from AeroSpace server.")
+    return answer
+
+
+def send_request(args: List[str], timeout: float = 15) -> Dict[str, object]:
+    """Send one command over the server socket and return the decoded answer.
+
+    Raises ``OSError`` when the socket cannot be used and ``ProtocolMismatch``
+    when the answer is not a JSON object with exit code, stdout and stderr.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(socket_path())
+        client.sendall(_request_payload(args))
+        client.shutdown(socket.SHUT_WR)
+        chunks: List[bytes] = []
+        while True:
+            chunk = client.recv(READ_CHUNK)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    return _decode_answer(b"".join(chunks))
+
+
+def _server_version(answer: Dict[str, object]) -> str:
+    return str(answer.get("serverVersionAndHash", ""))
+
+
+def _is_trusted(version: Optional[str] = None) -> Optional[bool]:
+    verdict = _load_verdict()
+    if not verdict:
+        return None
+    checked = verdict.get("checked", 0)
+    if not isinstance(checked, (int, float)) or time.time() - checked > RECHECK_SECONDS:
+        return None
+    if version is not None and verdict.get("version") != version:
+        return None
+    return bool(verdict.get("compatible"))
+
+
+def _verify(cli: CliRunner) -> bool:
+    try:
+        answer = send_request(PROBE_ARGS, timeout=PROBE_TIMEOUT)
+    except (ProtocolMismatch, socket.timeout):
+        _store_verdict("", False)
+        return False
+    try:
+        expected = cli(["aerospace", *PROBE_ARGS])
+    except Exception:  # pylint: disable=broad-except
+        return False
+    compatible = (
+        answer["exitCode"] == 0
+        and str(answer["stdout"]).strip() == expected.strip()
+    )
+    _store_verdict(_server_version(answer), compatible)
+    return compatible
+
+
+def can_run_native(args: List[str]) -> bool:
+    return (
+        bool(args)
+        and args[0] in NATIVE_COMMANDS
+        and native_enabled()
+        and os.path.exists(socket_path())
+    )
+
+
+def run_native(
+    args: List[str], cli: CliRunner, timeout: float = 15
+) -> Optional[tuple[int, str, str]]:
+    """Run ``aerospace <args>`` over the socket when it is safe to do so.
+
+    Returns ``(exit_code, stdout, stderr)`` or ``None`` when the caller should
+    run the CLI instead.
+    """
+    if not can_run_native(args):
+        return None
+
+    read_only = args[0] in READ_ONLY_COMMANDS
+    try:
+        trusted = _is_trusted()
+        verified_now = trusted is None
+        if verified_now:
+            trusted = _verify(cli)
+        if not trusted:
+            return None
+        if not read_only and not verified_now:
+            # A command with effects must not run twice, so the server
+            # version is checked before sending it rather than from its answer.
+            probe = send_request(PROBE_ARGS, timeout=PROBE_TIMEOUT)
+            if not _is_trusted(_server_version(probe)):
+                _forget_verdict()
+                return None
+        answer = send_request(args, timeout=timeout)
+    except ProtocolMismatch:
+        _store_verdict("", False)
+        return None
+    except OSError:
+        return None
+
+    if read_only and not _is_trusted(_server_version(answer)):
+        # Another server version answered; run the CLI and verify again next time.
+        _forget_verdict()
+        return None
+    return int(answer["exitCode"]), str(answer["stdout"]), str(answer["stderr"])
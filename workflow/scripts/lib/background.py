@@ -0,0 +1,219 @@
+"""Detached helper processes that outlive the Alfred script that started them."""
+
+from __future__ import annotations
+
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from . import SCRIPTS_DIR
+
+
+REFRESH_SNAPSHOT_SCRIPT = SCRIPTS_DIR / "refresh_snapshot.py"
+RESOLVE_APP_PATHS_SCRIPT = SCRIPTS_DIR / "resolve_app_paths.py"
+# A resolution that has not finished in this long is resolved in the
+# foreground by the next run instead.
+APP_PATH_RESOLUTION_SECONDS = 5.0
+PREFETCH_WORKSPACES_SCRIPT = SCRIPTS_DIR / "prefetch_workspaces.py"
+MAX_PREFETCH_WORKSPACES = 2
+# A prefetch running for longer than this is stale: it is replaced rather
+# than waited for, and gives up on its own.
+PREFETCH_SECONDS = 5.0
+
+
+def spawn_detached(
+    args: List[str], env: Optional[Dict[str, str]] = None
+) -> Optional[int]:
+    """Start ``args`` in its own session with no inherited stdio.
+
+    Alfred waits for a script's output pipes to close, so the child must not
+    hold on to them. Returns the child's pid, which is also its process
+    group, or None if it could not be started.
+    """
+    try:
+        process = subprocess.Popen(  # pylint: disable=consider-using-with
+            args,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            env=env,
+            start_new_session=True,
+            close_fds=True,
+        )
+    except OSError:
+        return None
+    return process.pid
+
+
+def schedule_snapshot_refresh() -> bool:
+    if not os.environ.get("alfred_workflow_cache"):
+        return False
+    return spawn_detached([sys.executable, str(REFRESH_SNAPSHOT_SCRIPT)]) is not None
+
+
+def _resolution_marker() -> Optional[Path]:
+    cache_root = os.environ.get("alfred_workflow_cache")
+    if not cache_root:
+        return None
+    return Path(cache_root) / "app_paths.pending"
+
+
+def app_path_resolution_age() -> Optional[float]:
+    """Seconds since the running app path resolution started, if one is."""
+    marker = _resolution_marker()
+    if marker is None:
+        return None
+    try:
+        return time.time() - marker.stat().st_mtime
+    except OSError:
+        return None
+
+
+def _resolving_bundle_ids(marker: Path) -> List[str]:
+    try:
+        return marker.read_text(encoding="utf-8").split()
+    except OSError:
+        return []
+
+
+def schedule_app_path_resolution(bundle_ids: Iterable[str]) -> bool:
+    """Resolve ``bundle_ids`` with ``mdfind`` in a detached process.
+
+    Returns whether a resolution covering all of them is now running, in
+    which case the caller reruns until it is done. One already running for
+    other apps is not duplicated, and one running for longer than
+    ``APP_PATH_RESOLUTION_SECONDS`` is given up on; either way the caller
+    resolves in the foreground.
+    """
+    marker = _resolution_marker()
+    if marker is None:
+        return False
+    targets = list(dict.fromkeys(bundle_ids))
+    age = app_path_resolution_age()
+    if age is not None:
+        if age >= APP_PATH_RESOLUTION_SECONDS:
+            marker.unlink(missing_ok=True)
+            return False
+        return set(targets) <= set(_resolving_bundle_ids(marker))
+    try:
+        marker.parent.mkdir(parents=True, exist_ok=True)
+        marker.write_text("\n".join(targets), encoding="utf-8")
+    except OSError:
+        return False
+    started = (
+        spawn_detached([sys.executable, str(RESOLVE_APP_PATHS_SCRIPT), *targets])
+        is not None
+    )
+    if not started:
+        marker.unlink(missing_ok=True)
+    return started
+
+
+def finish_app_path_resolution() -> None:
+    marker = _resolution_marker()
+    if marker is not None:
+        marker.unlink(missing_ok=True)
+
+
+def _prefetch_marker() -> Optional[Path]:
+    cache_root = os.environ.get("alfred_workflow_cache")
+    if not cache_root:
+        return None
+    return Path(cache_root) / "workspace_prefetch.json"
+
+
+def running_prefetch() -> Optional[Dict[str, Any]]:
+    """The workspace prefetch started last, unless it finished or went stale."""
+    marker = _prefetch_marker()
+    if marker is None:
+        return None
+    try:
+        prefetch = json.loads(marker.read_text(encoding="utf-8"))
+        started = float(prefetch["started"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if time.time() - started >= PREFETCH_SECONDS:
+        return None
+    return prefetch
+
+
+def _cancel_prefetch(prefetch: Dict[str, Any]) -> None:
+    pid = prefetch.get("pid")
+    if not isinstance(pid, int) or pid <= 0:
+        return
+    try:
+        # The whole group, so its aerospace and mdfind children stop too.
+        os.killpg(pid, signal.SIGTERM)
+    except OSError:
+        return
+
+
+def _write_prefetch(marker: Path, prefetch: Dict[str, Any]) -> bool:
+    tmp_path = marker.with_name(f"{marker.name}.{os.getpid()}.tmp")
+    try:
+        marker.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(json.dumps(prefetch), encoding="utf-8")
+        os.replace(tmp_path, marker)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        return False
+    return True
+
+
+def schedule_workspace_prefetch(workspaces: Iterable[str]) -> bool:
+    """Fetch the windows of likely drill-down ``workspaces`` in the background.
+
+    Only the first ``MAX_PREFETCH_WORKSPACES`` are fetched. A running
+    prefetch of the same workspaces is left alone; one of other workspaces
+    is cancelled and replaced. Returns whether a prefetch is running.
+
+    The marker is claimed with a token before the process is started, so a
+    second keystroke arriving while it starts finds it instead of starting
+    another; the pid used for cancelling is added once it is known.
+    """
+    marker = _prefetch_marker()
+    targets = list(dict.fromkeys(workspaces))[:MAX_PREFETCH_WORKSPACES]
+    if marker is None or not targets:
+        return False
+    running = running_prefetch()
+    if running is not None:
+        if running.get("workspaces") == targets:
+            return True
+        _cancel_prefetch(running)
+    prefetch = {
+        "token": os.urandom(8).hex(),
+        "pid": None,
+        "workspaces": targets,
+        "started": time.time(),
+    }
+    if not _write_prefetch(marker, prefetch):
+        return False
+    pid = spawn_detached(
+        [sys.executable, str(PREFETCH_WORKSPACES_SCRIPT), prefetch["token"], *targets]
+    )
+    if not owns_prefetch(prefetch["token"]):
+        # A later keystroke replaced it while it started; the process finds
+        # it no longer owns the marker and saves nothing.
+        return pid is not None
+    if pid is None:
+        marker.unlink(missing_ok=True)
+        return False
+    _write_prefetch(marker, dict(prefetch, pid=pid))
+    return True
+
+
+def owns_prefetch(token: str) -> bool:
+    """Whether the prefetch started with ``token`` is still the current one."""
+    prefetch = running_prefetch()
+    return prefetch is not None and prefetch.get("token") == token
+
+
+def finish_workspace_prefetch(token: str) -> None:
+    marker = _prefetch_marker()
+    if marker is not None and owns_prefetch(token):
+        marker.unlink(missing_ok=True)
@@ -0,0 +1,109 @@
+"""Apply one AeroSpace command to many windows at once."""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from .aerospace_async import ClientCall, run_concurrently
+
+
+# A ">" standing alone, so titles such as "a -> b" or "foo>bar" stay searches.
+BULK_SEPARATOR = re.compile(r"\s>(?=\s|$)")
+BULK_CONCURRENCY = 4
+BULK_LAYOUTS = (
+    "floating",
+    "tiling",
+    "h_tiles",
+    "v_tiles",
+    "h_accordion",
+    "v_accordion",
+)
+
+
+def split_bulk_query(query: str) -> Tuple[str, Optional[str]]:
+    """Split ``"slack > 9"`` into the window filter and the bulk target.
+
+    The target is ``None`` unless the query has a `` > `` separator after a
+    non-empty window filter.
+    """
+    matches = list(BULK_SEPARATOR.finditer(query))
+    if not matches:
+        return query, None
+    window_query = query[: matches[-1].start()].strip()
+    if not window_query:
+        return query, None
+    return window_query, query[matches[-1].end() :].strip()
+
+
+def bulk_action(target: str) -> Tuple[str, str]:
+    """Map a typed target to ``(action, argument)``."""
+    normalized = target.strip().lower()
+    if normalized == "close":
+        return "close", ""
+    if normalized in BULK_LAYOUTS:
+        return "layout", normalized
+    return "move", target.strip()
+
+
+def bulk_args(action: str, target: str, window_id: str) -> List[str]:
+    if action == "close":
+        return ["aerospace", "close", "--window-id", window_id]
+    if action == "layout":
+        return ["aerospace", "layout", "--window-id", window_id, target]
+    if action == "move":
+        return [
+            "aerospace",
+            "move-node-to-workspace",
+            "--window-id",
+            window_id,
+            target,
+        ]
+    raise RuntimeError(f"Unsupported bulk action: {action or 'missing'}")
+
+
+def describe_bulk(action: str, target: str, count: int, done: bool = False) -> str:
+    noun = "window" if count == 1 else "windows"
+    if action == "close":
+        return f"{'Closed' if done else 'Close'} {count} {noun}"
+    if action == "layout":
+        return f"Set {count} {noun} to {target}"
+    return f"{'Moved' if done else 'Move'} {count} {noun} to workspace {target}"
+
+
+def run_bulk(
+    action: str,
+    target: str,
+    window_ids: List[str],
+    max_concurrency: int = BULK_CONCURRENCY,
+) -> Dict[str, Any]:
+    """Dispatch the command for every window; failures do not stop the rest.
+
+    Returns the ids that succeeded under ``"done"`` and ``(id, message)``
+    pairs under ``"failed"``, both in the order given.
+    """
+
+    def _call(window_id: str) -> ClientCall:
+        args = bulk_args(action, target, window_id)
+        return lambda client: client.run_command(args)
+
+    calls = [_call(window_id) for window_id in window_ids]
+    results = run_concurrently(
+        *calls, max_concurrency=max_concurrency, return_exceptions=True
+    )
+    done: List[str] = []
+    failed: List[Tuple[str, str]] = []
+    for window_id, result in zip(window_ids, results):
+        if isinstance(result, BaseException):
+            failed.append((window_id, " ".join(str(result).split()) or "Unknown error."))
+        else:
+            done.append(window_id)
+    return {"done": done, "failed": failed}
+
+
+def bulk_summary(action: str, target: str, result: Dict[str, Any]) -> str:
+    failed = result["failed"]
+    summary = describe_bulk(action, target, len(result["done"]), done=True)
+    if not failed:
+        return summary
+    return f"{summary}; {len(failed)} failed: {failed[0][1]}"
@@ -0,0 +1,70 @@
+"""Build the bytecode bundle that ``lib/__init__.py`` imports submodules from."""
+
+from __future__ import annotations
+
+import importlib.util
+import io
+import marshal
+import os
+import zipfile
+from pathlib import Path
+from typing import Optional
+
+from . import BUNDLE_MANIFEST, bundle_path, source_manifest
+
+
+LIB_DIR = Path(__file__).resolve().parent
+# Docstrings and asserts are stripped; nothing in lib/ reads either.
+OPTIMIZE = 2
+
+
+def _pyc(source_path: Path) -> bytes:
+    source = source_path.read_bytes()
+    code = compile(source, str(source_path), "exec", dont_inherit=True, optimize=OPTIMIZE)
+    stat = source_path.stat()
+    header = io.BytesIO()
+    header.write(importlib.util.MAGIC_NUMBER)
+    header.write((0).to_bytes(4, "little"))
+    header.write((int(stat.st_mtime) & 0xFFFFFFFF).to_bytes(4, "little"))
+    header.write((len(source) & 0xFFFFFFFF).to_bytes(4, "little"))
+    return header.getvalue() + marshal.dumps(code)
+
+
+def build_bundle(path: Optional[str] = None) -> Optional[str]:
+    """Compile every ``lib`` submodule into ``path`` (the cache bundle by default).
+
+    The bundle is written atomically with the manifest of the sources it was
+    compiled from. A source that changes while it is being built leaves no
+    bundle; the next run starts another build.
+    """
+    path = path or bundle_path()
+    if path is None:
+        return None
+    marker = f"{path}.building"
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        Path(marker).touch()
+        manifest = source_manifest()
+        with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_STORED) as archive:
+            for source_path in sorted(LIB_DIR.glob("*.py")):
+                if source_path.name == "__init__.py":
+                    # The package itself is always imported from source.
+                    continue
+                archive.writestr(f"lib/{source_path.stem}.pyc", _pyc(source_path))
+            archive.writestr(BUNDLE_MANIFEST, manifest)
+        if source_manifest() != manifest:
+            raise OSError("Sources changed during the build.")
+        os.replace(tmp_path, path)
+    except (OSError, SyntaxError):
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        return None
+    finally:
+        try:
+            os.unlink(marker)
+        except OSError:
+            pass
+    return path
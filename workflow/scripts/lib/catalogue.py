@@ -0,0 +1,86 @@
+"""The `as` shortcut catalogue, cached until the AeroSpace config changes."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .snapshot import SNAPSHOT_VERSION, load_snapshot, save_snapshot, snapshot_path
+
+
+CATALOGUE_SNAPSHOT = "shortcuts"
+# Alfred keeps the catalogue this long and, with loose reload, shows it
+# immediately while a background run checks whether it is still current.
+ALFRED_CACHE_SECONDS = 24 * 60 * 60
+
+
+def config_candidates() -> List[str]:
+    """Locations AeroSpace reads its config from, in its lookup order."""
+    config_home = os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser("~/.config")
+    return [
+        os.path.expanduser("~/.aerospace.toml"),
+        os.path.join(config_home, "aerospace", "aerospace.toml"),
+    ]
+
+
+def config_identity(path: str) -> List[List[Any]]:
+    """Stat the resolved config and every candidate location.
+
+    A config that is edited, replaced, or shadowed by a newly created file
+    in another candidate location changes the identity.
+    """
+    identity: List[List[Any]] = []
+    for candidate in dict.fromkeys([path, *config_candidates()]):
+        try:
+            stat = os.stat(candidate)
+        except OSError:
+            identity.append([candidate, None])
+            continue
+        identity.append([candidate, stat.st_ino, stat.st_size, stat.st_mtime_ns])
+    return identity
+
+
+def load_catalogue() -> Optional[Dict[str, Any]]:
+    """Return the cached script filter response if the config is unchanged."""
+    catalogue = load_snapshot(snapshot_path(CATALOGUE_SNAPSHOT))
+    if catalogue is None or not isinstance(catalogue.get("response"), dict):
+        return None
+    path = catalogue.get("path")
+    if not isinstance(path, str) or not Path(path).exists():
+        return None
+    if catalogue.get("identity") != config_identity(path):
+        return None
+    return catalogue["response"]
+
+
+def save_catalogue(path: str, response: Dict[str, Any]) -> None:
+    save_snapshot(
+        snapshot_path(CATALOGUE_SNAPSHOT),
+        {
+            "version": SNAPSHOT_VERSION,
+            "path": path,
+            "identity": config_identity(path),
+            "response": response,
+        },
+    )
+
+
+def alfred_filtering() -> bool:
+    """Whether `as` is set up for Alfred to filter (and cache) the catalogue.
+
+    Needs "Alfred filters results" ticked on the `as` script filter as well;
+    by default the script filters every query itself.
+    """
+    return os.environ.get("SHORTCUTS_FILTERING", "script") == "alfred"
+
+
+def for_filtering_mode(response: Dict[str, Any]) -> Dict[str, Any]:
+    """``response`` without Alfred's cache settings unless Alfred filters it."""
+    if alfred_filtering():
+        return response
+    return {key: value for key, value in response.items() if key != "cache"}
+
+
+def alfred_cache() -> Dict[str, Any]:
+    return {"seconds": ALFRED_CACHE_SECONDS, "loosereload": True}
@@ -0,0 +1,120 @@
+"""Shortcut extraction that only revisits the config sections that were edited.
+
+The config text is split at its table headers and each section is hashed.
+Sections whose hash is stored from an earlier build reuse their shortcuts;
+only new or edited sections are parsed and scanned for metadata comments.
+The parsed full config decides which bindings exist and their order, so any
+section layout that cannot be stitched back together falls back to a full
+extraction.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import tomllib
+from typing import Any, Dict, List, Optional
+
+from .aerospace import extract_shortcuts, iter_bindings
+from .alfred_metadata import MULTILINE_STRING_DELIMITERS
+from .snapshot import SNAPSHOT_VERSION, load_snapshot, save_snapshot, snapshot_path
+
+
+SECTIONS_SNAPSHOT = "shortcut_sections"
+
+Section = Dict[str, Any]
+
+
+def split_sections(config_text: str) -> List[str]:
+    """Split ``config_text`` before every table header outside a string."""
+    sections: List[str] = []
+    current: List[str] = []
+    delimiter: Optional[str] = None
+    for line in config_text.splitlines(keepends=True):
+        if delimiter is None and line.lstrip().startswith("[") and current:
+            sections.append("".join(current))
+            current = []
+        current.append(line)
+        if delimiter is not None:
+            if line.count(delimiter) % 2 == 1:
+                delimiter = None
+            continue
+        for candidate in MULTILINE_STRING_DELIMITERS:
+            if line.count(candidate) % 2 == 1:
+                delimiter = candidate
+                break
+    if current:
+        sections.append("".join(current))
+    return sections
+
+
+def section_digest(section_text: str) -> str:
+    return hashlib.blake2b(section_text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def extract_section(section_text: str) -> Section:
+    """Shortcuts of one section plus every binding it defines, skipped or not."""
+    config = tomllib.loads(section_text)
+    return {
+        "shortcuts": extract_shortcuts(config, section_text),
+        "bindings": [[mode, binding] for mode, binding, _ in iter_bindings(config)],
+    }
+
+
+def extract_shortcuts_incremental(
+    config: Dict[str, Any], config_text: str, cached: Dict[str, Section]
+) -> tuple[List[Dict[str, str]], Dict[str, Section]]:
+    """Return the shortcuts of ``config`` and the sections to store for next time.
+
+    ``cached`` maps section digests to sections from an earlier build and is
+    not modified.
+    """
+    sections: Dict[str, Section] = {}
+    by_binding: Dict[tuple[str, str], Optional[Dict[str, str]]] = {}
+    for section_text in split_sections(config_text):
+        digest = section_digest(section_text)
+        section = cached.get(digest)
+        if section is None:
+            try:
+                section = extract_section(section_text)
+            except tomllib.TOMLDecodeError:
+                # The split landed inside a value; only the full text parses.
+                return extract_shortcuts(config, config_text), {}
+        sections[digest] = section
+        kept = {
+            (shortcut["mode"], shortcut["shortcut"]): shortcut
+            for shortcut in section["shortcuts"]
+        }
+        for mode, binding in section["bindings"]:
+            key = (mode, binding)
+            if key in by_binding:
+                return extract_shortcuts(config, config_text), {}
+            by_binding[key] = kept.get(key)
+
+    shortcuts: List[Dict[str, str]] = []
+    expected = 0
+    for mode, binding, _ in iter_bindings(config):
+        expected += 1
+        key = (mode, binding)
+        if key not in by_binding:
+            # A mode spread over several tables or dotted keys.
+            return extract_shortcuts(config, config_text), {}
+        shortcut = by_binding[key]
+        if shortcut is not None:
+            shortcuts.append(shortcut)
+    if expected != len(by_binding):
+        return extract_shortcuts(config, config_text), {}
+    return shortcuts, sections
+
+
+def load_sections() -> Dict[str, Section]:
+    stored = load_snapshot(snapshot_path(SECTIONS_SNAPSHOT))
+    if stored is None or not isinstance(stored.get("sections"), dict):
+        return {}
+    return stored["sections"]
+
+
+def save_sections(sections: Dict[str, Section]) -> None:
+    save_snapshot(
+        snapshot_path(SECTIONS_SNAPSHOT),
+        {"version": SNAPSHOT_VERSION, "sections": sections},
+    )
@@ -0,0 +1,237 @@
+"""Timed checks of every dependency a workflow run waits on."""
+
+from __future__ import annotations
+
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tomllib
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from . import SCRIPTS_DIR
+from .aerospace import (
+    app_path_args,
+    extract_shortcuts,
+    get_config_path,
+    run_command,
+)
+from .aerospace_socket import send_request, socket_path
+from .snapshot import load_snapshot, refresh_snapshot, save_snapshot, snapshot_path
+
+
+RUNS = 5
+MAX_BUNDLES = 3
+IMPORT_STATEMENT = (
+    f"import sys; sys.path.insert(0, {str(SCRIPTS_DIR)!r}); "
+    "import lib.aerospace, lib.aerospace_async, lib.bulk, lib.query, "
+    "lib.session, lib.snapshot"
+)
+PING_ARGS = ["list-workspaces", "--focused"]
+BUNDLE_ID_ARGS = ["aerospace", "list-windows", "--all", "--format", "%{app-bundle-id}"]
+
+# Medians above these (in milliseconds) are reported as warnings.
+WARN_MS = {
+    "startup": 80,
+    "imports": 60,
+    "aerospace_cli": 50,
+    "aerospace_socket": 10,
+    "mdfind": 150,
+    "config_path": 50,
+    "config_parse": 20,
+    "cache": 15,
+}
+
+
+def _time_ms(call: Callable[[], Any]) -> float:
+    started = time.perf_counter()
+    call()
+    return (time.perf_counter() - started) * 1000
+
+
+def measure(
+    name: str,
+    label: str,
+    call: Callable[[], Any],
+    runs: int = RUNS,
+    warn_key: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Run ``call`` ``runs`` times and grade the median against ``WARN_MS``."""
+    warn_ms = WARN_MS[warn_key or name]
+    result: Dict[str, Any] = {"name": name, "label": label, "warn_ms": warn_ms}
+    try:
+        samples = [_time_ms(call) for _ in range(max(1, runs))]
+    except Exception as exc:  # pylint: disable=broad-except
+        error = " ".join(str(exc).split()) or type(exc).__name__
+        result.update(status="fail", error=error)
+        return result
+    return _graded(result, samples)
+
+
+def _graded(result: Dict[str, Any], samples: List[float]) -> Dict[str, Any]:
+    median = statistics.median(samples)
+    result.update(
+        samples=[round(sample, 2) for sample in samples],
+        median_ms=round(median, 2),
+        max_ms=round(max(samples), 2),
+        status="pass" if median <= result["warn_ms"] else "warn",
+    )
+    return result
+
+
+def _run_python(args: List[str]) -> None:
+    subprocess.run(
+        [sys.executable, *args],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        check=True,
+    )
+
+
+def _interpreter_checks(runs: int) -> List[Dict[str, Any]]:
+    startup = measure(
+        "startup", "Interpreter startup", lambda: _run_python(["-c", "pass"]), runs
+    )
+    imports = measure(
+        "imports",
+        "Workflow imports",
+        lambda: _run_python(["-c", IMPORT_STATEMENT]),
+        runs,
+    )
+    if "median_ms" in startup and "median_ms" in imports:
+        # Report the import cost on top of a bare interpreter start.
+        baseline = startup["median_ms"]
+        imports = _graded(
+            {key: imports[key] for key in ("name", "label", "warn_ms")},
+            [max(0.0, sample - baseline) for sample in imports["samples"]],
+        )
+    return [startup, imports]
+
+
+def _aerospace_checks(runs: int) -> List[Dict[str, Any]]:
+    results = [
+        measure(
+            "aerospace_cli",
+            "aerospace CLI round trip",
+            lambda: run_command(["aerospace", *PING_ARGS]),
+            runs,
+        )
+    ]
+    if os.path.exists(socket_path()):
+        results.append(
+            measure(
+                "aerospace_socket",
+                "AeroSpace socket round trip",
+                lambda: send_request(PING_ARGS),
+                runs,
+            )
+        )
+    return results
+
+
+def _mdfind_checks(runs: int) -> List[Dict[str, Any]]:
+    try:
+        output = run_command(BUNDLE_ID_ARGS)
+    except Exception:  # pylint: disable=broad-except
+        return []
+    bundle_ids = list(dict.fromkeys(line.strip() for line in output.splitlines()))
+    bundle_ids = [bundle_id for bundle_id in bundle_ids if bundle_id][:MAX_BUNDLES]
+    return [
+        measure(
+            f"mdfind:{bundle_id}",
+            f"mdfind {bundle_id}",
+            lambda bundle_id=bundle_id: run_command(app_path_args(bundle_id)),
+            runs,
+            warn_key="mdfind",
+        )
+        for bundle_id in bundle_ids
+    ]
+
+
+def _config_checks(runs: int) -> List[Dict[str, Any]]:
+    path_check = measure("config_path", "Config path resolution", get_config_path, runs)
+    try:
+        text = Path(get_config_path()).read_text(encoding="utf-8")
+    except Exception:  # pylint: disable=broad-except
+        return [path_check]
+
+    def parse() -> None:
+        extract_shortcuts(tomllib.loads(text), text)
+
+    return [
+        path_check,
+        measure("config_parse", "Config TOML and metadata parsing", parse, runs),
+    ]
+
+
+def _cache_check(runs: int) -> Dict[str, Any]:
+    windows = (load_snapshot(snapshot_path("windows_all")) or {}).get("windows")
+    if not windows:
+        windows = [
+            {
+                "window-id": idx,
+                "app-name": f"App {idx % 12}",
+                "window-title": f"Window {idx}",
+                "workspace": str(idx % 9 + 1),
+            }
+            for idx in range(200)
+        ]
+    snapshot = refresh_snapshot(None, windows)
+    cache_root = os.environ.get("alfred_workflow_cache") or tempfile.gettempdir()
+    path = Path(cache_root) / "snapshot_doctor.json"
+
+    def round_trip() -> None:
+        save_snapshot(path, dict(snapshot))
+        if load_snapshot(path) is None:
+            raise RuntimeError(f"Unable to read back {path}")
+
+    try:
+        return measure("cache", "Snapshot cache write and read", round_trip, runs)
+    finally:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+def run_checks(runs: int = RUNS) -> List[Dict[str, Any]]:
+    return [
+        *_interpreter_checks(runs),
+        *_aerospace_checks(runs),
+        *_mdfind_checks(runs),
+        *_config_checks(runs),
+        _cache_check(runs),
+    ]
+
+
+def format_result(result: Dict[str, Any]) -> str:
+    status = result["status"].upper()
+    if "error" in result:
+        return f"{status:<5} {result['label']}: {result['error']}"
+    return (
+        f"{status:<5} {result['label']}: median {result['median_ms']:.1f} ms, "
+        f"max {result['max_ms']:.1f} ms (warn above {result['warn_ms']} ms)"
+    )
+
+
+def format_report(results: List[Dict[str, Any]]) -> str:
+    try:
+        version = run_command(["aerospace", "--version"]).strip().splitlines()[0]
+    except Exception:  # pylint: disable=broad-except
+        version = "unavailable"
+    runs = max((len(result.get("samples", [])) for result in results), default=0)
+    mac_version = platform.mac_ver()[0]
+    system = f"macOS {mac_version}" if mac_version else platform.platform()
+    lines = [
+        "AeroSpace workflow diagnostics",
+        f"{system}, Python {platform.python_version()}, aerospace {version}",
+        f"{runs} runs per check",
+        "",
+        *(format_result(result) for result in results),
+    ]
+    return "\n".join(lines)
@@ -0,0 +1,387 @@
+"""Optional pre-forked runner for the workflow's script entry points.
+
+Every keystroke otherwise starts a fresh interpreter and imports the
+AeroSpace helpers again. With ``FORK_SERVER`` switched on, ``fork_server.py``
+imports them once and listens on a Unix socket; an entry point calls
+``delegate`` before its own imports, and when the server answers it sends
+its argv, environment and working directory over. The server forks a child
+that runs the script as ``__main__`` and streams its output back in frames.
+
+A missing or outdated server never fails a run: the entry point carries on
+in-process and, if the server is enabled, starts one for later keystrokes.
+The client half of this module must stay cheap to import.
+
+The server runs whatever it is sent with the environment it is sent, so it
+only listens in a directory private to the user, only answers peers of the
+same user and only runs scripts of this workflow.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import struct
+import sys
+from pathlib import Path
+from stat import S_ISDIR
+from typing import Any, Optional
+
+from . import SCRIPTS_DIR
+
+
+FORK_SERVER_ENV = "FORK_SERVER"
+FORK_SERVER_SCRIPT = SCRIPTS_DIR / "fork_server.py"
+CONNECT_TIMEOUT_SECONDS = 0.2
+IDLE_TIMEOUT_SECONDS = 10 * 60
+PRELOADED_MODULES = (
+    "tomllib",
+    "lib.aerospace",
+    "lib.aerospace_async",
+    "lib.background",
+    "lib.bulk",
+    "lib.catalogue",
+    "lib.prerender",
+    "lib.profiling",
+    "lib.query",
+    "lib.session",
+    "lib.snapshot",
+)
+
+# Frames are a one-byte kind and a four-byte length followed by the payload.
+FRAME_HEADER = struct.Struct(">cI")
+FRAME_STARTED = b"s"
+FRAME_STDOUT = b"o"
+FRAME_STDERR = b"e"
+FRAME_EXIT = b"x"
+# sizeof(struct xucred): version, uid, group count and 16 group ids.
+XUCRED_SIZE = 76
+
+_IN_SERVER = False
+
+
+def enabled() -> bool:
+    value = os.environ.get(FORK_SERVER_ENV, "").strip().lower()
+    return value in {"1", "true", "yes", "on"}
+
+
+def server_socket_path() -> Optional[str]:
+    """Socket for the server of this workflow's cache directory.
+
+    The cache directory itself is too long for a Unix socket path on macOS,
+    so the socket lives in a per-user directory of the temporary directory
+    under a digest of it.
+    """
+    cache_root = os.environ.get("alfred_workflow_cache")
+    if not cache_root:
+        return None
+    digest = 0
+    for char in cache_root:
+        digest = (digest * 31 + ord(char)) & 0xFFFFFFFF
+    temp_dir = os.environ.get("TMPDIR") or "/tmp"
+    return os.path.join(temp_dir, f"aerospace-alfred-{os.getuid()}", f"{digest:08x}.sock")
+
+
+def _private_dir(path: str, create: bool = False) -> bool:
+    """Whether the directory of ``path`` is owned by and only open to this user."""
+    directory = os.path.dirname(path)
+    if create:
+        try:
+            os.mkdir(directory, 0o700)
+        except FileExistsError:
+            pass
+        except OSError:
+            return False
+    try:
+        stat = os.lstat(directory)
+    except OSError:
+        return False
+    return (
+        S_ISDIR(stat.st_mode)
+        and stat.st_uid == os.getuid()
+        and not stat.st_mode & 0o077
+    )
+
+
+def _peer_uid(conn: socket.socket) -> Optional[int]:
+    """User id of the process at the other end of ``conn``, if it can be read."""
+    if hasattr(socket, "SO_PEERCRED"):
+        # struct ucred: pid, uid, gid.
+        creds = conn.getsockopt(
+            socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i")
+        )
+        return struct.unpack("3i", creds)[1]
+    if hasattr(socket, "LOCAL_PEERCRED"):
+        # struct xucred on macOS, read at level SOL_LOCAL (0): version, uid, ...
+        creds = conn.getsockopt(0, socket.LOCAL_PEERCRED, XUCRED_SIZE)
+        return struct.unpack_from("2I", creds)[1]
+    return None
+
+
+def _is_workflow_script(script: Any) -> bool:
+    if not isinstance(script, str):
+        return False
+    resolved = Path(script).resolve()
+    return resolved.suffix == ".py" and resolved.is_relative_to(SCRIPTS_DIR.resolve())
+
+
+def _send_frame(conn: socket.socket, kind: bytes, payload: bytes = b"") -> None:
+    conn.sendall(FRAME_HEADER.pack(kind, len(payload)) + payload)
+
+
+def _recv_exact(conn: socket.socket, size: int) -> bytes:
+    data = b""
+    while len(data) < size:
+        chunk = conn.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("Fork server closed the connection.")
+        data += chunk
+    return data
+
+
+def _relay(conn: socket.socket) -> Optional[int]:
+    """Copy output frames to stdio; None if the server never started the run."""
+    started = False
+    while True:
+        try:
+            kind, size = FRAME_HEADER.unpack(_recv_exact(conn, FRAME_HEADER.size))
+            payload = _recv_exact(conn, size)
+        except ConnectionError:
+            if not started:
+                return None
+            raise
+        if kind == FRAME_STARTED:
+            started = True
+        elif kind == FRAME_STDOUT:
+            sys.stdout.buffer.write(payload)
+        elif kind == FRAME_STDERR:
+            sys.stderr.buffer.write(payload)
+        elif kind == FRAME_EXIT:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            return int(payload or b"0")
+
+
+def _start_server() -> None:
+    from .background import spawn_detached  # pylint: disable=import-outside-toplevel
+
+    spawn_detached([sys.executable, str(FORK_SERVER_SCRIPT)])
+
+
+def delegate(script: str) -> None:
+    """Run ``script`` in the fork server and exit with its status.
+
+    Returns without doing anything when the server is disabled, not
+    running, or declines the run, so the caller continues in-process.
+    """
+    if _IN_SERVER or not enabled():
+        return
+    path = server_socket_path()
+    if path is None or not _private_dir(path):
+        if path is not None:
+            _start_server()
+        return
+    if len(sys.argv) < 2:
+        query = sys.stdin.read().strip()
+        sys.argv[1:] = [query] if query else []
+    request = {
+        "script": str(Path(script).resolve()),
+        "argv": sys.argv[1:],
+        "env": dict(os.environ),
+        "cwd": os.getcwd(),
+    }
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        conn.settimeout(CONNECT_TIMEOUT_SECONDS)
+        try:
+            conn.connect(path)
+        except OSError:
+            _start_server()
+            return
+        conn.settimeout(None)
+        try:
+            conn.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            code = _relay(conn)
+        except OSError as exc:
+            sys.stderr.write(f"Fork server run failed: {exc}\n")
+            raise SystemExit(1) from exc
+    finally:
+        conn.close()
+    if code is not None:
+        raise SystemExit(code)
+
+
+def stop_server() -> bool:
+    """Ask a running server to exit; False if none was listening."""
+    path = server_socket_path()
+    if path is None or not _private_dir(path):
+        return False
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        conn.settimeout(CONNECT_TIMEOUT_SECONDS)
+        conn.connect(path)
+        conn.settimeout(None)
+        conn.sendall(json.dumps({"command": "stop"}).encode("utf-8") + b"\n")
+        return _relay(conn) is not None
+    except OSError:
+        return False
+    finally:
+        conn.close()
+
+
+class _FrameStream:
+    """Text stream that forwards each write to the client as one frame."""
+
+    def __init__(self, conn: socket.socket, kind: bytes) -> None:
+        self._conn = conn
+        self._kind = kind
+        self.encoding = "utf-8"
+
+    def write(self, text: str) -> int:
+        if text:
+            _send_frame(self._conn, self._kind, text.encode("utf-8"))
+        return len(text)
+
+    def flush(self) -> None:
+        return None
+
+    def isatty(self) -> bool:
+        return False
+
+
+def _exit_code(code: Any) -> int:
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    sys.stderr.write(f"{code}\n")
+    return 1
+
+
+def _source_stamp() -> int:
+    """Latest modification time of the scripts a forked child would run."""
+    stamp = 0
+    for pattern in ("*.py", "lib/*.py"):
+        for path in SCRIPTS_DIR.glob(pattern):
+            try:
+                stamp = max(stamp, path.stat().st_mtime_ns)
+            except OSError:
+                continue
+    return stamp
+
+
+def _run_child(conn: socket.socket) -> None:
+    # pylint: disable=import-outside-toplevel
+    import io
+    import runpy
+    import signal
+    import traceback
+
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    conn.settimeout(None)
+    request = json.loads(conn.makefile("rb").readline())
+    if request.get("command") == "stop":
+        _send_frame(conn, FRAME_STARTED)
+        os.kill(os.getppid(), signal.SIGTERM)
+        _send_frame(conn, FRAME_EXIT, b"0")
+        return
+    if not _is_workflow_script(request.get("script")):
+        # Closing without a started frame; a workflow script runs itself.
+        return
+    _send_frame(conn, FRAME_STARTED)
+
+    os.environ.clear()
+    os.environ.update(request["env"])
+    os.chdir(request["cwd"])
+    sys.argv = [request["script"], *request["argv"]]
+    sys.stdin = io.StringIO("")
+    sys.stdout = _FrameStream(conn, FRAME_STDOUT)
+    sys.stderr = _FrameStream(conn, FRAME_STDERR)
+    code = 0
+    try:
+        runpy.run_path(request["script"], run_name="__main__")
+    except SystemExit as exc:
+        code = _exit_code(exc.code)
+    except BaseException:  # pylint: disable=broad-except
+        traceback.print_exc()
+        code = 1
+    _send_frame(conn, FRAME_EXIT, str(code).encode("ascii"))
+
+
+def serve() -> None:
+    """Preload the helpers and fork a child per connection until idle."""
+    # pylint: disable=import-outside-toplevel
+    import fcntl
+    import importlib
+    import signal
+
+    global _IN_SERVER  # pylint: disable=global-statement
+    path = server_socket_path()
+    if path is None or not _private_dir(path, create=True):
+        return
+    lock = open(f"{path}.lock", "w", encoding="utf-8")  # pylint: disable=consider-using-with
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        # Another server already owns this socket.
+        lock.close()
+        return
+
+    _IN_SERVER = True
+    for name in PRELOADED_MODULES:
+        importlib.import_module(name)
+    stamp = _source_stamp()
+
+    def terminate(*_: Any) -> None:
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, terminate)
+    # Forked children are reaped automatically; each child restores the
+    # default so its own subprocesses can be waited on.
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        umask = os.umask(0o177)
+        try:
+            listener.bind(path)
+        finally:
+            os.umask(umask)
+        os.chmod(path, 0o600)
+        listener.listen(16)
+        listener.settimeout(IDLE_TIMEOUT_SECONDS)
+        while True:
+            try:
+                conn, _ = listener.accept()
+            except socket.timeout:
+                return
+            try:
+                peer_uid = _peer_uid(conn)
+            except OSError:
+                peer_uid = None
+            if peer_uid != os.getuid():
+                conn.close()
+                continue
+            if _source_stamp() != stamp:
+                # The workflow was updated; closing without a started frame
+                # makes the client run the new code itself.
+                conn.close()
+                return
+            if os.fork() == 0:
+                listener.close()
+                try:
+                    _run_child(conn)
+                finally:
+                    os._exit(0)  # pylint: disable=protected-access
+            conn.close()
+    finally:
+        listener.close()
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+        lock.close()
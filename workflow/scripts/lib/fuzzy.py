@@ -0,0 +1,180 @@
+"""Fuzzy scoring for single strings and whole candidate columns."""
+
+from __future__ import annotations
+
+import os
+from typing import List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+BACKEND_ENV = "AEROSPACE_FUZZY_BACKEND"
+
+
+def fuzzy_score(needle: str, haystack: str) -> Optional[int]:
+    if not needle or not haystack:
+        return None
+    needle = needle.lower()
+    haystack = haystack.lower()
+
+    if needle == haystack:
+        return 1000
+    if haystack.startswith(needle):
+        return 700 - len(haystack)
+    if needle in haystack:
+        return 500 - haystack.index(needle)
+
+    score = 0
+    h_idx = 0
+    consecutive = 0
+    for ch in needle:
+        found = haystack.find(ch, h_idx)
+        if found == -1:
+            return None
+        if found == h_idx:
+            consecutive += 1
+            score += 3 + consecutive
+        else:
+            consecutive = 0
+            score += 1
+        h_idx = found + 1
+
+    score -= max(0, h_idx - len(needle))
+    return score
+
+
+def _python_scores(needle: str, haystacks: Sequence[str]) -> List[Optional[int]]:
+    needle_length = len(needle)
+    scores: List[Optional[int]] = []
+    append = scores.append
+    for haystack in haystacks:
+        if not haystack:
+            append(None)
+            continue
+        haystack = haystack.lower()
+        if needle == haystack:
+            append(1000)
+            continue
+        position = haystack.find(needle)
+        if position == 0:
+            append(700 - len(haystack))
+            continue
+        if position > 0:
+            append(500 - position)
+            continue
+
+        score = 0
+        h_idx = 0
+        consecutive = 0
+        for ch in needle:
+            found = haystack.find(ch, h_idx)
+            if found == -1:
+                score = None
+                break
+            if found == h_idx:
+                consecutive += 1
+                score += 3 + consecutive
+            else:
+                consecutive = 0
+                score += 1
+            h_idx = found + 1
+        if score is not None:
+            score -= max(0, h_idx - needle_length)
+        append(score)
+    return scores
+
+
+def _numpy_scores(needle: str, haystacks: Sequence[str]) -> List[Optional[int]]:
+    if "\x00" in needle:
+        # The encoded candidate matrix is padded with NULs.
+        return _python_scores(needle, haystacks)
+
+    scores: List[Optional[int]] = []
+    append = scores.append
+    rest: List[int] = []
+    rest_haystacks: List[str] = []
+    for idx, haystack in enumerate(haystacks):
+        if not haystack:
+            append(None)
+            continue
+        haystack = haystack.lower()
+        position = haystack.find(needle)
+        if position == 0:
+            append(1000 if haystack == needle else 700 - len(haystack))
+        elif position > 0:
+            append(500 - position)
+        else:
+            append(None)
+            rest.append(idx)
+            rest_haystacks.append(haystack)
+    if not rest:
+        return scores
+
+    # Only the subsequence stage is vectorized; the exact, prefix and
+    # substring checks above are single C calls per candidate already. Rows
+    # are dropped as soon as a needle character is missing so later
+    # characters only scan the surviving candidates.
+    candidates = np.array(rest_haystacks, dtype=str)
+    width = candidates.dtype.itemsize // 4
+    codes = candidates.view(np.uint32).reshape(len(rest), width)
+    columns = np.arange(width)
+    rows = np.arange(len(rest))
+    h_idx = np.zeros(len(rest), dtype=np.int64)
+    consecutive = np.zeros(len(rest), dtype=np.int64)
+    subsequence = np.zeros(len(rest), dtype=np.int64)
+    for ch in needle:
+        hits = (codes == ord(ch)) & (columns >= h_idx[:, None])
+        alive = hits.any(axis=1)
+        if not alive.all():
+            rows, codes, hits = rows[alive], codes[alive], hits[alive]
+            h_idx, consecutive = h_idx[alive], consecutive[alive]
+            subsequence = subsequence[alive]
+            if not rows.size:
+                return scores
+        found = hits.argmax(axis=1)
+        adjacent = found == h_idx
+        consecutive = np.where(adjacent, consecutive + 1, 0)
+        subsequence += np.where(adjacent, 3 + consecutive, 1)
+        h_idx = found + 1
+    subsequence -= np.maximum(0, h_idx - len(needle))
+
+    for row, score in zip(rows.tolist(), subsequence.tolist()):
+        scores[rest[row]] = score
+    return scores
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+def default_backend() -> str:
+    backend = os.environ.get(BACKEND_ENV, "python").strip().lower()
+    if backend == "numpy" and np is not None:
+        return "numpy"
+    return "python"
+
+
+def fuzzy_scores(
+    needle: str, haystacks: Sequence[str], backend: Optional[str] = None
+) -> List[Optional[int]]:
+    """Score ``needle`` against every haystack; same results as ``fuzzy_score``.
+
+    ``backend`` is ``"python"`` or ``"numpy"``. The pure-Python batch loop is
+    the default: it hoists the per-call setup out of ``fuzzy_score`` and is
+    faster than the NumPy backend on typical title lengths, whose per-column
+    array passes cost more than ``str.find``. NumPy can be selected per call
+    or with the ``AEROSPACE_FUZZY_BACKEND`` environment variable.
+    """
+    if not needle:
+        return [None] * len(haystacks)
+    needle = needle.lower()
+    if backend is None:
+        backend = default_backend()
+    if backend == "numpy":
+        if np is None:
+            raise RuntimeError("NumPy is not installed.")
+        return _numpy_scores(needle, haystacks)
+    return _python_scores(needle, haystacks)
@@ -0,0 +1,200 @@
+"""Pre-rendered empty-query responses, served before the full script loads.
+
+The bare keyword is the most common invocation and its answer only changes
+with the snapshot it was rendered from. A full run with an empty query
+stores its response next to that snapshot's file identity; the next bare
+run prints it without importing the AeroSpace helpers for as long as the
+snapshot file is unchanged. Every write to the snapshot, including the
+write-through after an action, changes that identity.
+
+Windows opened or moved outside the workflow are not seen that way, so a
+response rendered from a snapshot older than its TTL is served with an
+Alfred rerun and starts a snapshot refresh. The refresh rewrites the
+snapshot, so the rerun renders from it. This module must stay cheap to
+import.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from . import SCRIPTS_DIR
+from .background import schedule_snapshot_refresh, spawn_detached
+from .catalogue import (
+    CATALOGUE_SNAPSHOT,
+    alfred_filtering,
+    for_filtering_mode,
+    load_catalogue,
+)
+from .snapshot import SNAPSHOT_TTL_SECONDS, snapshot_path
+
+
+PRERENDER_VERSION = 1
+# How soon Alfred reruns a bare keyword whose response may be stale.
+STALE_RERUN_SECONDS = 0.3
+VARIANT_ENV = ("GROUP_BY_APP",)
+# Pre-rendered name -> script and environment that regenerate it.
+PRERENDERED_SCRIPTS = {
+    "windows_all": ("windows.py", {"scope": "all"}),
+    "windows_focused": ("windows.py", {"scope": "focused"}),
+    "workspaces": ("workspace_overview.py", {}),
+}
+
+
+def prerender_path(name: str) -> Optional[Path]:
+    cache_root = os.environ.get("alfred_workflow_cache")
+    if not cache_root:
+        return None
+    return Path(cache_root) / f"prerendered_{name}.json"
+
+
+def _file_identity(path: Optional[Path]) -> Optional[List[int]]:
+    if path is None:
+        return None
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return [stat.st_ino, stat.st_size, stat.st_mtime_ns]
+
+
+def _variant() -> Dict[str, str]:
+    return {name: os.environ.get(name, "") for name in VARIANT_ENV}
+
+
+def empty_query() -> bool:
+    """Whether this run has no query, keeping a piped query for the full script."""
+    if len(sys.argv) > 1:
+        return not sys.argv[1]
+    query = sys.stdin.read().strip()
+    if query:
+        sys.argv[1:] = [query]
+    return not query
+
+
+def serve_prerendered(name: str) -> bool:
+    """Print the pre-rendered response for ``name`` if it is still current."""
+    path = prerender_path(name)
+    if path is None or not empty_query():
+        return False
+    try:
+        with open(path, encoding="utf-8") as handle:
+            header = json.loads(handle.readline())
+            body = handle.read()
+    except (OSError, ValueError):
+        return False
+    if not isinstance(header, dict) or header.get("version") != PRERENDER_VERSION:
+        return False
+    if header.get("variant") != _variant():
+        return False
+    created = header.get("created")
+    if not isinstance(created, (int, float)):
+        return False
+    identity = _file_identity(snapshot_path(str(header.get("snapshot", ""))))
+    if identity is None or identity != header.get("identity"):
+        return False
+    if time.time() - created > SNAPSHOT_TTL_SECONDS:
+        try:
+            response = json.loads(body)
+        except ValueError:
+            return False
+        response["rerun"] = STALE_RERUN_SECONDS
+        body = json.dumps(response)
+        _refresh_once(path)
+    sys.stdout.write(body)
+    sys.stdout.flush()
+    return True
+
+
+def _refresh_once(path: Path) -> None:
+    """Start a snapshot refresh unless a rerun of ``path`` just started one."""
+    marker = path.with_name(f"{path.name}.refreshing")
+    try:
+        if time.time() - marker.stat().st_mtime < SNAPSHOT_TTL_SECONDS:
+            return
+    except OSError:
+        pass
+    try:
+        marker.touch()
+    except OSError:
+        pass
+    schedule_snapshot_refresh()
+
+
+def serve_catalogue() -> bool:
+    """Print the cached `as` catalogue if the config is unchanged.
+
+    The catalogue is the pre-rendered response for `as`; with Alfred-side
+    filtering it answers every query.
+    """
+    if not alfred_filtering() and not empty_query():
+        return False
+    response = load_catalogue()
+    if response is None:
+        return False
+    sys.stdout.write(json.dumps(for_filtering_mode(response)))
+    sys.stdout.flush()
+    return True
+
+
+def save_prerendered(
+    name: str, snapshot: Dict[str, Any], response: Dict[str, Any]
+) -> None:
+    """Store an empty-query ``response`` rendered from the saved snapshot ``name``."""
+    path = prerender_path(name)
+    if path is None or snapshot.get("_embedded") or snapshot.get("_dirty"):
+        # Only responses rendered from the snapshot file as saved can be
+        # matched against it later.
+        return
+    identity = _file_identity(snapshot_path(name))
+    if identity is None:
+        return
+    created = snapshot.get("created", 0)
+    workspaces = snapshot.get("workspaces")
+    if isinstance(workspaces, dict) and isinstance(workspaces.get("created"), (int, float)):
+        created = min(created, workspaces["created"])
+    header = {
+        "version": PRERENDER_VERSION,
+        "snapshot": name,
+        "identity": identity,
+        "created": created,
+        "variant": _variant(),
+    }
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_text(
+            json.dumps(header) + "\n" + json.dumps(response), encoding="utf-8"
+        )
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+
+
+def regenerate_prerendered() -> None:
+    """Re-render, in the background, the responses that were pre-rendered.
+
+    Called after a snapshot refresh; each script renders from the snapshot
+    just saved and stores a new response. A shortcut catalogue whose config
+    changed is rebuilt as well. The scripts run detached and side by side,
+    so the refresh does not wait for them.
+    """
+    scripts = [
+        (script, env)
+        for name, (script, env) in PRERENDERED_SCRIPTS.items()
+        if (path := prerender_path(name)) is not None and path.exists()
+    ]
+    catalogue_path = snapshot_path(CATALOGUE_SNAPSHOT)
+    if catalogue_path is not None and catalogue_path.exists() and load_catalogue() is None:
+        scripts.append(("shortcuts.py", {}))
+    for script, env in scripts:
+        spawn_detached(
+            [sys.executable, str(SCRIPTS_DIR / script), ""], env=dict(os.environ, **env)
+        )
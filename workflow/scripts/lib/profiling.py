@@ -0,0 +1,139 @@
+"""Opt-in profiling of script entry points, keeping only slow runs.
+
+Set ``AEROSPACE_PROFILE=1`` to run entry points under ``cProfile``. Runs
+slower than ``AEROSPACE_PROFILE_THRESHOLD_MS`` (default 250) are saved to
+``profiles/`` in the workflow cache as a ``.pstats`` file plus a ``.json``
+file with the query, snapshot sizes and relevant environment. Only the
+newest ``MAX_PROFILES`` runs are kept; ``profile_report.py`` summarizes them.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+
+PROFILE_ENV = "AEROSPACE_PROFILE"
+THRESHOLD_ENV = "AEROSPACE_PROFILE_THRESHOLD_MS"
+DEFAULT_THRESHOLD_MS = 250.0
+MAX_PROFILES = 20
+PROFILES_DIR_NAME = "profiles"
+ENV_PREFIXES = ("alfred_", "AEROSPACE_")
+ENV_NAMES = ("scope", "DEFAULT_WORKSPACE", "CONFIG_PATH")
+SESSION_PREFIX = "session_"
+
+
+def profiles_dir() -> Optional[Path]:
+    cache_root = os.environ.get("alfred_workflow_cache")
+    if not cache_root:
+        return None
+    return Path(cache_root) / PROFILES_DIR_NAME
+
+
+def _threshold_ms() -> float:
+    try:
+        return float(os.environ.get(THRESHOLD_ENV, DEFAULT_THRESHOLD_MS))
+    except ValueError:
+        return DEFAULT_THRESHOLD_MS
+
+
+def _snapshot_sizes(cache_root: Path) -> Dict[str, int]:
+    sizes: Dict[str, int] = {}
+    for path in sorted(cache_root.glob("snapshot_*.json")):
+        try:
+            sizes[path.name] = path.stat().st_size
+        except OSError:
+            continue
+    return sizes
+
+
+def _environment() -> Dict[str, Any]:
+    environment: Dict[str, Any] = {}
+    for key, value in sorted(os.environ.items()):
+        if key.startswith(SESSION_PREFIX):
+            # Carried snapshots can be large; their size is what matters.
+            environment[key] = {"bytes": len(value)}
+        elif key.startswith(ENV_PREFIXES) or key in ENV_NAMES:
+            environment[key] = value
+    return environment
+
+
+def _prune(directory: Path, keep: int) -> None:
+    runs = sorted(directory.glob("*.pstats"))
+    for path in runs[: max(0, len(runs) - keep)]:
+        for stale in (path, path.with_suffix(".json")):
+            try:
+                stale.unlink()
+            except OSError:
+                pass
+
+
+def _save(profiler: Any, name: str, elapsed_ms: float, exit_code: Any) -> None:
+    directory = profiles_dir()
+    if directory is None:
+        return
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        now = time.time_ns()
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now / 1e9))
+        stem = f"{stamp}.{now % 10**9:09d}-{os.getpid()}-{name}"
+        profiler.dump_stats(str(directory / f"{stem}.pstats"))
+        metadata = {
+            "script": name,
+            "argv": sys.argv[1:],
+            "elapsed_ms": round(elapsed_ms, 1),
+            "threshold_ms": _threshold_ms(),
+            "exit_code": exit_code,
+            "created": time.time(),
+            "snapshot_bytes": _snapshot_sizes(directory.parent),
+            "environment": _environment(),
+        }
+        (directory / f"{stem}.json").write_text(
+            json.dumps(metadata, indent=2, sort_keys=True), encoding="utf-8"
+        )
+        _prune(directory, MAX_PROFILES)
+    except Exception:  # pylint: disable=broad-except
+        return
+
+
+def run_entry_point(main: Callable[[], None], name: Optional[str] = None) -> None:
+    """Call ``main``, under ``cProfile`` when profiling is switched on."""
+    if os.environ.get(PROFILE_ENV) != "1":
+        main()
+        return
+
+    import cProfile  # pylint: disable=import-outside-toplevel
+
+    name = name or Path(sys.argv[0]).stem or "script"
+    profiler = cProfile.Profile()
+    exit_code: Any = 0
+    started = time.perf_counter()
+    try:
+        profiler.runcall(main)
+    except SystemExit as exc:
+        exit_code = exc.code
+        raise
+    except BaseException:
+        exit_code = "exception"
+        raise
+    finally:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if elapsed_ms >= _threshold_ms():
+            _save(profiler, name, elapsed_ms, exit_code)
+
+
+def load_runs(directory: Path) -> List[Dict[str, Any]]:
+    runs: List[Dict[str, Any]] = []
+    for path in sorted(directory.glob("*.pstats")):
+        metadata: Dict[str, Any] = {}
+        try:
+            metadata = json.loads(path.with_suffix(".json").read_text(encoding="utf-8"))
+        except Exception:  # pylint: disable=broad-except
+            pass
+        metadata["path"] = str(path)
+        runs.append(metadata)
+    return runs
@@ -0,0 +1,99 @@
+"""Field filters (``ws:3``, ``@Dell``, ``app:chrome``) mixed into window queries."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+
+FILTER_PREFIXES = {
+    "ws:": "workspace",
+    "app:": "app",
+    "@": "monitor",
+}
+
+
+def parse_query(query: str) -> Dict[str, Any]:
+    """Split field filters from the free text that is fuzzy scored.
+
+    Filters with an empty value, such as a half-typed ``ws:``, are ignored.
+    Repeating a field widens it (``ws:1 ws:2``); different fields narrow.
+    """
+    filters: Dict[str, List[str]] = {}
+    words: List[str] = []
+    for word in query.split():
+        lowered = word.lower()
+        for prefix, field in FILTER_PREFIXES.items():
+            if lowered.startswith(prefix):
+                value = lowered[len(prefix):]
+                if value:
+                    filters.setdefault(field, []).append(value)
+                break
+        else:
+            words.append(word)
+    return {"text": " ".join(words), "filters": filters}
+
+
+def build_indexes(windows: List[Dict[str, Any]]) -> Dict[str, Dict[str, List[int]]]:
+    """Map lowercased workspace, monitor and app keys to window positions.
+
+    Apps are indexed by both name and bundle id.
+    """
+    indexes: Dict[str, Dict[str, List[int]]] = {
+        "workspace": {},
+        "monitor": {},
+        "app": {},
+    }
+    for idx, window in enumerate(windows):
+        fields = {
+            "workspace": (window.get("workspace"),),
+            "monitor": (window.get("monitor-name"),),
+            "app": (window.get("app-name"), window.get("app-bundle-id")),
+        }
+        for field, values in fields.items():
+            keys = {str(value).strip().lower() for value in values if value}
+            for key in keys:
+                if key:
+                    indexes[field].setdefault(key, []).append(idx)
+    return indexes
+
+
+def _matches(field: str, key: str, value: str) -> bool:
+    if field == "workspace":
+        return key == value
+    return value in key
+
+
+def select_positions(
+    indexes: Dict[str, Dict[str, List[int]]], filters: Dict[str, List[str]]
+) -> Optional[List[int]]:
+    """Return the sorted window positions matching every filtered field.
+
+    ``None`` means there were no filters and every window is a candidate.
+    """
+    selected: Optional[set] = None
+    for field, values in filters.items():
+        positions = set()
+        for key, entries in indexes.get(field, {}).items():
+            if any(_matches(field, key, value) for value in values):
+                positions.update(entries)
+        selected = positions if selected is None else selected & positions
+        if not selected:
+            return []
+    return None if selected is None else sorted(selected)
+
+
+def app_filter_value(window: Dict[str, Any]) -> str:
+    """An ``app:`` value that selects this window's app and contains no spaces."""
+    bundle_id = str(window.get("app-bundle-id") or "").strip().lower()
+    if bundle_id:
+        return bundle_id
+    words = str(window.get("app-name") or "").strip().lower().split()
+    return words[0] if words else ""
+
+
+def group_by_app(windows: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """Group ranked windows by app, ordered by each app's best-ranked window."""
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for window in windows:
+        groups.setdefault(app_filter_value(window), []).append(window)
+    return list(groups.values())
@@ -0,0 +1,99 @@
+"""Carry snapshots between keystrokes of one Alfred session in ``variables``.
+
+Alfred hands the ``variables`` of a script filter response back to the
+script as environment variables when it reruns it for the next keystroke.
+Small snapshots are embedded compressed; large ones are passed by reference
+to the file cache so the environment stays small.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import os
+import re
+import time
+import zlib
+from typing import Any, Dict, Optional
+
+from .snapshot import SNAPSHOT_VERSION, load_snapshot, snapshot_path
+
+
+MAX_EMBEDDED_BYTES = 32 * 1024
+SESSION_MAX_AGE_SECONDS = 60.0
+EMBEDDED_PREFIX = "z:"
+REFERENCE_PREFIX = "ref:"
+EMBEDDED_FIELDS = (
+    "version",
+    "generation",
+    "created",
+    "windows",
+    "monitors",
+    "workspaces",
+    "indexes",
+    "window",
+    "complete",
+)
+
+
+def session_variable(name: str) -> str:
+    return "session_" + re.sub(r"\W", "_", name)
+
+
+def encode_snapshot(snapshot: Dict[str, Any]) -> str:
+    compact = {key: snapshot[key] for key in EMBEDDED_FIELDS if key in snapshot}
+    payload = json.dumps(compact, separators=(",", ":")).encode("utf-8")
+    return EMBEDDED_PREFIX + base64.b64encode(zlib.compress(payload)).decode("ascii")
+
+
+def decode_snapshot(value: str) -> Optional[Dict[str, Any]]:
+    if not value.startswith(EMBEDDED_PREFIX):
+        return None
+    try:
+        payload = zlib.decompress(base64.b64decode(value[len(EMBEDDED_PREFIX) :]))
+        snapshot = json.loads(payload)
+    except Exception:  # pylint: disable=broad-except
+        return None
+    return snapshot if isinstance(snapshot, dict) else None
+
+
+def _reference(snapshot: Dict[str, Any]) -> str:
+    return f"{REFERENCE_PREFIX}{snapshot.get('created', 0)!r}"
+
+
+def load_session(name: str) -> Optional[Dict[str, Any]]:
+    """Return the snapshot the previous keystroke passed along, if any."""
+    value = os.environ.get(session_variable(name), "")
+    if value.startswith(EMBEDDED_PREFIX):
+        snapshot = decode_snapshot(value)
+        if snapshot is not None:
+            snapshot["_embedded"] = True
+    elif value.startswith(REFERENCE_PREFIX):
+        snapshot = load_snapshot(snapshot_path(name))
+        if snapshot is not None and _reference(snapshot) != value:
+            snapshot = None
+    else:
+        return None
+
+    if snapshot is None or snapshot.get("version") != SNAPSHOT_VERSION:
+        return None
+    created = snapshot.get("created", 0)
+    if not isinstance(created, (int, float)):
+        return None
+    if time.time() - created > SESSION_MAX_AGE_SECONDS:
+        return None
+    snapshot["_session"] = value
+    return snapshot
+
+
+def session_variables(name: str, snapshot: Dict[str, Any]) -> Dict[str, str]:
+    """Variables that hand ``snapshot`` to the next run in this session."""
+    value = snapshot.get("_session")
+    if not value:
+        value = encode_snapshot(snapshot)
+        if len(value) > MAX_EMBEDDED_BYTES:
+            if snapshot_path(name) is None:
+                return {}
+            value = _reference(snapshot)
+        snapshot["_session"] = value
+    return {session_variable(name): value}
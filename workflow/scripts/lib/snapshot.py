@@ -0,0 +1,482 @@
+"""Cached window snapshots with incremental, memoized per-window rendering."""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from urllib.parse import quote
+from typing import Any, Callable, Dict, List, Optional
+
+from .query import build_indexes
+
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_TTL_SECONDS = 1.5
+# Prefetched workspace snapshots are written for a drill-down that follows
+# a moment later, so they stay usable for longer.
+PREFETCHED_TTL_SECONDS = 10.0
+WINDOW_SCOPES = ("all", "focused")
+FOCUSED_WINDOW_SNAPSHOT = "focused_window"
+APP_PATHS_SNAPSHOT = "app_paths"
+OVERVIEW_SNAPSHOT = "workspaces"
+LAYOUT_FIELDS = (
+    "window-layout",
+    "window-parent-container-layout",
+    "workspace-root-container-layout",
+    "window-is-fullscreen",
+)
+
+Renderer = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+def window_scope() -> str:
+    """The asw scope: the ``scope`` variable, else the Default Workspace setting."""
+    env_scope = os.environ.get("scope", "").lower()
+    default_scope = os.environ.get("DEFAULT_WORKSPACE", "focused").lower()
+    scope = env_scope or default_scope
+    return scope if scope in WINDOW_SCOPES else "focused"
+
+
+def snapshot_path(name: str) -> Optional[Path]:
+    cache_root = os.environ.get("alfred_workflow_cache")
+    if not cache_root:
+        return None
+    return Path(cache_root) / f"snapshot_{name}.json"
+
+
+def workspace_snapshot_name(workspace: str) -> str:
+    return f"workspace_{quote(workspace, safe='')}"
+
+
+def load_snapshot(path: Optional[Path]) -> Optional[Dict[str, Any]]:
+    if path is None or not path.exists():
+        return None
+    try:
+        snapshot = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:  # pylint: disable=broad-except
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get("version") != SNAPSHOT_VERSION:
+        return None
+    return snapshot
+
+
+def save_snapshot(path: Optional[Path], snapshot: Dict[str, Any]) -> None:
+    if path is None or snapshot.get("_embedded"):
+        # Copies decoded from session variables are trimmed to what a
+        # keystroke needs and must not replace the full file snapshot.
+        return
+    payload = {key: value for key, value in snapshot.items() if not key.startswith("_")}
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(json.dumps(payload), encoding="utf-8")
+        os.replace(tmp_path, path)
+    except Exception:  # pylint: disable=broad-except
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        return
+    snapshot.pop("_dirty", None)
+
+
+def is_fresh(snapshot: Dict[str, Any], ttl_seconds: float = SNAPSHOT_TTL_SECONDS) -> bool:
+    created = snapshot.get("created", 0)
+    if not isinstance(created, (int, float)):
+        return False
+    return time.time() - created <= ttl_seconds
+
+
+def discard_snapshot(name: str) -> None:
+    path = snapshot_path(name)
+    if path is None:
+        return
+    try:
+        path.unlink()
+    except OSError:
+        return
+
+
+def is_dirty(snapshot: Dict[str, Any]) -> bool:
+    return bool(snapshot.get("_dirty"))
+
+
+def window_key(window: Dict[str, Any]) -> str:
+    return str(window.get("window-id", ""))
+
+
+def window_fingerprint(window: Dict[str, Any]) -> str:
+    # The app path follows from the bundle id and may be resolved later.
+    fields = {key: value for key, value in window.items() if key != "app-path"}
+    return json.dumps(fields, sort_keys=True, separators=(",", ":"))
+
+
+def diff_windows(
+    previous: Dict[str, str], current: Dict[str, str]
+) -> Dict[str, List[str]]:
+    diff: Dict[str, List[str]] = {
+        "added": [],
+        "removed": [],
+        "changed": [],
+        "unchanged": [],
+    }
+    for key, fingerprint in current.items():
+        if key not in previous:
+            diff["added"].append(key)
+        elif previous[key] != fingerprint:
+            diff["changed"].append(key)
+        else:
+            diff["unchanged"].append(key)
+    diff["removed"] = [key for key in previous if key not in current]
+    return diff
+
+
+def diff_summary(diff: Dict[str, List[str]]) -> Dict[str, int]:
+    return {kind: len(keys) for kind, keys in diff.items()}
+
+
+def _debug(message: str) -> None:
+    if os.environ.get("alfred_debug") == "1":
+        print(message, file=sys.stderr)
+
+
+def refresh_snapshot(
+    previous: Optional[Dict[str, Any]], windows: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    fingerprints = {window_key(window): window_fingerprint(window) for window in windows}
+    previous_fingerprints: Dict[str, str] = {}
+    if previous is not None and isinstance(previous.get("fingerprints"), dict):
+        previous_fingerprints = previous["fingerprints"]
+
+    diff = diff_windows(previous_fingerprints, fingerprints)
+    unchanged = set(diff["unchanged"])
+
+    search: Dict[str, List[str]] = {}
+    rendered: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    generation = 0
+    if previous is not None:
+        previous_search = previous.get("search", {})
+        search = {key: keys for key, keys in previous_search.items() if key in unchanged}
+        for variant, items in previous.get("rendered", {}).items():
+            rendered[variant] = {
+                key: item for key, item in items.items() if key in unchanged
+            }
+        generation = int(previous.get("generation", 0))
+        if diff["added"] or diff["removed"] or diff["changed"]:
+            generation += 1
+
+    monitor_names = {str(window.get("monitor-name", "")).strip() for window in windows}
+    monitor_names.discard("")
+
+    _debug(f"snapshot diff: {json.dumps(diff_summary(diff))}")
+    snapshot = {
+        "version": SNAPSHOT_VERSION,
+        "generation": generation,
+        "created": time.time(),
+        "windows": windows,
+        "monitors": sorted(monitor_names),
+        "fingerprints": fingerprints,
+        "search": search,
+        "rendered": rendered,
+        "diff": diff,
+        "_dirty": True,
+    }
+    if previous is not None and isinstance(previous.get("workspaces"), dict):
+        snapshot["workspaces"] = previous["workspaces"]
+    return snapshot
+
+
+def attach_workspaces(snapshot: Dict[str, Any], workspaces: List[Dict[str, Any]]) -> None:
+    snapshot["workspaces"] = {"created": time.time(), "items": workspaces}
+    snapshot["_dirty"] = True
+
+
+def cached_workspaces(snapshot: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+    workspaces = snapshot.get("workspaces")
+    if not isinstance(workspaces, dict):
+        return None
+    # Within an Alfred session the carried snapshot is trusted as a whole.
+    if not snapshot.get("_session") and not is_fresh(workspaces):
+        return None
+    items = workspaces.get("items")
+    return items if isinstance(items, list) else None
+
+
+def _find_window(
+    snapshot: Optional[Dict[str, Any]], window_id: str
+) -> Optional[Dict[str, Any]]:
+    if snapshot is None:
+        return None
+    for window in snapshot.get("windows", []):
+        if window_key(window) == window_id:
+            return window
+    return None
+
+
+def _mark_focused_workspace(
+    workspaces: List[Dict[str, Any]], workspace: str, monitor: str
+) -> None:
+    for entry in workspaces:
+        name = str(entry.get("workspace", ""))
+        if name == workspace:
+            entry["workspace-is-focused"] = "true"
+            entry["workspace-is-visible"] = "true"
+            continue
+        entry["workspace-is-focused"] = "false"
+        if monitor and str(entry.get("monitor-name", "")) == monitor:
+            entry["workspace-is-visible"] = "false"
+
+
+def apply_focus(window_id: str) -> None:
+    """Write a successful focus change through to the cached snapshots.
+
+    The overview's workspace flags are marked in place; the focused-scope
+    window list is rebuilt from the all-windows snapshot when focus moved to
+    another workspace, or dropped when that is not possible. Every snapshot
+    written here counts as fresh again, so the next run reads it instead of
+    calling AeroSpace; the background refresh after the action verifies it.
+    """
+    window_id = str(window_id)
+    paths = {scope: snapshot_path(f"windows_{scope}") for scope in WINDOW_SCOPES}
+    snapshots = {scope: load_snapshot(path) for scope, path in paths.items()}
+    overview_path = snapshot_path(OVERVIEW_SNAPSHOT)
+    overview = load_snapshot(overview_path)
+    target = (
+        _find_window(snapshots["all"], window_id)
+        or _find_window(snapshots["focused"], window_id)
+        or _find_window(overview, window_id)
+    )
+    if target is None:
+        discard_snapshot("windows_focused")
+        discard_snapshot(FOCUSED_WINDOW_SNAPSHOT)
+        return
+
+    workspace = str(target.get("workspace", ""))
+    monitor = str(target.get("monitor-name", ""))
+    now = time.time()
+
+    all_snapshot = snapshots["all"]
+    if all_snapshot is not None:
+        all_snapshot["created"] = now
+        save_snapshot(paths["all"], all_snapshot)
+
+    root_layout = None
+    if overview is not None:
+        overview["created"] = now
+        workspaces = overview.get("workspaces")
+        if isinstance(workspaces, dict) and isinstance(workspaces.get("items"), list):
+            workspaces["created"] = now
+            root_layout = next(
+                (
+                    entry.get("workspace-root-container-layout")
+                    for entry in workspaces["items"]
+                    if str(entry.get("workspace", "")) == workspace
+                ),
+                None,
+            )
+            if not monitor:
+                monitor = next(
+                    (
+                        str(entry.get("monitor-name", ""))
+                        for entry in workspaces["items"]
+                        if str(entry.get("workspace", "")) == workspace
+                    ),
+                    "",
+                )
+            _mark_focused_workspace(workspaces["items"], workspace, monitor)
+        save_snapshot(overview_path, overview)
+
+    focused_snapshot = snapshots["focused"]
+    if _find_window(focused_snapshot, window_id) is None:
+        if all_snapshot is None:
+            focused_snapshot = None
+            discard_snapshot("windows_focused")
+        else:
+            subset = [
+                window
+                for window in all_snapshot.get("windows", [])
+                if str(window.get("workspace", "")) == workspace
+            ]
+            focused_snapshot = refresh_snapshot(focused_snapshot, subset)
+    if focused_snapshot is not None:
+        focused_snapshot["created"] = now
+        save_snapshot(paths["focused"], focused_snapshot)
+
+    # Layouts of the same window are still known from its last read; the
+    # workspace's root layout comes from the overview. For any other window
+    # the record stays incomplete, so `asfocused` reads its layouts.
+    previous = load_focused_window()
+    previous_window = previous.get("window") if previous is not None else None
+    focused_window = {
+        key: value for key, value in target.items() if key not in LAYOUT_FIELDS
+    }
+    complete = False
+    if isinstance(previous_window, dict) and window_key(previous_window) == window_id:
+        for key in LAYOUT_FIELDS:
+            if key in previous_window:
+                focused_window[key] = previous_window[key]
+        complete = bool(previous.get("complete"))
+    if root_layout and "workspace-root-container-layout" not in focused_window:
+        focused_window["workspace-root-container-layout"] = root_layout
+    focused_window["workspace-is-focused"] = "true"
+    focused_window["workspace-is-visible"] = "true"
+    save_focused_window(focused_window, complete=complete)
+
+
+def apply_bulk(action: str, target: str, window_ids: List[str]) -> None:
+    """Write the windows a bulk action succeeded on through to the snapshots.
+
+    Moved windows change workspace and closed ones are removed in the
+    all-windows and overview snapshots; layouts are not part of either.
+    The focused-scope and per-workspace lists are dropped since their
+    membership changed, as is the focused window after a close or layout.
+    """
+    ids = {str(window_id) for window_id in window_ids}
+    if not ids:
+        return
+    if action in {"move", "close"}:
+        for name in ("windows_all", OVERVIEW_SNAPSHOT):
+            path = snapshot_path(name)
+            snapshot = load_snapshot(path)
+            if snapshot is None:
+                continue
+            windows = []
+            for window in snapshot.get("windows", []):
+                if window_key(window) in ids:
+                    if action == "close":
+                        continue
+                    window = dict(window, workspace=target)
+                windows.append(window)
+            updated = refresh_snapshot(snapshot, windows)
+            updated["created"] = snapshot.get("created", 0)
+            save_snapshot(path, updated)
+
+    discard_snapshot("windows_focused")
+    cache = snapshot_path(OVERVIEW_SNAPSHOT)
+    if cache is not None:
+        for path in cache.parent.glob("snapshot_workspace_*.json"):
+            try:
+                path.unlink()
+            except OSError:
+                continue
+    focused = load_focused_window()
+    window = focused.get("window") if focused is not None else None
+    if action != "move" or (isinstance(window, dict) and window_key(window) in ids):
+        discard_snapshot(FOCUSED_WINDOW_SNAPSHOT)
+
+
+def save_focused_window(
+    window: Optional[Dict[str, Any]], complete: bool = True
+) -> Dict[str, Any]:
+    """Store the focused window; ``complete`` is false until layout fields are known."""
+    snapshot = {
+        "version": SNAPSHOT_VERSION,
+        "created": time.time(),
+        "window": window,
+        "complete": complete,
+    }
+    save_snapshot(snapshot_path(FOCUSED_WINDOW_SNAPSHOT), snapshot)
+    return snapshot
+
+
+def load_focused_window() -> Optional[Dict[str, Any]]:
+    return load_snapshot(snapshot_path(FOCUSED_WINDOW_SNAPSHOT))
+
+
+def load_app_paths() -> Dict[str, Optional[str]]:
+    """App paths resolved by earlier runs, by bundle id (``None`` if not found)."""
+    stored = load_snapshot(snapshot_path(APP_PATHS_SNAPSHOT))
+    if stored is None or not isinstance(stored.get("paths"), dict):
+        return {}
+    return stored["paths"]
+
+
+def save_app_paths(paths: Dict[str, Optional[str]]) -> None:
+    if not paths:
+        return
+    merged = dict(load_app_paths())
+    merged.update(paths)
+    save_snapshot(
+        snapshot_path(APP_PATHS_SNAPSHOT),
+        {"version": SNAPSHOT_VERSION, "created": time.time(), "paths": merged},
+    )
+
+
+def new_app_paths(
+    windows: List[Dict[str, Any]], known: Dict[str, Optional[str]]
+) -> Dict[str, Optional[str]]:
+    """App paths ``windows`` carry for bundle ids that ``known`` lacks."""
+    return {
+        window["app-bundle-id"]: window.get("app-path")
+        for window in windows
+        if isinstance(window.get("app-bundle-id"), str)
+        and "app-path" in window
+        and window["app-bundle-id"] not in known
+    }
+
+
+def apply_layout(layout: str) -> None:
+    """Write a successful ``aerospace layout`` change to the focused window."""
+    path = snapshot_path(FOCUSED_WINDOW_SNAPSHOT)
+    snapshot = load_snapshot(path)
+    if snapshot is None or not isinstance(snapshot.get("window"), dict):
+        return
+    window = snapshot["window"]
+    if layout == "floating":
+        window["window-layout"] = "floating"
+    elif layout in {"h_tiles", "v_tiles", "h_accordion", "v_accordion"}:
+        window["window-layout"] = layout
+        window["window-parent-container-layout"] = layout
+    else:
+        # "tiling" and partial layouts depend on state only the server knows.
+        snapshot["complete"] = False
+        for key in LAYOUT_FIELDS:
+            window.pop(key, None)
+    snapshot["created"] = time.time()
+    save_snapshot(path, snapshot)
+
+
+def search_keys(snapshot: Dict[str, Any]) -> List[tuple[str, str]]:
+    search = snapshot.setdefault("search", {})
+    keys: List[tuple[str, str]] = []
+    for window in snapshot["windows"]:
+        key = window_key(window)
+        entry = search.get(key)
+        if entry is None:
+            entry = [
+                str(window.get("app-name", "")).lower(),
+                str(window.get("window-title", "")).lower(),
+            ]
+            search[key] = entry
+            snapshot["_dirty"] = True
+        keys.append((entry[0], entry[1]))
+    return keys
+
+
+def window_indexes(snapshot: Dict[str, Any]) -> Dict[str, Dict[str, List[int]]]:
+    """Workspace, monitor and app indexes over the snapshot's window positions."""
+    indexes = snapshot.get("indexes")
+    if not isinstance(indexes, dict):
+        indexes = build_indexes(snapshot["windows"])
+        snapshot["indexes"] = indexes
+        snapshot["_dirty"] = True
+    return indexes
+
+
+def rendered_item(
+    snapshot: Dict[str, Any],
+    variant: str,
+    window: Dict[str, Any],
+    render: Renderer,
+) -> Dict[str, Any]:
+    items = snapshot.setdefault("rendered", {}).setdefault(variant, {})
+    key = window_key(window)
+    item = items.get(key)
+    if item is None:
+        item = render(window)
+        items[key] = item
+        snapshot["_dirty"] = True
+    return item
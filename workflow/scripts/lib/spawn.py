@@ -0,0 +1,118 @@
+"""Low-overhead spawning of the external commands the workflow runs.
+
+Every helper call used to copy the whole environment, extend its ``PATH``
+and let the child search that ``PATH`` again for ``aerospace``, ``mdfind`` or
+``osascript``. Here each executable is resolved to an absolute path once per
+``PATH`` and the child gets a small environment that is built once and only
+rebuilt when one of the variables it carries changes.
+
+With an absolute executable, no ``cwd``, no new session and ``close_fds``
+off, ``subprocess`` starts the child with ``posix_spawn`` (vfork and exec
+where that is unavailable) instead of forking the whole interpreter. Closing
+descriptors is unnecessary: Python creates them non-inheritable. Output is
+returned as bytes so callers only decode what they use.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+from typing import Dict, List, Optional, Tuple
+
+
+DEFAULT_PATHS = [
+    "/opt/homebrew/bin",
+    "/usr/local/bin",
+    "/usr/bin",
+    "/bin",
+    "/usr/sbin",
+    "/sbin",
+]
+# Everything the spawned commands read from the environment: the AeroSpace
+# CLI finds its socket and config from the user and home directory, and
+# osascript and mdfind need the locale.
+PASSED_ENV = (
+    "HOME",
+    "USER",
+    "LOGNAME",
+    "TMPDIR",
+    "XDG_CONFIG_HOME",
+    "LANG",
+    "LC_ALL",
+    "LC_CTYPE",
+    "__CF_USER_TEXT_ENCODING",
+)
+
+_env_cache: Optional[Tuple[Tuple[Optional[str], ...], Dict[str, str]]] = None
+_executables: Dict[Tuple[str, str], str] = {}
+
+
+def search_path(current: str) -> str:
+    """``current`` with the usual Homebrew and system directories appended."""
+    parts = [part for part in current.split(os.pathsep) if part]
+    for path in DEFAULT_PATHS:
+        if path not in parts:
+            parts.append(path)
+    return os.pathsep.join(parts)
+
+
+def command_env() -> Dict[str, str]:
+    """The environment for spawned commands; callers must not modify it."""
+    global _env_cache  # pylint: disable=global-statement
+    key = (os.environ.get("PATH"), *(os.environ.get(name) for name in PASSED_ENV))
+    if _env_cache is None or _env_cache[0] != key:
+        env = {name: value for name, value in zip(PASSED_ENV, key[1:]) if value is not None}
+        env["PATH"] = search_path(key[0] or "")
+        _env_cache = (key, env)
+    return _env_cache[1]
+
+
+def resolve_executable(name: str) -> str:
+    """Absolute path of ``name`` on the command ``PATH``, or ``name`` itself."""
+    if os.sep in name:
+        return name
+    path = command_env()["PATH"]
+    resolved = _executables.get((name, path))
+    if resolved is None:
+        resolved = shutil.which(name, path=path) or name
+        _executables[(name, path)] = resolved
+    return resolved
+
+
+def forget_executable(name: str) -> None:
+    for key in [key for key in _executables if key[0] == name]:
+        del _executables[key]
+
+
+def spawn(args: List[str], **kwargs) -> subprocess.Popen:
+    """Start ``args`` with stdout and stderr piped, as bytes."""
+    options = {
+        "stdout": subprocess.PIPE,
+        "stderr": subprocess.PIPE,
+        "env": command_env(),
+        "close_fds": False,
+        **kwargs,
+    }
+    try:
+        return subprocess.Popen(  # pylint: disable=consider-using-with
+            [resolve_executable(args[0]), *args[1:]], **options
+        )
+    except FileNotFoundError:
+        # The cached path went away (an uninstall or upgrade); search again.
+        forget_executable(args[0])
+        return subprocess.Popen(  # pylint: disable=consider-using-with
+            [resolve_executable(args[0]), *args[1:]], **options
+        )
+
+
+def run(args: List[str], timeout: Optional[float] = None) -> Tuple[int, bytes, bytes]:
+    """Run ``args`` to completion: ``(returncode, stdout, stderr)``."""
+    with spawn(args) as process:
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            raise
+    return process.returncode, stdout, stderr
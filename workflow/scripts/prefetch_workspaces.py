@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Fetch the windows of the given workspaces ahead of an ``asws`` drill-down.
+
+The first argument is the token of the prefetch marker this run owns.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from lib.aerospace import seed_app_paths, seed_known_app_paths
+from lib.aerospace_async import run_concurrently
+from lib.background import PREFETCH_SECONDS, finish_workspace_prefetch, owns_prefetch
+from lib.profiling import run_entry_point
+from lib.snapshot import (
+    load_app_paths,
+    load_snapshot,
+    new_app_paths,
+    refresh_snapshot,
+    save_app_paths,
+    save_snapshot,
+    snapshot_path,
+    workspace_snapshot_name,
+)
+
+
+def main() -> None:
+    token, workspaces = sys.argv[1], sys.argv[2:]
+    try:
+        previous = {
+            workspace: load_snapshot(snapshot_path(workspace_snapshot_name(workspace)))
+            for workspace in workspaces
+        }
+        for snapshot in previous.values():
+            if snapshot is not None:
+                seed_app_paths(snapshot.get("windows", []))
+        known_app_paths = load_app_paths()
+        seed_known_app_paths(known_app_paths)
+        results = run_concurrently(
+            *(
+                (lambda workspace: lambda client: client.list_workspace_windows(workspace))(
+                    workspace
+                )
+                for workspace in workspaces
+            ),
+            timeout=PREFETCH_SECONDS,
+            return_exceptions=True,
+        )
+        if not owns_prefetch(token):
+            # A later keystroke asked for other workspaces.
+            return
+        resolved = {}
+        for workspace, windows in zip(workspaces, results):
+            if isinstance(windows, Exception):
+                continue
+            resolved.update(new_app_paths(windows, known_app_paths))
+            snapshot = refresh_snapshot(previous[workspace], windows)
+            snapshot["prefetched"] = True
+            save_snapshot(snapshot_path(workspace_snapshot_name(workspace)), snapshot)
+        save_app_paths(resolved)
+    finally:
+        finish_workspace_prefetch(token)
+
+
+if __name__ == "__main__":
+    run_entry_point(main)
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Summarize the slow runs captured with AEROSPACE_PROFILE=1.
+
+    python3 profile_report.py                  # uses $alfred_workflow_cache
+    python3 profile_report.py --dir PATH --top 30 --script windows
+"""
+
+import argparse
+import io
+import pstats
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from lib.profiling import load_runs, profiles_dir
+
+
+DEFAULT_CACHE = (
+    Path.home()
+    / "Library/Caches/com.runningwithcrayons.Alfred/Workflow Data"
+    / "com.travis.aerospace-alfred"
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--dir", type=Path, help="profiles directory")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--script", help="only runs of this script")
+    options = parser.parse_args()
+
+    directory = options.dir or profiles_dir() or DEFAULT_CACHE / "profiles"
+    runs = load_runs(directory)
+    if options.script:
+        runs = [run for run in runs if run.get("script") == options.script]
+    if not runs:
+        print(f"No captured runs in {directory}")
+        return
+
+    print(f"{'captured':<22}{'script':<22}{'ms':>9}  argv")
+    for run in runs:
+        print(
+            f"{Path(run['path']).stem[:15]:<22}{run.get('script', '?'):<22}"
+            f"{run.get('elapsed_ms', 0):>9.1f}  {' '.join(run.get('argv', []))}"
+        )
+    print()
+
+    output = io.StringIO()
+    stats = pstats.Stats(*(run["path"] for run in runs), stream=output)
+    stats.strip_dirs().sort_stats("cumulative").print_stats(options.top)
+    print(output.getvalue())
+
+
+if __name__ == "__main__":
+    main()
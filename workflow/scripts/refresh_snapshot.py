@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Re-fetch the cached snapshots after an action, then re-render from them."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from lib.aerospace import seed_app_paths
+from lib.aerospace_async import run_concurrently
+from lib.prerender import regenerate_prerendered
+from lib.profiling import run_entry_point
+from lib.snapshot import (
+    FOCUSED_WINDOW_SNAPSHOT,
+    OVERVIEW_SNAPSHOT,
+    WINDOW_SCOPES,
+    attach_workspaces,
+    discard_snapshot,
+    load_focused_window,
+    load_snapshot,
+    refresh_snapshot,
+    save_focused_window,
+    save_snapshot,
+    snapshot_path,
+)
+
+
+def main() -> None:
+    previous = {
+        scope: load_snapshot(snapshot_path(f"windows_{scope}"))
+        for scope in WINDOW_SCOPES
+    }
+    focused_window = load_focused_window()
+    for snapshot in previous.values():
+        if snapshot is not None:
+            seed_app_paths(snapshot.get("windows", []))
+
+    # Only what is already cached gets verified; nothing new is fetched.
+    scopes = [scope for scope, snapshot in previous.items() if snapshot is not None]
+    calls = [
+        (lambda scope: lambda client: client.list_windows(scope))(scope)
+        for scope in scopes
+    ]
+    overview = load_snapshot(snapshot_path(OVERVIEW_SNAPSHOT))
+    if overview is not None:
+        calls.append(lambda client: client.list_window_summaries())
+        calls.append(lambda client: client.list_workspaces())
+    if focused_window is not None:
+        calls.append(lambda client: client.get_focused_window())
+    if not calls:
+        regenerate_prerendered()
+        return
+
+    results = run_concurrently(*calls, return_exceptions=True)
+    for scope, windows in zip(scopes, results):
+        if isinstance(windows, Exception):
+            discard_snapshot(f"windows_{scope}")
+            continue
+        save_snapshot(
+            snapshot_path(f"windows_{scope}"), refresh_snapshot(previous[scope], windows)
+        )
+    results = results[len(scopes) :]
+
+    if overview is not None:
+        summaries, workspaces = results.pop(0), results.pop(0)
+        if isinstance(summaries, Exception) or isinstance(workspaces, Exception):
+            discard_snapshot(OVERVIEW_SNAPSHOT)
+        else:
+            overview = refresh_snapshot(overview, summaries)
+            attach_workspaces(overview, workspaces)
+            save_snapshot(snapshot_path(OVERVIEW_SNAPSHOT), overview)
+
+    if focused_window is not None:
+        window = results.pop(0)
+        if isinstance(window, Exception):
+            discard_snapshot(FOCUSED_WINDOW_SNAPSHOT)
+        else:
+            save_focused_window(window)
+
+    regenerate_prerendered()
+
+
+if __name__ == "__main__":
+    run_entry_point(main)
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""Resolve app paths for the given bundle ids and store them for asw."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from lib.aerospace_async import run_sync
+from lib.background import finish_app_path_resolution
+from lib.profiling import run_entry_point
+from lib.snapshot import save_app_paths
+
+
+def main() -> None:
+    bundle_ids = sys.argv[1:]
+    try:
+        paths = run_sync(lambda client: client.get_app_paths(bundle_ids))
+    except BaseException:
+        # Recorded as not found, so asw stops rerunning for these apps.
+        save_app_paths(dict.fromkeys(bundle_ids))
+        raise
+    else:
+        save_app_paths(paths)
+    finally:
+        finish_app_path_resolution()
+
+
+if __name__ == "__main__":
+    run_entry_point(main)
@@ -5,7 +5,16 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
+from lib.forkserver import delegate
+
+if __name__ == "__main__":
+    delegate(__file__)
+
+# pylint: disable=wrong-import-position
 from lib.aerospace import notify_error, set_layout
+from lib.background import schedule_snapshot_refresh
+from lib.profiling import run_entry_point
+from lib.snapshot import apply_layout
 
 
 def main() -> None:
@@ -20,7 +29,9 @@ def main() -> None:
         notify_error(str(exc))
         print(str(exc))
         raise SystemExit(1) from exc
+    apply_layout(layout)
+    schedule_snapshot_refresh()
 
 
 if __name__ == "__main__":
-    main()
+    run_entry_point(main)
@@ -1,13 +1,36 @@
 #!/usr/bin/env python3
 
 import json
+import re
 import sys
 from pathlib import Path
 from typing import Any
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
-from lib.aerospace import extract_shortcuts, load_config
+from lib.forkserver import delegate
+from lib.prerender import serve_catalogue
+
+if __name__ == "__main__":
+    if serve_catalogue():
+        raise SystemExit(0)
+    delegate(__file__)
+
+# pylint: disable=wrong-import-position
+from lib.aerospace import load_config
+from lib.catalogue import (
+    alfred_cache,
+    alfred_filtering,
+    for_filtering_mode,
+    load_catalogue,
+    save_catalogue,
+)
+from lib.config_sections import (
+    extract_shortcuts_incremental,
+    load_sections,
+    save_sections,
+)
+from lib.profiling import run_entry_point
 
 
 ALWAYS_AVAILABLE_COMMANDS = [
@@ -44,25 +67,21 @@ def _bound_commands(config: dict[str, Any]) -> set[str]:
     return commands
 
 
-def main() -> None:
-    query = sys.argv[1] if len(sys.argv) > 1 else ""
-    if not query:
-        query = sys.stdin.read().strip()
+def _match_text(*parts: str) -> str:
+    """Words for Alfred's word matching, with ``alt-h`` also split into ``alt h``."""
+    words = " ".join(parts).split()
+    split_words = [
+        word
+        for word in dict.fromkeys(re.sub(r"[-_+.:]", " ", " ".join(words)).split())
+        if word not in words
+    ]
+    return " ".join(words + split_words)
 
-    result = load_config()
-    if "error" in result:
-        items = [
-            {
-                "title": "AeroSpace config error",
-                "subtitle": result["error"],
-                "valid": False,
-            }
-        ]
-        print(json.dumps({"items": items}))
-        return
 
-    shortcuts = extract_shortcuts(result["config"], result["text"])
-    bound_commands = _bound_commands(result["config"])
+def _catalogue_items(
+    config: dict[str, Any], shortcuts: list[dict[str, str]]
+) -> list[dict[str, Any]]:
+    bound_commands = _bound_commands(config)
     unbound_always_commands = [
         command
         for command in ALWAYS_AVAILABLE_COMMANDS
@@ -70,15 +89,9 @@ def main() -> None:
     ]
 
     items = []
-    query_lower = query.lower()
     for shortcut in shortcuts:
         title = shortcut["description"]
         subtitle = f"{shortcut['shortcut']} - mode: {shortcut['mode']}"
-        match_text = (
-            f"{title} {shortcut['shortcut']} {shortcut['mode']} {shortcut['command']}"
-        )
-        if query_lower and query_lower not in match_text.lower():
-            continue
         items.append(
             {
                 "title": title,
@@ -92,16 +105,15 @@ def main() -> None:
                     separators=(",", ":"),
                 ),
                 "uid": f"shortcut:{shortcut['mode']}:{shortcut['shortcut']}",
-                "match": match_text,
+                "match": _match_text(
+                    title, shortcut["shortcut"], shortcut["mode"], shortcut["command"]
+                ),
             }
         )
 
     for command in unbound_always_commands:
         title = " ".join(command.replace("-", " ").split())
         subtitle = "no bound shortcut"
-        match_text = f"{title} {command} no bound shortcut"
-        if query_lower and query_lower not in match_text.lower():
-            continue
         items.append(
             {
                 "title": title,
@@ -111,12 +123,57 @@ def main() -> None:
                     separators=(",", ":"),
                 ),
                 "uid": f"command:{command.replace(' ', '_')}",
-                "match": match_text,
+                "match": _match_text(title, command, "no bound shortcut"),
             }
         )
+    return items
 
-    print(json.dumps({"items": items}))
+
+def main() -> None:
+    query = sys.argv[1] if len(sys.argv) > 1 else ""
+    if not query:
+        query = sys.stdin.read().strip()
+    if alfred_filtering():
+        # Alfred filters the catalogue itself and reuses the cached response,
+        # so the query that started this run must not narrow it.
+        query = ""
+
+    response = load_catalogue()
+    if response is None:
+        result = load_config()
+        if "error" in result:
+            items = [
+                {
+                    "title": "AeroSpace config error",
+                    "subtitle": result["error"],
+                    "valid": False,
+                }
+            ]
+            print(json.dumps({"items": items}))
+            return
+        shortcuts, sections = extract_shortcuts_incremental(
+            result["config"], result["text"], load_sections()
+        )
+        response = {
+            "cache": alfred_cache(),
+            "items": _catalogue_items(result["config"], shortcuts),
+        }
+        save_catalogue(result["path"], response)
+        save_sections(sections)
+
+    if query:
+        # Without Alfred-side filtering the script narrows the catalogue
+        # itself, and the response must not be cached for other queries.
+        query_lower = query.lower()
+        response = {
+            "items": [
+                item
+                for item in response["items"]
+                if query_lower in item["match"].lower()
+            ]
+        }
+    print(json.dumps(for_filtering_mode(response)))
 
 
 if __name__ == "__main__":
-    main()
+    run_entry_point(main)
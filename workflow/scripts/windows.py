@@ -3,59 +3,193 @@
 import json
 import os
 import sys
-import time
 from typing import Any
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
-from lib.aerospace import filter_windows, list_windows
+from lib.forkserver import delegate
+from lib.prerender import save_prerendered, serve_prerendered
+from lib.snapshot import window_scope
 
+if __name__ == "__main__":
+    if serve_prerendered(f"windows_{window_scope()}"):
+        raise SystemExit(0)
+    delegate(__file__)
+
+# pylint: disable=wrong-import-position
+from lib.aerospace import filter_windows, list_windows_without_app_paths, seed_app_paths
+from lib.aerospace_async import run_sync
+from lib.background import schedule_app_path_resolution
+from lib.bulk import bulk_action, describe_bulk, split_bulk_query
+from lib.profiling import run_entry_point
+from lib.query import app_filter_value, group_by_app, parse_query, select_positions
+from lib.session import load_session, session_variables
+from lib.snapshot import (
+    is_dirty,
+    is_fresh,
+    load_app_paths,
+    load_snapshot,
+    refresh_snapshot,
+    rendered_item,
+    save_app_paths,
+    save_snapshot,
+    search_keys,
+    snapshot_path,
+    window_indexes,
+)
+
+
+MAX_ITEMS = 200
+# How soon Alfred asks again while icons are resolved in the background.
+RERUN_SECONDS = 0.3
 
-def _cache_path(scope: str) -> Path | None:
-    cache_root = os.environ.get("alfred_workflow_cache")
-    if not cache_root:
-        return None
-    return Path(cache_root) / f"windows_{scope}.json"
 
+def _progressive() -> bool:
+    value = os.environ.get("PROGRESSIVE_ICONS", "true").strip().lower()
+    return value in {"1", "true", "yes", "on"}
 
-def _load_cache(path: Path, ttl_seconds: float) -> list | None:
-    if not path.exists():
-        return None
-    if time.time() - path.stat().st_mtime > ttl_seconds:
-        return None
-    try:
-        return json.loads(path.read_text(encoding="utf-8"))
-    except Exception:  # pylint: disable=broad-except
-        return None
 
+def _attach_missing_app_paths(snapshot: dict, windows: list) -> bool:
+    """Give the windows about to be shown their app paths for icons.
 
-def _save_cache(path: Path, windows: list) -> None:
-    try:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(json.dumps(windows), encoding="utf-8")
-    except Exception:  # pylint: disable=broad-except
-        return
+    Paths resolved by earlier runs are filled in directly. In progressive
+    mode the rest are resolved in the background and False is returned, so
+    the response is shown without those icons and rerun.
+    """
+    missing = [
+        window
+        for window in windows
+        if "app-path" not in window and isinstance(window.get("app-bundle-id"), str)
+    ]
+    if not missing:
+        return True
+    known = load_app_paths()
+    unknown = list(
+        dict.fromkeys(
+            window["app-bundle-id"]
+            for window in missing
+            if window["app-bundle-id"] not in known
+        )
+    )
+    if unknown and _progressive() and schedule_app_path_resolution(unknown):
+        for window in missing:
+            if window["app-bundle-id"] in known:
+                window["app-path"] = known[window["app-bundle-id"]]
+                snapshot["_dirty"] = True
+        return False
+    if unknown:
+        paths = run_sync(lambda client: client.get_app_paths(unknown))
+        save_app_paths(paths)
+        known = dict(known, **paths)
+    for window in missing:
+        window["app-path"] = known.get(window["app-bundle-id"])
+    snapshot["_dirty"] = True
+    return True
+
+
+def _window_item(window: dict, scope: str, show_monitor: bool) -> dict:
+    app_name = str(window.get("app-name", "Unknown"))
+    window_title = str(window.get("window-title", "")).strip()
+    workspace = str(window.get("workspace", "")).strip()
+    monitor = str(window.get("monitor-name", "")).strip()
+    context_parts = []
+    if scope == "all":
+        if workspace:
+            context_parts.append(f"ws {workspace}")
+        else:
+            context_parts.append("ws ?")
+    else:
+        if workspace:
+            context_parts.append(f"ws {workspace}")
+    if show_monitor and monitor:
+        context_parts.append(monitor)
+
+    if scope == "all":
+        if context_parts and window_title:
+            subtitle = f"{' | '.join(context_parts)} - {window_title}"
+        elif context_parts:
+            subtitle = " | ".join(context_parts)
+        else:
+            subtitle = window_title
+    else:
+        subtitle_parts = []
+        if window_title:
+            subtitle_parts.append(window_title)
+        if context_parts:
+            subtitle_parts.append(" | ".join(context_parts))
+        subtitle = " - ".join(subtitle_parts)
+
+    item: dict[str, Any] = {
+        "title": app_name,
+        "subtitle": subtitle,
+        "arg": str(window.get("window-id", "")),
+        "uid": f"window:{window.get('window-id', '')}",
+    }
+    app_path = window.get("app-path")
+    if app_path:
+        path = Path(str(app_path))
+        if path.exists():
+            item["icon"] = {"type": "fileicon", "path": str(path)}
+    return item
+
+
+def _group_item(members: list, query: str, scope: str, show_monitor: bool) -> dict:
+    best = _window_item(members[0], scope, show_monitor)
+    item: dict[str, Any] = {
+        "title": f"{best['title']} ({len(members)} windows)",
+        "subtitle": best["subtitle"],
+        "arg": best["arg"],
+        "autocomplete": f"app:{app_filter_value(members[0])} {query}".rstrip() + " ",
+        "uid": f"app:{app_filter_value(members[0])}",
+    }
+    if "icon" in best:
+        item["icon"] = best["icon"]
+    return item
+
+
+def _bulk_item(windows: list, window_query: str, target: str) -> dict:
+    if not window_query:
+        return {
+            "title": "Type a query before '>' to pick windows",
+            "valid": False,
+        }
+    if not target:
+        return {
+            "title": "Type a workspace, 'close' or a layout after '>'",
+            "valid": False,
+        }
+    action, argument = bulk_action(target)
+    payload = {
+        "type": "bulk",
+        "action": action,
+        "target": argument,
+        "window-ids": [str(window.get("window-id", "")) for window in windows],
+    }
+    return {
+        "title": describe_bulk(action, argument, len(windows)),
+        "subtitle": f"Every window matching '{window_query}'",
+        "arg": json.dumps(payload),
+    }
 
 
 def main() -> None:
     query = sys.argv[1] if len(sys.argv) > 1 else ""
     if not query:
         query = sys.stdin.read().strip()
-    env_scope = os.environ.get("scope", "").lower()
-    default_scope = os.environ.get("DEFAULT_WORKSPACE", "focused").lower()
-    scope = env_scope or default_scope
-    if scope not in {"focused", "all"}:
-        scope = "focused"
-
-    cache_file = _cache_path(scope)
-    windows = None
-    if cache_file:
-        windows = _load_cache(cache_file, ttl_seconds=1.5)
-
-    if windows is None:
+    scope = window_scope()
+
+    snapshot_name = f"windows_{scope}"
+    snapshot_file = snapshot_path(snapshot_name)
+    snapshot = load_session(snapshot_name)
+    previous = None
+    if snapshot is None:
+        previous = load_snapshot(snapshot_file)
+        snapshot = previous if previous is not None and is_fresh(previous) else None
+
+    if snapshot is None:
         try:
-            windows = list_windows(scope)
+            windows = list_windows_without_app_paths(scope)
         except Exception as exc:  # pylint: disable=broad-except
             items = [
                 {
@@ -66,72 +200,77 @@ def main() -> None:
             ]
             print(json.dumps({"items": items}))
             return
-        if cache_file:
-            _save_cache(cache_file, windows)
+        if previous is not None:
+            # Icons of apps that were already on screen need no lookup.
+            seed_app_paths(previous["windows"])
+        snapshot = refresh_snapshot(previous, windows)
+
+    show_monitor = len(snapshot["monitors"]) > 1
+    variant = f"windows:{scope}:{int(show_monitor)}"
 
-    monitor_names = {str(window.get("monitor-name", "")).strip() for window in windows}
-    monitor_names.discard("")
-    show_monitor = len(monitor_names) > 1
+    window_query, bulk_target = split_bulk_query(query)
+    parsed = parse_query(window_query)
+    candidates = snapshot["windows"]
+    keys = search_keys(snapshot)
+    positions = select_positions(window_indexes(snapshot), parsed["filters"])
+    if positions is not None:
+        candidates = [candidates[idx] for idx in positions]
+        keys = [keys[idx] for idx in positions]
+    grouped = os.environ.get("GROUP_BY_APP", "").strip().lower() in {
+        "1",
+        "true",
+        "yes",
+        "on",
+    }
+    grouped = grouped and "app" not in parsed["filters"]
+    # Groups count every match and bulk actions act on every match; otherwise
+    # only the best matches are ranked and shown.
+    limit = None if grouped or bulk_target is not None else MAX_ITEMS
+    windows = filter_windows(candidates, parsed["text"], keys, limit=limit)
+    if grouped:
+        groups = group_by_app(windows)
+    else:
+        groups = [[window] for window in windows]
+    complete = _attach_missing_app_paths(snapshot, [members[0] for members in groups])
 
-    windows = filter_windows(windows, query)
-    if not windows:
+    def item_for(members: list) -> dict:
+        window = members[0]
+        if len(members) > 1:
+            return _group_item(members, query, scope, show_monitor)
+        if not complete and "app-path" not in window:
+            # Not cached: the rerun renders it again once its icon is known.
+            return _window_item(window, scope, show_monitor)
+        return rendered_item(
+            snapshot,
+            variant,
+            window,
+            lambda target: _window_item(target, scope, show_monitor),
+        )
+
+    items = [item_for(members) for members in groups]
+    if is_dirty(snapshot):
+        save_snapshot(snapshot_file, snapshot)
+
+    if not items:
         items = [
             {
                 "title": "No windows found",
                 "valid": False,
             }
         ]
-        print(json.dumps({"items": items}))
-        return
-
-    items = []
-    for window in windows:
-        app_name = str(window.get("app-name", "Unknown"))
-        window_title = str(window.get("window-title", "")).strip()
-        workspace = str(window.get("workspace", "")).strip()
-        monitor = str(window.get("monitor-name", "")).strip()
-        context_parts = []
-        if scope == "all":
-            if workspace:
-                context_parts.append(f"ws {workspace}")
-            else:
-                context_parts.append("ws ?")
-        else:
-            if workspace:
-                context_parts.append(f"ws {workspace}")
-        if show_monitor and monitor:
-            context_parts.append(monitor)
-
-        if scope == "all":
-            if context_parts and window_title:
-                subtitle = f"{' | '.join(context_parts)} - {window_title}"
-            elif context_parts:
-                subtitle = " | ".join(context_parts)
-            else:
-                subtitle = window_title
-        else:
-            subtitle_parts = []
-            if window_title:
-                subtitle_parts.append(window_title)
-            if context_parts:
-                subtitle_parts.append(" | ".join(context_parts))
-            subtitle = " - ".join(subtitle_parts)
-
-        item: dict[str, Any] = {
-            "title": app_name,
-            "subtitle": subtitle,
-            "arg": str(window.get("window-id", "")),
-            "uid": f"window:{window.get('window-id', '')}",
-        }
-        app_path = window.get("app-path")
-        if app_path:
-            path = Path(str(app_path))
-            if path.exists():
-                item["icon"] = {"type": "fileicon", "path": str(path)}
-        items.append(item)
-
-    print(json.dumps({"items": items}))
+    elif bulk_target is not None:
+        items.insert(0, _bulk_item(windows, window_query, bulk_target))
+    response = {
+        "variables": session_variables(snapshot_name, snapshot),
+        "items": items,
+    }
+    if not complete:
+        # Shown without some icons; the rerun picks up the resolved paths.
+        response["rerun"] = RERUN_SECONDS
+    elif not query:
+        save_prerendered(snapshot_name, snapshot, response)
+    print(json.dumps(response))
 
 
 if __name__ == "__main__":
-    main()
+    run_entry_point(main)
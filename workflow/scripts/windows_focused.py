@@ -8,8 +8,18 @@ sys.path.insert(0, str(Path(__file__).resolve().parent))
 
 os.environ["scope"] = "focused"
 
+from lib.forkserver import delegate
+from lib.prerender import serve_prerendered
+
+if __name__ == "__main__":
+    if serve_prerendered("windows_focused"):
+        raise SystemExit(0)
+    delegate(__file__)
+
+# pylint: disable=wrong-import-position
+from lib.profiling import run_entry_point
 from windows import main
 
 
 if __name__ == "__main__":
-    main()
+    run_entry_point(main)
@@ -1,13 +1,51 @@
 #!/usr/bin/env python3
 
 import json
+import os
 import sys
 from pathlib import Path
 from typing import Any
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
-from lib.aerospace import filter_windows, fuzzy_score, list_windows, list_workspaces
+from lib.forkserver import delegate
+from lib.prerender import save_prerendered, serve_prerendered
+from lib.snapshot import OVERVIEW_SNAPSHOT
+
+if __name__ == "__main__":
+    if serve_prerendered(OVERVIEW_SNAPSHOT):
+        raise SystemExit(0)
+    delegate(__file__)
+
+# pylint: disable=wrong-import-position
+from lib.aerospace import (
+    filter_windows,
+    fuzzy_score,
+    seed_app_paths,
+    seed_known_app_paths,
+)
+from lib.aerospace_async import run_concurrently, run_sync
+from lib.background import schedule_workspace_prefetch
+from lib.profiling import run_entry_point
+from lib.session import load_session, session_variables
+from lib.snapshot import (
+    PREFETCHED_TTL_SECONDS,
+    SNAPSHOT_TTL_SECONDS,
+    attach_workspaces,
+    cached_workspaces,
+    is_dirty,
+    is_fresh,
+    load_app_paths,
+    load_snapshot,
+    new_app_paths,
+    refresh_snapshot,
+    rendered_item,
+    save_app_paths,
+    save_snapshot,
+    search_keys,
+    snapshot_path,
+    workspace_snapshot_name,
+)
 
 
 def _window_item(window: dict, include_workspace: bool, include_monitor: bool = True) -> dict:
@@ -39,6 +77,39 @@ def _window_item(window: dict, include_workspace: bool, include_monitor: bool =
     return item
 
 
+def _prefetch_enabled() -> bool:
+    value = os.environ.get("PREFETCH_WORKSPACES", "false").strip().lower()
+    return value in {"1", "true", "yes", "on"}
+
+
+def _likely_drill_downs(workspaces: list, scores: dict) -> list:
+    """Best matches for the query first, then the focused and visible workspaces."""
+    candidates = sorted(scores, key=lambda workspace: -scores[workspace])
+    for key in ("workspace-is-focused", "workspace-is-visible"):
+        candidates.extend(
+            str(ws.get("workspace", ""))
+            for ws in workspaces
+            if str(ws.get(key, "")).lower() == "true"
+        )
+    return [workspace for workspace in candidates if workspace]
+
+
+def _listed_workspaces(snapshot) -> list:
+    """Workspaces a snapshot listed, however old; only good as a hint."""
+    workspaces = snapshot.get("workspaces") if snapshot is not None else None
+    items = workspaces.get("items") if isinstance(workspaces, dict) else None
+    return items if isinstance(items, list) else []
+
+
+def _known_workspace_ids(workspaces: list) -> set:
+    return {str(ws.get("workspace", "")) for ws in workspaces}
+
+
+def _print_error(title: str, exc: Exception) -> None:
+    items = [{"title": title, "subtitle": str(exc), "valid": False}]
+    print(json.dumps({"items": items}))
+
+
 def main() -> None:
     query = sys.argv[1] if len(sys.argv) > 1 else ""
     if not query:
@@ -58,47 +129,98 @@ def main() -> None:
         if len(parts) > 1:
             filter_query = parts[1]
 
-    try:
-        windows = list_windows("all")
-    except Exception as exc:  # pylint: disable=broad-except
-        items = [
-            {
-                "title": "Unable to list windows",
-                "subtitle": str(exc),
-                "valid": False,
-            }
-        ]
-        print(json.dumps({"items": items}))
-        return
+    overview_file = snapshot_path(OVERVIEW_SNAPSHOT)
+    overview = load_session(OVERVIEW_SNAPSHOT)
+    previous = None
+    if overview is None:
+        previous = load_snapshot(overview_file)
+        overview = previous if previous is not None and is_fresh(previous) else None
+    workspaces = cached_workspaces(overview) if overview is not None else None
 
-    try:
-        workspaces = list_workspaces()
-    except Exception as exc:  # pylint: disable=broad-except
-        items = [
-            {
-                "title": "Unable to list workspaces",
-                "subtitle": str(exc),
-                "valid": False,
-            }
-        ]
-        print(json.dumps({"items": items}))
+    # Drill-down only needs the selected workspace's windows, so those are
+    # fetched speculatively alongside the workspace list and the per-window
+    # summaries are left for the plain overview.
+    workspace_name = workspace_snapshot_name(workspace_query)
+    workspace_file = None
+    workspace_previous = None
+    workspace_snapshot = None
+    if workspace_query:
+        workspace_file = snapshot_path(workspace_name)
+        workspace_snapshot = load_session(workspace_name)
+        if workspace_snapshot is None:
+            workspace_previous = load_snapshot(workspace_file)
+            if workspace_previous is not None:
+                ttl = (
+                    PREFETCHED_TTL_SECONDS
+                    if workspace_previous.get("prefetched")
+                    else SNAPSHOT_TTL_SECONDS
+                )
+                if is_fresh(workspace_previous, ttl):
+                    workspace_snapshot = workspace_previous
+                else:
+                    # Icons of a stale snapshot still need no lookup.
+                    seed_app_paths(workspace_previous.get("windows", []))
+        if workspaces is None and workspace_snapshot is not None:
+            workspaces = cached_workspaces(workspace_snapshot)
+
+    # Most queries are app or title filters rather than workspace ids, so
+    # the windows are only fetched for an id the workspace list (or, while
+    # that is being fetched, its last known copy) confirms; anything else
+    # would cost a failing CLI call per keystroke.
+    fetch_windows = bool(workspace_query) and workspace_snapshot is None
+    speculate = fetch_windows and workspace_query in _known_workspace_ids(
+        workspaces if workspaces is not None else _listed_workspaces(previous)
+    )
+    known_app_paths = {}
+    if fetch_windows:
+        # Apps already resolved for `asw` or an earlier drill-down need no
+        # mdfind lookup; what this one resolves is kept for the next.
+        known_app_paths = load_app_paths()
+        seed_known_app_paths(known_app_paths)
+    calls = []
+    if workspaces is None:
+        calls.append(lambda client: client.list_workspaces())
+    if speculate:
+        calls.append(lambda client: client.list_workspace_windows(workspace_query))
+    results = run_concurrently(*calls, return_exceptions=True) if calls else []
+    if workspaces is None:
+        workspaces = results.pop(0)
+    if isinstance(workspaces, Exception):
+        _print_error("Unable to list workspaces", workspaces)
         return
+    if fetch_windows and not speculate and workspace_query in _known_workspace_ids(workspaces):
+        results = run_concurrently(
+            lambda client: client.list_workspace_windows(workspace_query),
+            return_exceptions=True,
+        )
 
-    workspace_ids = {str(ws.get("workspace", "")) for ws in workspaces}
+    workspace_ids = _known_workspace_ids(workspaces)
     monitor_names = {
         str(ws.get("monitor-name", "")).strip() for ws in workspaces
     }
     monitor_names.discard("")
     show_monitor = len(monitor_names) > 1
-    grouped: dict[str, list] = {}
-    for window in windows:
-        workspace = str(window.get("workspace", ""))
-        grouped.setdefault(workspace, []).append(window)
 
     if workspace_query and workspace_query in workspace_ids:
-        windows_in_workspace = grouped.get(workspace_query, [])
+        if workspace_snapshot is None:
+            windows = results.pop(0)
+            if isinstance(windows, Exception):
+                _print_error("Unable to list windows", windows)
+                return
+            save_app_paths(new_app_paths(windows, known_app_paths))
+            workspace_snapshot = refresh_snapshot(workspace_previous, windows)
+        if cached_workspaces(workspace_snapshot) is None:
+            attach_workspaces(workspace_snapshot, workspaces)
+        windows_in_workspace = workspace_snapshot["windows"]
         if filter_query:
-            windows_in_workspace = filter_windows(windows_in_workspace, filter_query)
+            windows_in_workspace = filter_windows(
+                windows_in_workspace,
+                filter_query,
+                search_keys(workspace_snapshot),
+            )
+        if overview is not None and cached_workspaces(overview) is None:
+            attach_workspaces(overview, workspaces)
+            save_snapshot(overview_file, overview)
 
         ws_meta = next(
             (
@@ -150,9 +272,18 @@ def main() -> None:
             }
         ]
         items.extend(
-            _window_item(window, include_workspace=False, include_monitor=False)
+            rendered_item(
+                workspace_snapshot,
+                "overview:0:0",
+                window,
+                lambda target: _window_item(
+                    target, include_workspace=False, include_monitor=False
+                ),
+            )
             for window in windows_in_workspace
         )
+        if is_dirty(workspace_snapshot):
+            save_snapshot(workspace_file, workspace_snapshot)
         if len(items) == 1:
             items.append(
                 {
@@ -160,10 +291,27 @@ def main() -> None:
                     "valid": False,
                 }
             )
-        print(json.dumps({"items": items}))
+        variables = session_variables(workspace_name, workspace_snapshot)
+        if overview is not None:
+            variables.update(session_variables(OVERVIEW_SNAPSHOT, overview))
+        print(json.dumps({"variables": variables, "items": items}))
         return
 
+    if overview is None:
+        try:
+            summaries = run_sync(lambda client: client.list_window_summaries())
+        except Exception as exc:  # pylint: disable=broad-except
+            _print_error("Unable to list windows", exc)
+            return
+        overview = refresh_snapshot(previous, summaries)
+    if cached_workspaces(overview) is None:
+        attach_workspaces(overview, workspaces)
+    grouped: dict[str, list] = {}
+    for window in overview["windows"]:
+        grouped.setdefault(str(window.get("workspace", "")), []).append(window)
+
     items = []
+    scores: dict[str, int] = {}
     if not cleaned:
         items.append(
             {
@@ -178,6 +326,7 @@ def main() -> None:
             score = fuzzy_score(workspace_query, workspace)
             if score is None:
                 continue
+            scores[workspace] = score
         monitor = str(ws.get("monitor-name", "")).strip()
         focused = str(ws.get("workspace-is-focused", "")).lower() == "true"
         visible = str(ws.get("workspace-is-visible", "")).lower() == "true"
@@ -216,11 +365,23 @@ def main() -> None:
             }
         )
 
+    if is_dirty(overview):
+        save_snapshot(overview_file, overview)
+    if _prefetch_enabled():
+        # Warm the snapshots that an ``autocomplete`` drill-down reads.
+        schedule_workspace_prefetch(_likely_drill_downs(workspaces, scores))
+
     if not items:
         items = [{"title": "No workspaces found", "valid": False}]
 
-    print(json.dumps({"items": items}))
+    response = {
+        "variables": session_variables(OVERVIEW_SNAPSHOT, overview),
+        "items": items,
+    }
+    if not cleaned:
+        save_prerendered(OVERVIEW_SNAPSHOT, overview, response)
+    print(json.dumps(response))
 
 
 if __name__ == "__main__":
-    main()
+    run_entry_point(main)